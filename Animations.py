@@ -11,9 +11,32 @@ Purpose
 """
 
 import time
+import weakref
 import pygame
+import TextCache
 from JobManager import BaseJob, JobWithTrigger
 
+# Number of precomputed sizes a GrowAndFadeAnimation steps through
+GROW_FRAMES = 24
+
+# Most bytes of frames kept for one image. Large images step through fewer
+# frames so their cached frames fit.
+GROW_CACHE_BYTES = 16 * 1024 * 1024
+
+# Source image -> its precomputed grow and fade frames, shared by every
+# animation of that image and dropped when the image is
+_growFrames = weakref.WeakKeyDictionary()
+
+def _grow_bytes(w, h, numFrames):
+    """
+    Returns
+    -------
+    : int
+        Bytes of numFrames 32 bit grow frames of a w by h image
+    """
+    return sum(int(w * i / numFrames) * int(h * i / numFrames) * 4
+               for i in range(1, numFrames + 1))
+
 #==============================================================================#
 #                     Subclasses of BaseJob Used for Animations
 #==============================================================================#
@@ -119,9 +142,11 @@ class LinearMove(BaseJob):
 
 class GrowAndFadeAnimation(BaseJob):
     """
-    Grows and fades an image over time
+    Grows and fades an image over time. The scaled and faded frames are
+    computed once per image and each step just blits the nearest one.
     """
-    def __init__(self, screen, pos, img, duration, startImmediately=True):
+    def __init__(self, screen, pos, img, duration, startImmediately=True,
+                 keepFrames=True):
         """
         Constructor
 
@@ -138,12 +163,14 @@ class GrowAndFadeAnimation(BaseJob):
         startImmediately: bool
             Whether the flip should start immediately or will need to be
             triggered by another job
+        keepFrames: bool
+            Whether to cache the frames for later animations of img. Pass 
+            False for an image shown once so its frames go with this job.
         """
         super().__init__(startImmediately)
         self.__pos = pos
         
-        self.__img       = img
-        self.__startSize = img.get_size()
+        self.__frames    = GrowAndFadeAnimation.frames_for(img, keepFrames)
         
         self.__screen    = screen
         self.__duration  = duration
@@ -162,18 +189,58 @@ class GrowAndFadeAnimation(BaseJob):
         elapsed = time.time() - self.__startTime
         prog    = min(elapsed / self.__duration, 1) 
 
-        # Update size
-        dimX = self.__startSize[0] * prog
-        dimY = self.__startSize[1] * prog
-
-        # Draw image in new pos
-        tmpImg = pygame.transform.scale(self.__img, (dimX, dimY))
-        tmpImg.set_alpha(255 * (1 - prog))
-        self.__screen.blit(tmpImg, tmpImg.get_rect(center = self.__pos))
+        # Draw the precomputed frame nearest this point in the animation
+        frame = round(prog * len(self.__frames))
+        if frame > 0:
+            img = self.__frames[frame - 1]
+            self.__screen.blit(img, img.get_rect(center = self.__pos))
 
         if prog >= 1:
             self.finish()
 
+    @staticmethod
+    def frames_for(img, keep=True):
+        """
+        Gets the frames the animation steps through for an image, computing
+        them the first time the image is animated
+
+        Parameters
+        ----------
+        img: pygame.Surface
+            The full size image
+        keep: bool
+            Whether to cache newly computed frames for the next call
+
+        Returns
+        -------
+        : list(pygame.Surface)
+            n frames, frame i is the image at (i + 1) / n of its size and 
+            faded by the same fraction. n is GROW_FRAMES, or fewer if that 
+            many would take more than GROW_CACHE_BYTES.
+        """
+        frames = _growFrames.get(img)
+        if frames is None:
+            w, h = img.get_size()
+            numFrames = GROW_FRAMES
+            while numFrames > 1 and \
+                  _grow_bytes(w, h, numFrames) > GROW_CACHE_BYTES:
+                numFrames -= 1
+            frames = []
+            for i in range(1, numFrames + 1):
+                prog = i / numFrames
+                frame = pygame.transform.scale(img, (w * prog, h * prog))
+                # Fading through the pixels' own alpha keeps the blit on
+                # pygame's fast per-pixel alpha path
+                if frame.get_flags() & pygame.SRCALPHA:
+                    frame.fill((255, 255, 255, round(255 * (1 - prog))),
+                               special_flags=pygame.BLEND_RGBA_MULT)
+                else:
+                    frame.set_alpha(255 * (1 - prog))
+                frames.append(frame)
+            if keep:
+                _growFrames[img] = frames
+        return frames
+
 
 class OverlayAndText(BaseJob):
     """
@@ -212,11 +279,9 @@ class OverlayAndText(BaseJob):
 
         self.__overlay = pygame.Surface((width, height), pygame.SRCALPHA)
         self.__overlay.fill(bgColor)
-        font = pygame.font.SysFont(None, fontSz)
-        
+
         # Get rect to center it
-        # True = anti-aliasing
-        self.__textSurf = font.render(text, True, textColor)
+        self.__textSurf = TextCache.render_text(text, fontSz, textColor)
         self.__textRect = self.__textSurf.get_rect(center=(textXpos, textYpos))
 
 
@@ -0,0 +1,367 @@
+"""
+File: Assets.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    Loads every image the client draws exactly once. Each image is decoded,
+    scaled to the size it is drawn at and converted to the display's pixel
+    format the first time it is asked for, then the same surface is handed
+    out on every later request so nothing is read from disk or converted
+    while the game is running.
+
+    Surfaces are shared, callers must not draw on them or change their
+    alpha. Ask for an alpha variant instead.
+
+    Card faces come from an atlas: every card already scaled for one card
+    width, packed into a single image with a JSON index of where each card
+    is. The client loads that one file and draws cards from subsurfaces of
+    it. Atlases are built the first time a card width is used (or ahead of
+    time with `python Assets.py build-atlas --widths 100`) and rebuilt when
+    a card image changes.
+
+    Loading can run in the background: prefetch() decodes and scales the
+    atlas and splash images on a thread pool while the caller gets on with
+    other work (connecting to the server). Anything asked for before its
+    prefetch is done waits for just that image. Prefetch after the display
+    mode is set so the workers can convert images too.
+"""
+import os
+import json
+import math
+import pygame
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+IMAGE_DIR = './images/'
+CARD_DIR = './images/card_pngs/'
+ATLAS_DIR = './images/atlas/'
+ATLAS_COLUMNS = 13
+
+def card_size(imgSize, targetWidth):
+    """
+    The size a card image is drawn at: shrunk by a whole factor so its width
+    is as close to the target width as possible without going over
+
+    Parameters
+    ----------
+    imgSize: tuple(int, int)
+        The size of the card's image file
+    targetWidth: int
+        The width cards should be drawn at
+
+    Returns
+    -------
+    : tuple(int, int)
+    """
+    w, h = imgSize
+    factor = math.ceil(w / targetWidth)
+    return (w // factor, h // factor)
+
+def convert(img):
+    """
+    Converts a surface to the display's pixel format so blitting it does not
+    need a conversion every time. Needs the display mode to be set.
+
+    Returns
+    -------
+    : pygame.Surface
+    """
+    if pygame.display.get_surface() is None:
+        return img
+    return img.convert_alpha()
+
+def atlas_paths(cardWidth, atlasDir=ATLAS_DIR):
+    """
+    Returns
+    -------
+    : tuple(str, str)
+        The atlas image and its index for a card width
+    """
+    base = os.path.join(atlasDir, f"cards_{cardWidth}")
+    return base + ".png", base + ".json"
+
+def card_files(cardDir=CARD_DIR):
+    """
+    Returns
+    -------
+    : dict{str -> str}
+        Maps every card face there is an image for to its file
+    """
+    return {f[:-len('.png')]: os.path.join(cardDir, f)
+            for f in sorted(os.listdir(cardDir)) if f.endswith('.png')}
+
+def _sources_mtime(files):
+    return max(os.path.getmtime(f) for f in files.values())
+
+def build_atlas(cardWidth, cardDir=CARD_DIR):
+    """
+    Scales every card face for a card width and packs them into one image
+
+    Parameters
+    ----------
+    cardWidth: int
+        The width cards are drawn at
+    cardDir: str
+        Where the card faces are
+
+    Returns
+    -------
+    : tuple(pygame.Surface, dict{str -> list(int)})
+        The atlas and where each card is in it as [x, y, w, h]
+    """
+    def load(path):
+        img = pygame.image.load(path)
+        return pygame.transform.scale(img, card_size(img.get_size(),
+                                                     cardWidth))
+
+    # pygame releases the GIL while decoding and scaling
+    files = card_files(cardDir)
+    with ThreadPoolExecutor() as pool:
+        imgs = dict(zip(files, pool.map(load, files.values())))
+
+    # Cards are all the same size, lay them out in a grid
+    w = max(img.get_width() for img in imgs.values())
+    h = max(img.get_height() for img in imgs.values())
+    rows = math.ceil(len(imgs) / ATLAS_COLUMNS)
+    atlas = pygame.Surface((w * min(len(imgs), ATLAS_COLUMNS), h * rows),
+                           pygame.SRCALPHA)
+    index = {}
+    for i, (name, img) in enumerate(imgs.items()):
+        x, y = (i % ATLAS_COLUMNS) * w, (i // ATLAS_COLUMNS) * h
+        atlas.blit(img, (x, y))
+        index[name] = [x, y, img.get_width(), img.get_height()]
+    return atlas, index
+
+def save_atlas(atlas, index, cardWidth, cardDir=CARD_DIR, atlasDir=ATLAS_DIR):
+    """
+    Writes an atlas built by build_atlas and its index to atlasDir
+
+    Raises
+    ------
+    OSError
+        If the atlas could not be written
+    """
+    pngPath, indexPath = atlas_paths(cardWidth, atlasDir)
+    try:
+        os.makedirs(atlasDir, exist_ok=True)
+        pygame.image.save(atlas, pngPath)
+    except pygame.error as e:
+        raise OSError(f"Could not write {pngPath}: {e}")
+    with open(indexPath, "w") as f:
+        json.dump({"cardWidth": cardWidth,
+                   "sourcesMtime": _sources_mtime(card_files(cardDir)),
+                   "cards": index}, f)
+
+def load_atlas(cardWidth, cardDir=CARD_DIR, atlasDir=ATLAS_DIR):
+    """
+    Loads the atlas for a card width
+
+    Returns
+    -------
+    : tuple(pygame.Surface, dict{str -> list(int)}) | None
+        The atlas and its index, None if there is no atlas for this width
+        or the card images changed since it was built
+    """
+    pngPath, indexPath = atlas_paths(cardWidth, atlasDir)
+    try:
+        with open(indexPath) as f:
+            meta = json.load(f)
+        files = card_files(cardDir)
+        if meta["cardWidth"] != cardWidth or \
+           set(meta["cards"]) != set(files) or \
+           meta["sourcesMtime"] < _sources_mtime(files):
+            return None
+        return pygame.image.load(pngPath), meta["cards"]
+    except (OSError, ValueError, KeyError, pygame.error):
+        return None
+
+class AssetManager():
+    """
+    Cache of the client's display-ready images
+    """
+    def __init__(self, cardWidth, imageDir=IMAGE_DIR, cardDir=CARD_DIR,
+                 atlasDir=ATLAS_DIR):
+        """
+        Constructor. Nothing is loaded until it is asked for or prefetched.
+
+        Parameters
+        ----------
+        cardWidth: int
+            The width cards should be drawn at
+        imageDir: str
+            Where the splash images (flip, go, won, ...) are
+        cardDir: str
+            Where the card faces are, one <card>.png per card
+        atlasDir: str
+            Where card atlases are cached
+        """
+        self.__cardWidth = cardWidth
+        self.__imageDir = imageDir
+        self.__cardDir = cardDir
+        self.__atlasDir = atlasDir
+        self.__lock = threading.Lock()
+        self.__images = {}
+        self.__cards = {}
+        self.__pending = {}     # Image key -> Future of the unconverted image
+        self.__atlas = None     # Future of the unconverted atlas and index
+
+    def prefetch(self, splashes=(), workers=4):
+        """
+        Starts loading the card atlas and some splash images on a thread
+        pool and returns straight away
+
+        Parameters
+        ----------
+        splashes: list(tuple(str, tuple(int, int) | None, float | None))
+            (name, size, scale) of each splash image to load, as they will
+            be passed to image()
+        workers: int
+            Threads to load with
+        """
+        pool = ThreadPoolExecutor(workers)
+        with self.__lock:
+            if self.__atlas is None and not self.__cards:
+                self.__atlas = pool.submit(self.__read_atlas)
+            for name, size, scale in splashes:
+                key = (name, size, scale, None)
+                if key not in self.__images and key not in self.__pending:
+                    self.__pending[key] = pool.submit(self.__read_image,
+                                                      name, size, scale)
+        pool.shutdown(wait=False)
+
+    def image(self, name, size=None, scale=None, alpha=None):
+        """
+        Gets a splash image
+
+        Parameters
+        ----------
+        name: str
+            The image's file name without .png
+        size: tuple(int, int) | None
+            Size to scale the image to
+        scale: float | None
+            Factor to scale the image by if no size is given
+        alpha: int | None
+            Alpha to give the whole image, 0-255
+
+        Returns
+        -------
+        : pygame.Surface
+        """
+        # Called from the display, listener and prefetch threads, so the
+        # check and the insert happen under one hold of the lock
+        with self.__lock:
+            img = self.__images.get((name, size, scale, alpha))
+            if img is None:
+                img = self.__cached_image(name, size, scale)
+                if alpha is not None:
+                    img = img.copy()
+                    img.set_alpha(alpha)
+                    self.__images[(name, size, scale, alpha)] = img
+            return img
+
+    def __cached_image(self, name, size, scale):
+        """
+        Gets a splash image with no alpha, loading it if no one has yet. The
+        caller must hold the lock.
+        """
+        key = (name, size, scale, None)
+        img = self.__images.get(key)
+        if img is None:
+            pending = self.__pending.pop(key, None)
+            img = pending.result() if pending is not None else \
+                  self.__read_image(name, size, scale)
+            self.__images[key] = img
+        return img
+
+    def card(self, name):
+        """
+        Gets a card face
+
+        Parameters
+        ----------
+        name: str
+            The card as a string, e.g. str(Card)
+
+        Returns
+        -------
+        : pygame.Surface
+            The card scaled to the card width
+        """
+        img = self.__cards.get(name)
+        if img is None:
+            self.load_cards()
+            img = self.__cards.get(name)
+        if img is None:
+            # Not in the atlas, load it on its own
+            img = pygame.image.load(os.path.join(self.__cardDir,
+                                                 name + '.png'))
+            img = pygame.transform.scale(img, card_size(img.get_size(),
+                                                        self.__cardWidth))
+            img = convert(img)
+            with self.__lock:
+                img = self.__cards.setdefault(name, img)
+        return img
+
+    def load_cards(self):
+        """
+        Makes every card face ready to draw, from the atlas for the card
+        width. Waits for the atlas if it is being prefetched.
+        """
+        with self.__lock:
+            if self.__cards:
+                return
+            pending, self.__atlas = self.__atlas, None
+            atlas, index = pending.result() if pending is not None else \
+                           self.__read_atlas()
+            self.__cards.update((name, atlas.subsurface(rect))
+                                for name, rect in index.items())
+
+    def __read_atlas(self):
+        """
+        Loads the atlas for the card width, building and caching it if there
+        is none yet
+        """
+        loaded = load_atlas(self.__cardWidth, self.__cardDir, self.__atlasDir)
+        if loaded is None:
+            loaded = build_atlas(self.__cardWidth, self.__cardDir)
+            try:
+                save_atlas(*loaded, self.__cardWidth, self.__cardDir,
+                           self.__atlasDir)
+            except OSError as e:
+                print(f"Card atlas not cached: {e}")
+        atlas, index = loaded
+        return convert(atlas), index
+
+    def __read_image(self, name, size, scale):
+        """
+        Decodes, scales and converts a splash image
+        """
+        img = pygame.image.load(os.path.join(self.__imageDir, name + '.png'))
+        if size is None and scale is not None:
+            size = (int(img.get_width() * scale),
+                    int(img.get_height() * scale))
+        if size is not None:
+            img = pygame.transform.scale(img, size)
+        return convert(img)
+
+def main():
+    parser = argparse.ArgumentParser(description="Client asset tools")
+    parser.add_argument("command", choices=["build-atlas"])
+    parser.add_argument("--widths", type=int, nargs="+", default=[100],
+                        help="card widths to build atlases for, the client "
+                             "uses a tenth of its window width")
+    args = parser.parse_args()
+
+    if args.command == "build-atlas":
+        for width in args.widths:
+            atlas, index = build_atlas(width)
+            save_atlas(atlas, index, width)
+            print(f"{atlas_paths(width)[0]}: {len(index)} cards, "
+                  f"{atlas.get_width()}x{atlas.get_height()}")
+
+if __name__ == "__main__":
+    main()
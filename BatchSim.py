@@ -0,0 +1,513 @@
+"""
+File: BatchSim.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    A vectorized engine that plays many games of Spit at once. N games are
+    held as NumPy arrays of the card codes defined in CompactState and every
+    call to step() advances every unfinished game by one play or one flip.
+    The rules mirror ServerGameState.moves_available, play_card, flip and
+    game_over. cross_check() replays the batch's decisions through
+    ServerGameState to prove it.
+
+    Running `python BatchSim.py` benchmarks the engine, and
+    `python BatchSim.py --cross-check` verifies it against ServerGameState.
+"""
+import time
+import argparse
+import numpy as np
+import CompactState
+from CompactState import DECK_SIZE
+
+DRAW       = -1
+UNFINISHED = -2
+
+# Kinds of action reported by BatchSim.step
+NO_ACTION = 0
+PLAY      = 1
+FLIP      = 2
+
+# ADJ[a, b] is True when card codes a and b are adjacent
+ADJ = np.frombuffer(CompactState.ADJACENT, dtype=np.uint8) \
+        .reshape(DECK_SIZE + 1, DECK_SIZE + 1).astype(bool)
+
+#==============================================================================#
+#                                Play policies                                 #
+#==============================================================================#
+# A policy is called with (legal, rng) where legal is a bool array of shape
+# (n, numPlayers * layoutSize * numGamePiles) holding every legal play of the
+# n games that have to play this step. It returns the flat index of the play to
+# make in each game. The flat index of (player, layoutIdx, pileIdx) is
+# (player * layoutSize + layoutIdx) * numGamePiles + pileIdx.
+
+def random_policy(legal, rng):
+    """
+    Picks a uniformly random legal play in every game. Models players that
+    are equally fast.
+    """
+    scores = rng.random(legal.shape, dtype=np.float32)
+    scores[~legal] = -1
+    return scores.argmax(axis=1)
+
+def first_policy(legal, rng):
+    """
+    Picks the first legal play in every game. Deterministic and cheap.
+    """
+    return legal.argmax(axis=1)
+
+POLICIES = {"random": random_policy, "first": first_policy}
+
+#==============================================================================#
+#                               The batch engine                               #
+#==============================================================================#
+class BatchSim():
+    """
+    Holds N games as arrays and advances all of them together
+    """
+    def __init__(self, decks, cursors, layouts, piles):
+        """
+        Constructor. Use BatchSim.deal or BatchSim.from_compact to build one.
+
+        Parameters
+        ----------
+        decks: np.ndarray(uint8)
+            Shape (n, numPlayers, DECK_SIZE) card codes, top first
+        cursors: np.ndarray
+            Shape (n, numPlayers) index of the next card in each deck
+        layouts: np.ndarray(uint8)
+            Shape (n, numPlayers, layoutSize) card codes, 0 for empty
+        piles: np.ndarray(uint8)
+            Shape (n, numGamePiles) card codes on top of the center piles
+        """
+        self.__decks   = np.ascontiguousarray(decks, dtype=np.uint8)
+        self.__cursors = np.ascontiguousarray(cursors, dtype=np.int16)
+        self.__layouts = np.ascontiguousarray(layouts, dtype=np.uint8)
+        self.__piles   = np.ascontiguousarray(piles, dtype=np.uint8)
+
+        n, self.__numPlayers, self.__layoutSize = self.__layouts.shape
+        self.__numPiles = self.__piles.shape[1]
+        if self.__numPlayers > self.__numPiles:
+            # ServerGameState.flip puts player i's card on pile i
+            raise IndexError("numGamePiles must be at least numPlayers")
+
+        # Per game results, indexed by original game number
+        self.__winner = np.full(n, UNFINISHED, dtype=np.int8)
+        self.__plays  = np.zeros(n, dtype=np.int32)
+        self.__flips  = np.zeros(n, dtype=np.int32)
+
+        # Games still being played and their original game numbers
+        self.__live = np.arange(n)
+
+    @classmethod
+    def deal(cls, n, numPlayers=2, numGamePiles=2, layoutSize=4, seed=None):
+        """
+        Shuffles n new games the same way ServerGameState deals them
+
+        Parameters
+        ----------
+        n: int
+            The number of games
+        numPlayers: int
+            The number of players in each game
+        numGamePiles: int
+            The number of center piles in each game
+        layoutSize: int
+            The number of cards in each player's layout
+        seed: int | None
+            Seed for the NumPy generator used to shuffle
+
+        Returns
+        -------
+        : BatchSim
+        """
+        rng = np.random.default_rng(seed)
+        ordered = np.arange(1, DECK_SIZE + 1, dtype=np.uint8)
+        decks = rng.permuted(np.broadcast_to(ordered,
+                                             (n, numPlayers, DECK_SIZE)),
+                             axis=2)
+        return cls.from_decks(decks, numGamePiles, layoutSize)
+
+    @classmethod
+    def from_decks(cls, decks, numGamePiles=2, layoutSize=4):
+        """
+        Deals games from full decks, mirrors CompactState.new_state
+
+        Parameters
+        ----------
+        decks: np.ndarray(uint8)
+            Shape (n, numPlayers, DECK_SIZE) card codes, top first
+
+        Returns
+        -------
+        : BatchSim
+        """
+        n, numPlayers, _ = decks.shape
+        cursors = np.full((n, numPlayers), layoutSize, dtype=np.int16)
+        layouts = decks[:, :, :layoutSize].copy()
+        piles = np.empty((n, numGamePiles), dtype=np.uint8)
+        for i in range(numGamePiles):
+            p = i % numPlayers
+            piles[:, i] = decks[np.arange(n), p, cursors[:, p]]
+            cursors[:, p] += 1
+        return cls(decks, cursors, layouts, piles)
+
+    @classmethod
+    def from_compact(cls, states):
+        """
+        Builds a batch out of games in progress
+
+        Parameters
+        ----------
+        states: list(bytearray)
+            Buffers from CompactState that all have the same shape
+
+        Returns
+        -------
+        : BatchSim
+
+        Raises
+        ------
+        ValueError
+            If the states have different shapes or fewer center piles than
+            players, like ServerGameState
+        """
+        numPlayers, numPiles, layoutSize = CompactState.shape(states[0])
+        if numPiles < numPlayers:
+            raise ValueError("numGamePiles must be at least numPlayers")
+        if any(CompactState.shape(s) != (numPlayers, numPiles, layoutSize)
+               for s in states):
+            raise ValueError("states must all have the same shape")
+        stride = 1 + layoutSize + DECK_SIZE
+        first = CompactState.HEADER_SIZE
+        raw = np.frombuffer(b''.join(bytes(s) for s in states),
+                            dtype=np.uint8).reshape(len(states), -1)
+        piles = raw[:, first:first + numPiles]
+        players = raw[:, first + numPiles:].reshape(len(states), numPlayers,
+                                                    stride)
+        return cls(players[:, :, 1 + layoutSize:], players[:, :, 0],
+                   players[:, :, 1:1 + layoutSize], piles)
+
+    #*********************************************************************#
+    #                           Running the games                         #
+    #*********************************************************************#
+
+    def step(self, policy=random_policy, rng=None):
+        """
+        Advances every unfinished game by one play or one flip and retires the
+        games that are over.
+
+        Parameters
+        ----------
+        policy: func(np.ndarray, np.random.Generator) -> np.ndarray
+            Chooses a play in each game that has one. See random_policy.
+        rng: np.random.Generator | None
+            Generator handed to the policy
+
+        Returns
+        -------
+        : tuple(np.ndarray, np.ndarray, np.ndarray)
+            (games, kinds, moves): the original numbers of the games that were
+            live at the start of the step, what each of them did (NO_ACTION,
+            PLAY or FLIP) and the flat index of the play made (-1 otherwise).
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        games = self.__live
+        n = len(games)
+        kinds = np.zeros(n, dtype=np.int8)
+        moves = np.full(n, -1, dtype=np.int64)
+        if n == 0:
+            return games, kinds, moves
+
+        layouts, piles, cursors = self.__layouts, self.__piles, self.__cursors
+        legal = ADJ[layouts[:, :, :, None], piles[:, None, None, :]] \
+                    .reshape(n, -1)
+        hasMove = legal.any(axis=1)
+
+        # Game over checks, same precedence as ServerGameState.game_over
+        decksEmpty = cursors >= DECK_SIZE
+        counts = np.count_nonzero(layouts, axis=2)
+        finished = decksEmpty & (counts == 0)
+        stuck = decksEmpty.all(axis=1) & ~hasMove
+        over = stuck | finished.any(axis=1)
+
+        winner = np.where(finished.any(axis=1), finished.argmax(axis=1),
+                          UNFINISHED)
+        allEqual = (counts == counts[:, :1]).all(axis=1)
+        winner = np.where(stuck,
+                          np.where(allEqual, DRAW, counts.argmin(axis=1)),
+                          winner)
+        self.__winner[games[over]] = winner[over]
+
+        # Play in the games that have a move
+        playing = np.flatnonzero(hasMove & ~over)
+        if len(playing):
+            choice = policy(legal[playing], rng)
+            self.__apply_plays(playing, choice)
+            kinds[playing] = PLAY
+            moves[playing] = choice
+            self.__plays[games[playing]] += 1
+
+        # Flip in the games that are stuck but not over
+        flipping = np.flatnonzero(~hasMove & ~over)
+        if len(flipping):
+            self.__apply_flips(flipping)
+            kinds[flipping] = FLIP
+            self.__flips[games[flipping]] += 1
+
+        if over.any():
+            self.__retire(~over)
+        return games, kinds, moves
+
+    def run(self, policy=random_policy, seed=None, maxSteps=10_000):
+        """
+        Steps until every game is over
+
+        Parameters
+        ----------
+        policy: func(np.ndarray, np.random.Generator) -> np.ndarray
+            Chooses a play in each game that has one
+        seed: int | None
+            Seed for the generator handed to the policy
+        maxSteps: int
+            Give up after this many steps
+
+        Returns
+        -------
+        : dict{str -> np.ndarray}
+            Per game 'winner' (player index, DRAW or UNFINISHED), 'plays' and
+            'flips'
+        """
+        rng = np.random.default_rng(seed)
+        for _ in range(maxSteps):
+            if len(self.__live) == 0:
+                break
+            self.step(policy, rng)
+        return self.results()
+
+    def results(self):
+        """
+        Returns
+        -------
+        : dict{str -> np.ndarray}
+            Per game 'winner', 'plays' and 'flips' so far
+        """
+        return {"winner": self.__winner.copy(),
+                "plays":  self.__plays.copy(),
+                "flips":  self.__flips.copy()}
+
+    def live_states(self):
+        """
+        Returns
+        -------
+        : dict{str -> np.ndarray}
+            'games', 'layouts', 'piles' and 'cursors' of the unfinished games
+        """
+        return {"games":   self.__live.copy(),
+                "layouts": self.__layouts.copy(),
+                "piles":   self.__piles.copy(),
+                "cursors": self.__cursors.copy()}
+
+    #*********************************************************************#
+    #                        Internal state updates                       #
+    #*********************************************************************#
+
+    def __apply_plays(self, rows, choice):
+        """
+        Plays a card in each of the given games
+
+        Parameters
+        ----------
+        rows: np.ndarray
+            Positions (in the live arrays) of the games to play in
+        choice: np.ndarray
+            Flat index of the play to make in each game
+        """
+        pile = choice % self.__numPiles
+        slot = choice // self.__numPiles
+        player = slot // self.__layoutSize
+        slot = slot % self.__layoutSize
+
+        self.__piles[rows, pile] = self.__layouts[rows, player, slot]
+        self.__deal_into(rows, player, slot)
+
+    def __deal_into(self, rows, player, slot):
+        """
+        Replaces layout[player][slot] with the next card from the player's
+        deck, or an empty slot if the deck is empty
+        """
+        cursor = self.__cursors[rows, player]
+        hasCard = cursor < DECK_SIZE
+        nextCard = self.__decks[rows, player, np.minimum(cursor,
+                                                         DECK_SIZE - 1)]
+        self.__layouts[rows, player, slot] = np.where(hasCard, nextCard, 0)
+        self.__cursors[rows, player] = cursor + hasCard
+
+    def __apply_flips(self, rows):
+        """
+        Flips the top card of every player that has one onto their pile
+        """
+        for p in range(self.__numPlayers):
+            cursor = self.__cursors[rows, p]
+            hasCard = cursor < DECK_SIZE
+            flipRows = rows[hasCard]
+            self.__piles[flipRows, p] = \
+                self.__decks[flipRows, p, cursor[hasCard]]
+            self.__cursors[flipRows, p] += 1
+
+    def __retire(self, keep):
+        """
+        Drops finished games from the live arrays
+
+        Parameters
+        ----------
+        keep: np.ndarray(bool)
+            Mask over the live games of the ones still being played
+        """
+        self.__live    = self.__live[keep]
+        self.__decks   = self.__decks[keep]
+        self.__cursors = self.__cursors[keep]
+        self.__layouts = self.__layouts[keep]
+        self.__piles   = self.__piles[keep]
+
+#==============================================================================#
+#                           Statistics and checking                            #
+#==============================================================================#
+def summarize(results, numPlayers):
+    """
+    Boils per game results down to balance statistics
+
+    Parameters
+    ----------
+    results: dict{str -> np.ndarray}
+        Output of BatchSim.run
+    numPlayers: int
+        The number of players per game
+
+    Returns
+    -------
+    : dict{str -> any}
+        'games', 'winRates' (per player), 'drawRate', 'unfinished',
+        'meanPlays' and 'meanFlips'
+    """
+    winner = results["winner"]
+    n = len(winner)
+    return {"games":      n,
+            "winRates":   [float(np.mean(winner == p))
+                           for p in range(numPlayers)],
+            "drawRate":   float(np.mean(winner == DRAW)),
+            "unfinished": int(np.sum(winner == UNFINISHED)),
+            "meanPlays":  float(np.mean(results["plays"])),
+            "meanFlips":  float(np.mean(results["flips"]))}
+
+def cross_check(seeds, policy=random_policy, numPlayers=2, numGamePiles=2,
+                layoutSize=4):
+    """
+    Plays one batch game per seed next to a ServerGameState dealt from the
+    same seed. Every play and flip the batch makes is repeated on the
+    ServerGameState and the two are compared after every step.
+
+    Parameters
+    ----------
+    seeds: list(int)
+        Seeds for ServerGameState, one game per seed
+
+    Returns
+    -------
+    : int
+        The number of steps that were checked
+
+    Raises
+    ------
+    AssertionError
+        If the batch engine and ServerGameState ever disagree
+    """
+    from ServerGameState import ServerGameState
+    servers = [ServerGameState(numPlayers, numGamePiles, layoutSize, seed=s)
+               for s in seeds]
+    batch = BatchSim.from_compact([g.to_compact() for g in servers])
+    rng = np.random.default_rng(0)
+    numPiles = numGamePiles
+    checked = 0
+
+    while len(batch.live_states()["games"]):
+        games, kinds, moves = batch.step(policy, rng)
+        after = batch.live_states()
+        row = {g: i for i, g in enumerate(after["games"])}
+        for game, kind, move in zip(games, kinds, moves):
+            server = servers[game]
+            if kind == PLAY:
+                slot, pile = divmod(int(move), numPiles)
+                player, slot = divmod(slot, layoutSize)
+                assert server.play_card(player, slot, pile), \
+                    f"seed {seeds[game]}: batch play rejected by server"
+            elif kind == FLIP:
+                assert not server.moves_available(), \
+                    f"seed {seeds[game]}: batch flipped with moves left"
+                assert server.flip(), f"seed {seeds[game]}: server can't flip"
+
+            if game in row:
+                state = server.to_compact()
+                i = row[game]
+                assert list(CompactState.piles(state)) == \
+                    list(after["piles"][i]), f"seed {seeds[game]}: piles"
+                for p in range(numPlayers):
+                    assert list(CompactState.layout(state, p)) == \
+                        list(after["layouts"][i][p]), \
+                        f"seed {seeds[game]}: layout of player {p}"
+                    assert CompactState.cards_left(state, p) == \
+                        DECK_SIZE - after["cursors"][i][p], \
+                        f"seed {seeds[game]}: deck of player {p}"
+            elif kind == NO_ACTION:
+                over, winner = server.game_over()
+                expected = DRAW if winner is None else winner
+                assert over and batch.results()["winner"][game] == expected, \
+                    f"seed {seeds[game]}: result differs"
+            checked += 1
+    return checked
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch Spit simulator")
+    parser.add_argument("--games", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=250_000)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--piles", type=int, default=2)
+    parser.add_argument("--layout", type=int, default=4)
+    parser.add_argument("--policy", choices=POLICIES, default="random")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--cross-check", type=int, default=0, metavar="N",
+                        help="check N seeded games against ServerGameState")
+    args = parser.parse_args()
+
+    if args.cross_check:
+        start = time.perf_counter()
+        steps = cross_check(range(args.cross_check), POLICIES[args.policy],
+                            args.players, args.piles, args.layout)
+        print(f"{args.cross_check} games / {steps} steps match "
+              f"ServerGameState ({time.perf_counter() - start:.1f}s)")
+        return
+
+    seedSeq = np.random.SeedSequence(args.seed)
+    totals = {"winner": [], "plays": [], "flips": []}
+    start = time.perf_counter()
+    done = 0
+    for childSeed in seedSeq.spawn((args.games + args.batch - 1) //
+                                   args.batch):
+        n = min(args.batch, args.games - done)
+        sim = BatchSim.deal(n, args.players, args.piles, args.layout,
+                            seed=childSeed)
+        results = sim.run(POLICIES[args.policy], seed=childSeed)
+        for k in totals:
+            totals[k].append(results[k])
+        done += n
+    elapsed = time.perf_counter() - start
+
+    stats = summarize({k: np.concatenate(v) for k, v in totals.items()},
+                      args.players)
+    print(stats)
+    print(f"{done} games in {elapsed:.1f}s = "
+          f"{done / elapsed * 60:,.0f} games/minute")
+
+if __name__ == "__main__":
+    main()
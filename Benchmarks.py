@@ -0,0 +1,200 @@
+"""
+File: Benchmarks.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    Micro benchmarks for hot paths on the server and the client. Run
+    `python Benchmarks.py broadcast` to time one state broadcast for rooms of
+    2 to 8 players, covering packaging and serializing every client's state.
+    `python Benchmarks.py wal` times logging moves to the write-ahead log
+    with an fsync per move and with group commit over several windows.
+    `python Benchmarks.py grow` times one frame of the client's flip splash
+    with and without GrowAndFadeAnimation's precomputed frames.
+"""
+import os
+import time
+import pickle
+import argparse
+import tempfile
+import threading
+import WriteAheadLog
+from ServerGameState import ServerGameState
+from SharedState import ClientStatePackage
+
+def _per_player_packages(state, numPlayers):
+    """
+    Packages state the way the server used to: one get_player_info call per
+    client, each of which copies every other player's info. Pickle the
+    packages' __dict__ to send them the way they used to be sent, as Card
+    objects.
+    """
+    packages = []
+    for i in range(numPlayers):
+        layout, cardsLeft, midPiles, others = state.get_player_info(i)
+        opp = others[state.opponent_of(i)]
+        packages.append(ClientStatePackage(layout, opp['layout'], midPiles,
+                                           cardsLeft, opp['cardsLeft']))
+    return packages
+
+def _time_per_call(func, repeat):
+    """
+    Returns
+    -------
+    : float
+        Mean microseconds per call of func
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def bench_broadcast(maxPlayers=8, repeat=2000):
+    """
+    Times building and pickling every client's package for one broadcast
+
+    Returns
+    -------
+    : list(dict{str -> float})
+        One row per room size
+    """
+    rows = []
+    for n in range(2, maxPlayers + 1):
+        state = ServerGameState(numPlayers=n, numGamePiles=n, seed=n)
+        def shared():
+            for pkg in state.client_packages():
+                pickle.dumps(("state", "new", pkg))
+        def perPlayer():
+            for pkg in _per_player_packages(state, n):
+                pickle.dumps(("state", "new", vars(pkg)))
+        sharedUs = _time_per_call(shared, repeat)
+        perPlayerUs = _time_per_call(perPlayer, repeat)
+        rows.append({"players":              n,
+                     "sharedUs":             sharedUs,
+                     "sharedUsPerPlayer":    sharedUs / n,
+                     "perPlayerUs":          perPlayerUs,
+                     "perPlayerUsPerPlayer": perPlayerUs / n})
+    return rows
+
+def bench_wal(windows=(0, 0.001, 0.005, 0.02), records=2000, rooms=8):
+    """
+    Times logging plays to a WriteAheadLog. 'appendUs' is what the server's
+    loop pays per play when it does not wait for the disk. 'durablePerSec'
+    is how many plays per second reach the disk when rooms threads each
+    wait for every one of their plays to be durable before the next.
+
+    Returns
+    -------
+    : list(dict{str -> float})
+        One row per commit window, a window of 0 fsyncs every record
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.wal")
+        for window in windows:
+            wal = WriteAheadLog.WriteAheadLog(path, 2, 2, 4, window)
+            start = time.perf_counter()
+            for i in range(records):
+                wal.log_play(i % 2, i % 4, i % 2)
+            appendUs = (time.perf_counter() - start) / records * 1e6
+            wal.close()
+
+            wal = WriteAheadLog.WriteAheadLog(path, 2, 2, 4, window)
+            perRoom = max(1, records // rooms)
+            def room(idx):
+                for i in range(perRoom):
+                    wal.wait_durable(wal.log_play(idx % 2, i % 4, i % 2))
+            threads = [threading.Thread(target=room, args=(i,))
+                       for i in range(rooms)]
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+            stats = wal.stats()
+            wal.close()
+            rows.append({"windowMs":        window * 1000,
+                         "appendUs":        appendUs,
+                         "durablePerSec":   perRoom * rooms / elapsed,
+                         "recordsPerFsync": stats['appended'] /
+                                            max(1, stats['commits'])})
+    return rows
+
+def bench_grow(repeat=300):
+    """
+    Times one step of the flip splash animation: scaling and fading the 
+    image every frame the way GrowAndFadeAnimation used to, against blitting
+    its precomputed frame. Runs without a window.
+
+    Returns
+    -------
+    : dict{str -> float}
+        Mean microseconds per frame and the one-off cost of precomputing the
+        frames in ms
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    import Animations
+    from Assets import AssetManager
+
+    pygame.init()
+    screen = pygame.display.set_mode((1000, 800))
+    img = AssetManager(100).image("flip", scale=2)
+    w, h = img.get_size()
+    center = (500, 400)
+    progs = [(i % 60 + 1) / 60 for i in range(repeat)]
+
+    def scaled(prog):
+        tmp = pygame.transform.scale(img, (w * prog, h * prog))
+        tmp.set_alpha(255 * (1 - prog))
+        screen.blit(tmp, tmp.get_rect(center=center))
+
+    start = time.perf_counter()
+    frames = Animations.GrowAndFadeAnimation.frames_for(img)
+    precomputeMs = (time.perf_counter() - start) * 1000
+
+    def cached(prog):
+        frame = frames[round(prog * len(frames)) - 1]
+        screen.blit(frame, frame.get_rect(center=center))
+
+    rows = {"precomputeMs": precomputeMs}
+    for name, step in (("scaledUs", scaled), ("cachedUs", cached)):
+        start = time.perf_counter()
+        for prog in progs:
+            step(prog)
+        rows[name] = (time.perf_counter() - start) / repeat * 1e6
+    pygame.quit()
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Server micro benchmarks")
+    parser.add_argument("bench", choices=["broadcast", "wal", "grow"])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--max-players", type=int, default=8)
+    parser.add_argument("--rooms", type=int, default=8,
+                        help="threads logging at once for the wal bench")
+    args = parser.parse_args()
+
+    if args.bench == "broadcast":
+        print(f"{'players':>7} {'shared us':>10} {'/player':>8} "
+              f"{'per-player us':>14} {'/player':>8}")
+        for r in bench_broadcast(args.max_players, args.repeat):
+            print(f"{r['players']:>7} {r['sharedUs']:>10.1f} "
+                  f"{r['sharedUsPerPlayer']:>8.2f} {r['perPlayerUs']:>14.1f} "
+                  f"{r['perPlayerUsPerPlayer']:>8.2f}")
+    elif args.bench == "wal":
+        print(f"{'window ms':>9} {'append us':>10} {'durable/s':>10} "
+              f"{'records/fsync':>14}")
+        for r in bench_wal(records=args.repeat, rooms=args.rooms):
+            print(f"{r['windowMs']:>9.1f} {r['appendUs']:>10.1f} "
+                  f"{r['durablePerSec']:>10.0f} {r['recordsPerFsync']:>14.1f}")
+    elif args.bench == "grow":
+        r = bench_grow(args.repeat)
+        print(f"scale + fade per frame: {r['scaledUs']:8.1f} us")
+        print(f"precomputed frame:      {r['cachedUs']:8.1f} us")
+        print(f"precomputing once:      {r['precomputeMs']:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+"""
+File: Bot.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    A computer opponent. BotPlayer speaks the same protocol as Client: it is
+    fed the messages the server sends and answers through a send function
+    with the same messages a Client would send, plays included
+    (("play", PlayCardAction)). It has no threads of its own and is driven by
+    calling tick(), so thousands of bots can share one thread.
+
+    BotSwarm runs any number of bots as headless clients over real sockets
+    from a single thread, which is what we use for load testing.
+    `python Bot.py --server HOST:PORT --bots 2` fills a server with bots.
+"""
+import time
+import heapq
+import random
+import socket
+import argparse
+import selectors
+import MessageBrokers
+from SharedState import PlayCardAction
+
+def _adjacent(rank1, rank2):
+    """
+    Card.are_adjacent over ranks. A rank of 0 marks an empty slot.
+    """
+    return rank1 != 0 and rank2 != 0 and abs(rank1 - rank2) in (1, 12)
+
+def _ranks(cards):
+    return [0 if c is None else c.rank() for c in cards]
+
+class PlayableTracker():
+    """
+    Keeps the table of playable (layoutIdx, midPileIdx) pairs up to date by
+    only recomputing the rows and columns whose card rank changed
+    """
+    def __init__(self):
+        """
+        Constructor
+        """
+        self.__layout = []
+        self.__piles = []
+        self.__playable = [] # playable[layoutIdx][midPileIdx]
+
+    def update(self, layout, midPiles):
+        """
+        Brings the table in line with a new layout and set of mid piles
+
+        Parameters
+        ----------
+        layout: list(Card | None)
+            The player's layout
+        midPiles: list(Card)
+            The cards on top of the mid piles
+
+        Returns
+        -------
+        : int
+            The number of table cells that had to be recomputed
+        """
+        layout = _ranks(layout)
+        piles = _ranks(midPiles)
+        if len(layout) != len(self.__layout) or \
+           len(piles) != len(self.__piles):
+            self.__layout, self.__piles = layout, piles
+            self.__playable = [[_adjacent(l, m) for m in piles]
+                               for l in layout]
+            return len(layout) * len(piles)
+
+        rows = [i for i, r in enumerate(layout) if r != self.__layout[i]]
+        cols = [j for j, r in enumerate(piles) if r != self.__piles[j]]
+        self.__layout, self.__piles = layout, piles
+
+        for i in rows:
+            self.__playable[i] = [_adjacent(layout[i], m) for m in piles]
+        rowSet = set(rows)
+        for j in cols:
+            for i in range(len(layout)):
+                if i not in rowSet:
+                    self.__playable[i][j] = _adjacent(layout[i], piles[j])
+        return len(rows) * len(piles) + len(cols) * (len(layout) - len(rows))
+
+    def pairs(self):
+        """
+        Returns
+        -------
+        : list(tuple(int, int))
+            Every playable (layoutIdx, midPileIdx)
+        """
+        return [(i, j) for i, row in enumerate(self.__playable)
+                       for j, ok in enumerate(row) if ok]
+
+class BotPlayer():
+    """
+    A bot that plays through the Client message protocol
+    """
+    STRATEGIES = ("first", "greedy")
+
+    def __init__(self, name, send, reaction=(0.3, 0.6), budgetUs=200,
+                 strategy="greedy", animationDelay=0.0, rng=None,
+                 clock=time.monotonic):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        name: str
+            The name the bot joins under
+        send: func(any) -> any
+            Called with every message the bot sends to the server
+        reaction: tuple(float, float)
+            The bot waits a uniformly random number of seconds in this range
+            after the board changes before it plays
+        budgetUs: int
+            Hard limit in microseconds on the time spent choosing a play
+        strategy: str
+            "first" plays the first playable card, "greedy" plays the card
+            that leaves the opponent the fewest plays
+        animationDelay: float
+            Seconds to wait before acknowledging a move or flip, mimicking
+            the animations a Client plays
+        rng: random.Random | None
+            Generator for reaction times
+        clock: func() -> float
+            Time source in seconds
+        """
+        if strategy not in BotPlayer.STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}")
+        self.__name = name
+        self.__send = send
+        self.__reaction = reaction
+        self.__budgetNs = budgetUs * 1000
+        self.__strategy = strategy
+        self.__animationDelay = animationDelay
+        self.__rng = rng or random.Random()
+        self.__clock = clock
+
+        self.__tracker = PlayableTracker()
+        self.__state = None
+        self.__playing = False
+        self.__finished = False
+        self.__result = None
+        self.__decideAt = None  # When to next look for a play
+        self.__acks = []        # Times at which to send done-moving
+
+        # Decision statistics
+        self.__decisions = 0
+        self.__decisionNs = 0
+        self.__maxDecisionNs = 0
+        self.__cutShort = 0
+
+    #*********************************************************************#
+    #                     Driving the bot from outside                     #
+    #*********************************************************************#
+
+    def handle_message(self, msg):
+        """
+        Reacts to a message from the server, like Client.handle_message
+
+        Parameters
+        ----------
+        msg: any
+            The message received from the server
+        """
+        now = self.__clock()
+        match msg:
+            case ("ip-info", _):
+                pass
+            case ("name-request",):
+                self.__send(("player-name", self.__name))
+            case ("all-names", _):
+                self.__send(("ready",))
+            case ("state", tag, csp):
+                self.__state = csp
+                self.__tracker.update(csp.myLayout, csp.midPiles)
+                self.__schedule_decision(now)
+                if tag == "initial":
+                    self.__playing = True
+                    self.__send(("done-moving",))
+            case ("move", *_) | ("flip", *_):
+                self.__acks.append(now + self.__animationDelay)
+            case ("bad-move", *_):
+                # Someone beat us to the pile, look again
+                self.__acks.append(now + self.__animationDelay)
+                self.__schedule_decision(now)
+            case ("game-stopped", result, _):
+                if self.__playing and result in ("won", "lost", "draw"):
+                    self.__send(("got-result",))
+                self.__result = result
+                self.__finished = True
+                self.__decideAt = None
+                self.__acks = []
+            case _:
+                pass
+
+    def tick(self, now=None):
+        """
+        Sends anything that is due: acknowledgements and plays
+
+        Parameters
+        ----------
+        now: float | None
+            The current time, read from the clock if None
+
+        Returns
+        -------
+        : float | None
+            When tick next needs to be called, None if nothing is scheduled
+        """
+        now = self.__clock() if now is None else now
+        if self.__acks and min(self.__acks) <= now:
+            due = [t for t in self.__acks if t <= now]
+            self.__acks = [t for t in self.__acks if t > now]
+            for _ in due:
+                self.__send(("done-moving",))
+
+        if self.__playing and self.__decideAt is not None and \
+           self.__decideAt <= now:
+            self.__decideAt = None
+            action = self.decide()
+            if action is not None:
+                self.__send(("play", action))
+        return self.next_wake()
+
+    def next_wake(self):
+        """
+        Returns
+        -------
+        : float | None
+            The earliest time something is scheduled, None if nothing is
+        """
+        times = self.__acks + ([self.__decideAt] if self.__playing and
+                               self.__decideAt is not None else [])
+        return min(times) if times else None
+
+    def finished(self):
+        return self.__finished
+
+    def result(self):
+        """
+        Returns
+        -------
+        : str | None
+            How the game ended for this bot once it is over
+        """
+        return self.__result
+
+    def stats(self):
+        """
+        Returns
+        -------
+        : dict{str -> float}
+            'decisions', 'meanDecisionUs', 'maxDecisionUs' and 'cutShort' (the
+            number of decisions that ran out of budget)
+        """
+        return {"decisions":      self.__decisions,
+                "meanDecisionUs": self.__decisionNs / 1000 /
+                                  max(self.__decisions, 1),
+                "maxDecisionUs":  self.__maxDecisionNs / 1000,
+                "cutShort":       self.__cutShort}
+
+    #*********************************************************************#
+    #                           Choosing a play                           #
+    #*********************************************************************#
+
+    def decide(self):
+        """
+        Chooses a play within the time budget. Candidates are scored until
+        the budget runs out and the best one scored so far is played.
+
+        Returns
+        -------
+        : PlayCardAction | None
+            The play, or None if the bot has nothing to play
+        """
+        start = time.perf_counter_ns()
+        deadline = start + self.__budgetNs
+        pairs = self.__tracker.pairs()
+        best = pairs[0] if pairs else None
+
+        if self.__strategy == "greedy" and len(pairs) > 1:
+            bestScore = None
+            for pair in pairs:
+                if time.perf_counter_ns() > deadline:
+                    self.__cutShort += 1
+                    break
+                score = self.__opponent_plays(*pair)
+                if bestScore is None or score < bestScore:
+                    best, bestScore = pair, score
+
+        elapsed = time.perf_counter_ns() - start
+        self.__decisions += 1
+        self.__decisionNs += elapsed
+        self.__maxDecisionNs = max(self.__maxDecisionNs, elapsed)
+        return None if best is None else PlayCardAction(*best)
+
+    def __opponent_plays(self, layoutIdx, midPileIdx):
+        """
+        Returns
+        -------
+        : int
+            The number of plays the opponent would have if we played
+            layoutIdx onto midPileIdx
+        """
+        piles = _ranks(self.__state.midPiles)
+        piles[midPileIdx] = self.__state.myLayout[layoutIdx].rank()
+        theirs = _ranks(self.__state.theirLayout)
+        return sum(1 for l in theirs for m in piles if _adjacent(l, m))
+
+    def __schedule_decision(self, now):
+        """
+        Looks for a play after a reaction delay from now
+        """
+        low, high = self.__reaction
+        self.__decideAt = now + self.__rng.uniform(low, high)
+
+#==============================================================================#
+#                      Headless bots over real sockets                         #
+#==============================================================================#
+class BotSwarm():
+    """
+    Runs many BotPlayers as network clients from one thread with a selector
+    """
+    def __init__(self, msgBroker=MessageBrokers.LenAndPayload()):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        msgBroker: LenAndPayload
+            The over-the-wire protocol, must match the server's
+        """
+        self.__msgBroker = msgBroker
+        self.__selector = selectors.DefaultSelector()
+        self.__bots = {}   # socket -> BotPlayer
+        self.__wakes = []  # heap of (time, id, socket)
+        self.__seq = 0
+
+    def add_bot(self, host, port, name, **botArgs):
+        """
+        Connects a new bot to a server
+
+        Parameters
+        ----------
+        host: str
+            Address of the server
+        port: int
+            Port of the server
+        name: str
+            The bot's player name
+        botArgs: dict
+            Passed on to BotPlayer
+
+        Returns
+        -------
+        : BotPlayer
+        """
+        sock = socket.create_connection((host, port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        bot = BotPlayer(name, lambda msg: self.__msgBroker.tx(sock, msg),
+                        **botArgs)
+        self.__bots[sock] = bot
+        self.__selector.register(sock, selectors.EVENT_READ)
+        return bot
+
+    def run(self, timeout=None):
+        """
+        Runs every bot until all of them have finished or disconnected
+
+        Parameters
+        ----------
+        timeout: float | None
+            Give up after this many seconds
+
+        Returns
+        -------
+        : list(BotPlayer)
+            Every bot that was run
+        """
+        bots = list(self.__bots.values())
+        end = None if timeout is None else time.monotonic() + timeout
+        while self.__bots and (end is None or time.monotonic() < end):
+            wait = 1.0
+            if self.__wakes:
+                wait = min(wait, max(0.0, self.__wakes[0][0] -
+                                          time.monotonic()))
+            for key, _ in self.__selector.select(wait):
+                self.__receive(key.fileobj)
+
+            now = time.monotonic()
+            while self.__wakes and self.__wakes[0][0] <= now:
+                _, _, sock = heapq.heappop(self.__wakes)
+                if sock in self.__bots:
+                    self.__schedule(sock, self.__bots[sock].tick(now))
+        for sock in list(self.__bots):
+            self.__remove(sock)
+        return bots
+
+    def __receive(self, sock):
+        """
+        Hands one message from the server to the bot that owns sock
+        """
+        bot = self.__bots[sock]
+        try:
+            msg = self.__msgBroker.rx(sock)
+        except OSError:
+            msg = None
+        if msg is None:
+            self.__remove(sock)
+            return
+        bot.handle_message(msg)
+        self.__schedule(sock, bot.tick())
+        if bot.finished():
+            self.__remove(sock)
+
+    def __schedule(self, sock, wake):
+        """
+        Remembers to tick the bot on sock at time wake
+        """
+        if wake is not None:
+            heapq.heappush(self.__wakes, (wake, self.__seq, sock))
+            self.__seq += 1
+
+    def __remove(self, sock):
+        """
+        Disconnects a bot
+        """
+        self.__selector.unregister(sock)
+        sock.close()
+        del self.__bots[sock]
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Spit bots")
+    parser.add_argument("--server", action="append", required=True,
+                        help="HOST:PORT, may be given more than once")
+    parser.add_argument("--bots", type=int, default=2,
+                        help="bots per server")
+    parser.add_argument("--strategy", choices=BotPlayer.STRATEGIES,
+                        default="greedy")
+    parser.add_argument("--reaction", type=float, nargs=2,
+                        default=(0.3, 0.6), metavar=("MIN", "MAX"))
+    parser.add_argument("--budget-us", type=int, default=200)
+    args = parser.parse_args()
+
+    swarm = BotSwarm()
+    for address in args.server:
+        host, port = address.rsplit(":", 1)
+        for i in range(args.bots):
+            swarm.add_bot(host, int(port), f"bot-{i}", strategy=args.strategy,
+                          reaction=tuple(args.reaction),
+                          budgetUs=args.budget_us)
+    bots = swarm.run()
+    for bot in bots:
+        print(bot.result(), bot.stats())
+
+if __name__ == "__main__":
+    main()
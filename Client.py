@@ -15,6 +15,8 @@ from Display import Display
 from queue import Queue
 from enum import Enum
 from threading import Lock
+import argparse
+import time
 
 
 
@@ -73,7 +75,8 @@ class Client(BaseClient):
     #          Constructor and Driver function for the Client             #
     #*********************************************************************#
     
-    def __init__(self, serverAddr, port, name, timeout=5):
+    def __init__(self, serverAddr, port, name, timeout=5, 
+                 reportLatency=False):
         """
          Constructor for the Client class
  
@@ -87,6 +90,8 @@ class Client(BaseClient):
              The name of the client
          timeout: int
              The time (seconds) to wait to connect to the server
+         reportLatency: bool
+             Whether to print latency_report when the game closes
  
          Returns
          -------
@@ -105,8 +110,14 @@ class Client(BaseClient):
         self.__msgQueue = Queue()
         self.__gameResult = None
         self.__status = Client.ClientStatus()
+        self.__sendLock = Lock()    # Plays skip the queue, one sender at once
+        self.__playLatencies = []   # Seconds from click to socket per play
+        self.__reportLatency = reportLatency
 
-        self.__display = Display(self.__state, self.__msgQueue)
+        # Display only starts loading its images in the background, so 
+        # connecting and joining run alongside the loading
+        self.__display = Display(self.__state, self.__msgQueue,
+                                 sendPlay=self.__send_play)
 
         self.__spawn_listener(serverAddr, port)
         self.__spawn_sender()
@@ -124,9 +135,28 @@ class Client(BaseClient):
         self.__sender.join()
         self.__listener.join()
         
+        if self.__reportLatency and self.__playLatencies:
+            print(self.latency_report())
+
         if self.__gameResult: # If we arent killed by user, show result
             self.__display.final_state(self.__gameResult)
 
+    def latency_report(self):
+        """
+        Summarizes how long plays took to go from the click being taken off
+        the event queue to being written to the socket
+
+        Returns
+        -------
+        : str
+        """
+        times = sorted(self.__playLatencies)
+        def pct(p):
+            return times[min(len(times) - 1, int(p / 100 * len(times)))] * 1e3
+        return (f"Click to wire over {len(times)} plays: "
+                f"p50 {pct(50):.2f} ms, p90 {pct(90):.2f} ms, "
+                f"p99 {pct(99):.2f} ms, max {times[-1] * 1e3:.2f} ms")
+
     #*********************************************************************#
     #       Internal functions for the sender and listener threads        #
     #*********************************************************************#
@@ -139,10 +169,30 @@ class Client(BaseClient):
             msg = self.__msgQueue.get(block=True)
             # Falsey values used as sentinels
             if msg:
-                if not self.tx_message(msg) or msg == ("quitting",):
+                with self.__sendLock:
+                    sent = self.tx_message(msg)
+                if not sent or msg == ("quitting",):
                     self.__status.update_status(
                         Client.ClientStatusValue.STOPPING)
 
+    def __send_play(self, action, inputTime):
+        """
+        Sends a play straight from the display thread so it does not wait for
+        the sender thread to be woken up
+
+        Parameters
+        ----------
+        action: PlayCardAction
+            The play
+        inputTime: float
+            time.perf_counter() time the click was taken off the event queue
+        """
+        with self.__sendLock:
+            sent = self.tx_message(('play', action))
+        self.__playLatencies.append(time.perf_counter() - inputTime)
+        if not sent:
+            self.__stop_game()
+
     def __spawn_sender(self):
         """
         Spools up a sender thread
@@ -296,6 +346,7 @@ class Client(BaseClient):
 
             case ("state", "new", csp): 
                 self.__state.update_state(csp)
+                self.__display.wake()
 
             case ("move", srcLayout, srcIdx, destLayout, destIdx): 
                 self.__display.move_card(srcLayout, srcIdx, destLayout, 
@@ -323,9 +374,15 @@ class Client(BaseClient):
         self.__msgQueue.put(None) 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spit client")
+    parser.add_argument("--latency", action="store_true",
+                        help="print how long plays took from click to socket "
+                             "when the game closes")
+    args = parser.parse_args()
+
     ip = input("Enter the IP to connect to: ")   
     port = int(input("Enter the port to connect to: "))   
     
     name = input('Player Name: ')
-    myCli = Client(ip, port, name)
+    myCli = Client(ip, port, name, reportLatency=args.latency)
     myCli.run()
\ No newline at end of file
@@ -0,0 +1,441 @@
+"""
+File: CompactState.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    A flat, array-backed representation of a ServerGameState. The whole game
+    lives in one small bytearray of card codes so that it can be cloned with a
+    single buffer copy and hashed without building any Python objects. All of
+    the rules from ServerGameState are available as functions over that
+    buffer: the plain versions are pure and return a new buffer, the
+    *_inplace versions mutate the buffer they are given.
+
+    Buffer layout (every entry is one byte):
+        [numPlayers, numGamePiles, layoutSize]
+        [pile top] * numGamePiles
+        for each player:
+            [deck cursor] [layout card] * layoutSize [deck card] * DECK_SIZE
+
+    Card codes are 0 for an empty slot and suit * 13 + rank (1..52) otherwise.
+    A player's deck is stored top first and the cursor is the index of the
+    next card to be dealt, so cards left = DECK_SIZE - cursor.
+"""
+import hashlib
+from Card import Card
+
+DECK_SIZE = 52
+EMPTY = 0
+
+# Bytes before the pile tops: numPlayers, numGamePiles and layoutSize
+HEADER_SIZE = 3
+
+# Offsets into the header
+_N_PLAYERS = 0
+_N_PILES   = 1
+_LAYOUT_SZ = 2
+_PILES     = HEADER_SIZE
+
+#==============================================================================#
+#                              Card code helpers                               #
+#==============================================================================#
+def encode_card(card):
+    """
+    Converts a Card (or None) into its one byte code
+
+    Parameters
+    ----------
+    card: Card | None
+        The card to encode
+
+    Returns
+    -------
+    : int
+        0 for None otherwise suit * 13 + rank
+    """
+    if card is None:
+        return EMPTY
+    return card.suit().value * 13 + card.rank()
+
+def decode_card(code):
+    """
+    Converts a one byte card code back into a Card
+
+    Parameters
+    ----------
+    code: int
+        A code produced by encode_card
+
+    Returns
+    -------
+    : Card | None
+    """
+    if code == EMPTY:
+        return None
+    return Card((code - 1) % 13 + 1, Card.Suit((code - 1) // 13))
+
+def code_rank(code):
+    """
+    Returns
+    -------
+    : int
+        The rank of the card with the given (nonzero) code
+    """
+    return (code - 1) % 13 + 1
+
+# ADJACENT[a * 53 + b] is 1 when codes a and b are real cards that satisfy
+# Card.are_adjacent and 0 otherwise. Row 0 / column 0 (empty slots) are all 0.
+ADJACENT = bytes(
+    1 if a and b and abs(code_rank(a) - code_rank(b)) in (1, 12) else 0
+    for a in range(DECK_SIZE + 1) for b in range(DECK_SIZE + 1))
+
+def are_adjacent(code1, code2):
+    """
+    Card.are_adjacent over card codes. Empty slots are never adjacent.
+    """
+    return ADJACENT[code1 * (DECK_SIZE + 1) + code2] == 1
+
+#==============================================================================#
+#                          Construction and inspection                         #
+#==============================================================================#
+def player_offset(state, playerIdx):
+    """
+    Returns
+    -------
+    : int
+        Index of the deck cursor of player playerIdx in state. The layout
+        follows at +1 and the deck at +1 + layoutSize.
+    """
+    return _PILES + state[_N_PILES] + \
+        playerIdx * (1 + state[_LAYOUT_SZ] + DECK_SIZE)
+
+def from_parts(layouts, decks, piles):
+    """
+    Builds a state from the pieces of a game that is already in progress
+
+    Parameters
+    ----------
+    layouts: list(list(Card | None))
+        The layout of each player
+    decks: list(list(Card))
+        The cards still in each player's deck, top first
+    piles: list(Card)
+        The cards on top of the center piles
+
+    Returns
+    -------
+    state: bytearray
+    """
+    numPlayers = len(layouts)
+    layoutSize = len(layouts[0]) if numPlayers else 0
+    state = bytearray([numPlayers, len(piles), layoutSize])
+    state += bytes(encode_card(c) for c in piles)
+    for playerLayout, playerDeck in zip(layouts, decks):
+        # Remaining cards are right aligned so cursor = DECK_SIZE - len(deck)
+        state.append(DECK_SIZE - len(playerDeck))
+        state += bytes(encode_card(c) for c in playerLayout)
+        state += bytes(DECK_SIZE - len(playerDeck))
+        state += bytes(encode_card(c) for c in playerDeck)
+    return state
+
+def new_state(decks, numGamePiles=2, layoutSize=4):
+    """
+    Deals a new game from full decks the same way ServerGameState does: each
+    player deals their layout and then center pile i is dealt from player
+    i % numPlayers.
+
+    Parameters
+    ----------
+    decks: list(list(int))
+        One DECK_SIZE long list of card codes per player, top first
+    numGamePiles: int
+        The number of center piles
+    layoutSize: int
+        The number of cards in each player's layout
+
+    Returns
+    -------
+    state: bytearray
+    """
+    numPlayers = len(decks)
+    state = bytearray([numPlayers, numGamePiles, layoutSize])
+    state += bytes(numGamePiles)
+    for deck in decks:
+        state.append(layoutSize)
+        state += bytes(deck[:layoutSize])
+        state += bytes(deck)
+
+    for i in range(numGamePiles):
+        base = player_offset(state, i % numPlayers)
+        state[_PILES + i] = state[base + 1 + layoutSize + state[base]]
+        state[base] += 1
+    return state
+
+def clone(state):
+    """
+    Returns
+    -------
+    : bytearray
+        An independent copy of state made with a single buffer copy
+    """
+    return state[:]
+
+def state_key(state):
+    """
+    Returns
+    -------
+    : bytes
+        An immutable snapshot of state that can be used as a dict key
+    """
+    return bytes(state)
+
+def state_hash(state):
+    """
+    Hashes the state buffer in place without building a snapshot
+
+    Returns
+    -------
+    : int
+        A 64 bit hash of state
+    """
+    return int.from_bytes(hashlib.blake2b(state, digest_size=8).digest(),
+                          'big')
+
+def shape(state):
+    """
+    Returns
+    -------
+    : tuple(int, int, int)
+        (numPlayers, numGamePiles, layoutSize)
+    """
+    return state[_N_PLAYERS], state[_N_PILES], state[_LAYOUT_SZ]
+
+def piles(state):
+    """
+    Returns
+    -------
+    : bytes
+        The codes of the cards on top of each center pile
+    """
+    return bytes(state[_PILES:_PILES + state[_N_PILES]])
+
+def layout(state, playerIdx):
+    """
+    Returns
+    -------
+    : bytes
+        The codes of the cards in a player's layout (0 for empty slots)
+    """
+    base = player_offset(state, playerIdx) + 1
+    return bytes(state[base:base + state[_LAYOUT_SZ]])
+
+def cards_left(state, playerIdx):
+    """
+    Returns
+    -------
+    : int
+        The number of cards left in a player's deck
+    """
+    return DECK_SIZE - state[player_offset(state, playerIdx)]
+
+def deck(state, playerIdx):
+    """
+    Returns
+    -------
+    : bytes
+        The codes of the cards left in a player's deck, top first
+    """
+    base = player_offset(state, playerIdx)
+    start = base + 1 + state[_LAYOUT_SZ]
+    return bytes(state[start + state[base]:start + DECK_SIZE])
+
+#==============================================================================#
+#                                    Rules                                     #
+#==============================================================================#
+def legal_moves(state, playerIdx=None):
+    """
+    Lists every play that is allowed by the adjacency rules
+
+    Parameters
+    ----------
+    playerIdx: int | None
+        Only list moves for this player. Lists moves for everyone if None.
+
+    Returns
+    -------
+    : list(tuple(int, int, int))
+        (playerIdx, layoutIdx, midPileIdx) for every legal play
+    """
+    numPlayers, numPiles, layoutSize = state[0], state[1], state[2]
+    tops = state[_PILES:_PILES + numPiles]
+    players = range(numPlayers) if playerIdx is None else (playerIdx,)
+    moves = []
+    for p in players:
+        base = player_offset(state, p) + 1
+        for l in range(layoutSize):
+            row = state[base + l] * (DECK_SIZE + 1)
+            if row:
+                for c, top in enumerate(tops):
+                    if ADJACENT[row + top]:
+                        moves.append((p, l, c))
+    return moves
+
+def moves_available(state):
+    """
+    Returns
+    -------
+    : bool
+        True if any player can play any card, mirrors
+        ServerGameState.moves_available
+    """
+    numPlayers, numPiles, layoutSize = state[0], state[1], state[2]
+    tops = state[_PILES:_PILES + numPiles]
+    stride = 1 + layoutSize + DECK_SIZE
+    base = _PILES + numPiles + 1
+    for _ in range(numPlayers):
+        for l in range(base, base + layoutSize):
+            row = state[l] * (DECK_SIZE + 1)
+            if row:
+                for top in tops:
+                    if ADJACENT[row + top]:
+                        return True
+        base += stride
+    return False
+
+def _finished_player(state):
+    """
+    Returns
+    -------
+    : int | None
+        The index of the first player whose layout and deck are both empty
+    """
+    numPlayers, numPiles, layoutSize = state[0], state[1], state[2]
+    stride = 1 + layoutSize + DECK_SIZE
+    base = _PILES + numPiles
+    for p in range(numPlayers):
+        if state[base] == DECK_SIZE and \
+           not any(state[base + 1:base + 1 + layoutSize]):
+            return p
+        base += stride
+    return None
+
+def game_over(state):
+    """
+    Checks if the game is over, mirrors ServerGameState.game_over
+
+    Returns
+    -------
+    : tuple(bool, int|None)
+        Whether the game is over and the index of the winner or None for a
+        draw / unfinished game
+    """
+    numPlayers, numPiles, layoutSize = state[0], state[1], state[2]
+    stride = 1 + layoutSize + DECK_SIZE
+    cursors = state[_PILES + numPiles::stride][:numPlayers]
+    if all(c == DECK_SIZE for c in cursors) and not moves_available(state):
+        counts = [layoutSize - layout(state, p).count(EMPTY)
+                  for p in range(numPlayers)]
+        if len(set(counts)) == 1:
+            return (True, None)
+        return (True, counts.index(min(counts)))
+
+    winner = _finished_player(state)
+    return (winner is not None, winner)
+
+def play_card_inplace(state, playerIdx, layoutIdx, centerIndex):
+    """
+    Plays a card by mutating state, mirrors ServerGameState.play_card
+
+    Parameters
+    ----------
+    state: bytearray
+        The state to modify
+    playerIdx: int
+        The index of the player attempting the move
+    layoutIdx: int
+        The index of the card in the player's layout
+    centerIndex: int
+        The index of the mid pile to play onto
+
+    Returns
+    -------
+    : bool
+        Whether the play was valid and happened
+    """
+    if not (0 <= layoutIdx < state[_LAYOUT_SZ] and
+            0 <= centerIndex < state[_N_PILES]):
+        raise IndexError("list index out of range")
+    base = player_offset(state, playerIdx)
+    slot = base + 1 + layoutIdx
+    card = state[slot]
+    if not ADJACENT[card * (DECK_SIZE + 1) + state[_PILES + centerIndex]]:
+        return False
+    # An adjacent play means moves exist so the game can only be over if
+    # someone has already played out every card
+    if _finished_player(state) is not None:
+        return False
+
+    state[_PILES + centerIndex] = card
+    cursor = state[base]
+    if cursor < DECK_SIZE:
+        state[slot] = state[base + 1 + state[_LAYOUT_SZ] + cursor]
+        state[base] = cursor + 1
+    else:
+        state[slot] = EMPTY
+    return True
+
+def flip_inplace(state):
+    """
+    Flips a card from each player that has one onto their mid pile by mutating
+    state, mirrors ServerGameState.flip
+
+    Returns
+    -------
+    : list(int)
+        The list of indices of the players that flipped
+    """
+    if moves_available(state) or game_over(state)[0]:
+        return []
+
+    numPlayers, numPiles, layoutSize = state[0], state[1], state[2]
+    stride = 1 + layoutSize + DECK_SIZE
+    base = _PILES + numPiles
+    flipped = []
+    for p in range(numPlayers):
+        cursor = state[base]
+        if cursor < DECK_SIZE:
+            if p >= numPiles:
+                raise IndexError("list assignment index out of range")
+            state[_PILES + p] = state[base + 1 + layoutSize + cursor]
+            state[base] = cursor + 1
+            flipped.append(p)
+        base += stride
+    return flipped
+
+def play_card(state, playerIdx, layoutIdx, centerIndex):
+    """
+    Pure version of play_card_inplace
+
+    Returns
+    -------
+    : bytearray | None
+        The state after the play or None if the play is not valid
+    """
+    newState = state[:]
+    if play_card_inplace(newState, playerIdx, layoutIdx, centerIndex):
+        return newState
+    return None
+
+def flip(state):
+    """
+    Pure version of flip_inplace
+
+    Returns
+    -------
+    : tuple(bytearray, list(int))
+        The state after flipping and the indices of the players that flipped
+    """
+    newState = state[:]
+    flipped = flip_inplace(newState)
+    return newState, flipped
@@ -0,0 +1,323 @@
+"""
+File: DealDatabase.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    A database of pre-generated, pre-scored deals that the server can pull
+    from instead of shuffling fresh decks for every room.
+
+    The generator (python DealDatabase.py --out deals.bin) shuffles deals,
+    scores each one by playing it out many times with BatchSim and writes
+    them to a binary file grouped into difficulty buckets. DealDatabase
+    memory-maps that file so any deal can be fetched in O(1) without ever
+    reading the whole file into memory.
+
+    Deals are scored under one rule set, the number of players, mid piles and
+    layout size they were played out with, and the header records it. The
+    difficulty buckets only describe games with that shape.
+
+    File layout (little endian):
+        header:  magic (8s) version (H) numPlayers (H) numGamePiles (H)
+                 layoutSize (H) numDeals (I) numBuckets (I)
+        buckets: numBuckets * [first record (I) record count (I)
+                 highest meanFlips in bucket (f)]
+        records: numDeals * [numPlayers * 52 card codes (B)
+                 meanFlips (f) drawRate (f) firstWinRate (f)]
+
+    Card codes are the ones used by CompactState. Bucket 0 holds the deals
+    with the fewest expected flips and the last bucket the most.
+"""
+import os
+import mmap
+import time
+import random
+import struct
+import argparse
+import CompactState
+from CompactState import DECK_SIZE
+
+MAGIC = b"SPITDEAL"
+VERSION = 2
+
+HEADER = struct.Struct("<8sHHHHII")
+BUCKET = struct.Struct("<IIf")
+SCORES = struct.Struct("<fff")
+
+class DealDatabase():
+    """
+    Read only view of a deal file backed by mmap
+    """
+    def __init__(self, path):
+        """
+        Constructor. Only the header and bucket index are read.
+
+        Parameters
+        ----------
+        path: str
+            Deal file written by generate()
+
+        Raises
+        ------
+        ValueError
+            If the file is not a deal file or is shorter than its header says
+        """
+        self.__file = None
+        self.__map = None
+        self.__file = open(path, "rb")
+        self.__map = mmap.mmap(self.__file.fileno(), 0,
+                               access=mmap.ACCESS_READ)
+
+        if len(self.__map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is too short to be a deal file")
+        magic, version, self.__numPlayers, self.__numGamePiles, \
+            self.__layoutSize, self.__numDeals, numBuckets = \
+            HEADER.unpack_from(self.__map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} deal file")
+
+        self.__deckBytes = self.__numPlayers * DECK_SIZE
+        self.__recordSize = self.__deckBytes + SCORES.size
+        self.__firstRecord = HEADER.size + numBuckets * BUCKET.size
+        expected = self.__firstRecord + self.__numDeals * self.__recordSize
+        size = len(self.__map)
+        if size < expected:
+            self.close()
+            raise ValueError(f"{path} is truncated, the header needs "
+                             f"{expected} bytes but it has {size}")
+
+        self.__buckets = [BUCKET.unpack_from(self.__map,
+                                             HEADER.size + i * BUCKET.size)
+                          for i in range(numBuckets)]
+        if any(start + count > self.__numDeals
+               for start, count, _ in self.__buckets):
+            self.close()
+            raise ValueError(f"{path} has a bucket past its last deal")
+
+        # draw() falls back to the closest non-empty bucket, the lower one on
+        # a tie. Work that out once so a draw does not search for it.
+        nonEmpty = [b for b, (_, count, _) in enumerate(self.__buckets)
+                    if count]
+        self.__nearest = [min(nonEmpty, key=lambda e: abs(e - b))
+                          if nonEmpty else None
+                          for b in range(numBuckets)]
+
+    def __len__(self):
+        return self.__numDeals
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """
+        Unmaps and closes the file. Safe to call more than once.
+        """
+        if self.__map is not None and not self.__map.closed:
+            self.__map.close()
+        if self.__file is not None:
+            self.__file.close()
+
+    def num_players(self):
+        return self.__numPlayers
+
+    def shape(self):
+        """
+        Returns
+        -------
+        : tuple(int, int, int)
+            numPlayers, numGamePiles and layoutSize the deals were scored with
+        """
+        return self.__numPlayers, self.__numGamePiles, self.__layoutSize
+
+    def num_buckets(self):
+        return len(self.__buckets)
+
+    def bucket_range(self, bucket):
+        """
+        Returns
+        -------
+        : tuple(int, int)
+            Index of the first deal in bucket and the number of deals in it
+        """
+        start, count, _ = self.__buckets[bucket]
+        return start, count
+
+    def deal(self, index):
+        """
+        Reads one deal
+
+        Parameters
+        ----------
+        index: int
+            Index of the deal in the file
+
+        Returns
+        -------
+        : dict{str -> any}
+            'index', 'decks' (one list of Cards per player, top first, ready
+            for ServerGameState), 'meanFlips', 'drawRate' and 'firstWinRate'
+        """
+        if not 0 <= index < self.__numDeals:
+            raise IndexError("deal index out of range")
+        offset = self.__firstRecord + index * self.__recordSize
+        codes = self.__map[offset:offset + self.__deckBytes]
+        meanFlips, drawRate, firstWinRate = \
+            SCORES.unpack_from(self.__map, offset + self.__deckBytes)
+
+        decks = [[CompactState.decode_card(c)
+                  for c in codes[p * DECK_SIZE:(p + 1) * DECK_SIZE]]
+                 for p in range(self.__numPlayers)]
+        return {"index":        index,
+                "decks":        decks,
+                "meanFlips":    meanFlips,
+                "drawRate":     drawRate,
+                "firstWinRate": firstWinRate}
+
+    def draw(self, bucket=None, rng=random):
+        """
+        Picks a random deal in O(1)
+
+        Parameters
+        ----------
+        bucket: int | None
+            Difficulty bucket to draw from. If it is empty the closest
+            non-empty bucket is used. Draws from every deal if None.
+        rng: random.Random
+            Generator used to pick the deal
+
+        Returns
+        -------
+        : dict{str -> any}
+            See deal()
+        """
+        if self.__numDeals == 0:
+            raise IndexError("deal file is empty")
+        if bucket is None:
+            return self.deal(rng.randrange(self.__numDeals))
+
+        bucket = min(max(bucket, 0), len(self.__buckets) - 1)
+        if bucket < 0 or self.__nearest[bucket] is None:
+            raise IndexError("deal file has no deals in any bucket")
+        start, count = self.bucket_range(self.__nearest[bucket])
+        return self.deal(start + rng.randrange(count))
+
+#==============================================================================#
+#                               Offline generator                              #
+#==============================================================================#
+def generate(path, numDeals, playouts=32, numBuckets=10, numPlayers=2,
+             seed=None, chunk=20_000, numGamePiles=None, layoutSize=4):
+    """
+    Generates, scores and writes a deal file. Only chunk deals are held in
+    memory at a time while scoring.
+
+    Parameters
+    ----------
+    path: str
+        File to write
+    numDeals: int
+        The number of deals to generate
+    playouts: int
+        Random playouts per deal used to score it
+    numBuckets: int
+        The number of difficulty buckets, split at quantiles of meanFlips
+    numPlayers: int
+        Players per deal
+    seed: int | None
+        Seed for shuffling and playouts
+    chunk: int
+        Deals scored per batch
+    numGamePiles: int | None
+        Mid piles the deals are scored with, numPlayers if None
+    layoutSize: int
+        Layout size the deals are scored with
+    """
+    import numpy as np
+    from BatchSim import BatchSim, random_policy, DRAW
+
+    if numGamePiles is None:
+        numGamePiles = numPlayers
+
+    record = np.dtype([("decks", np.uint8, (numPlayers, DECK_SIZE)),
+                       ("meanFlips", "<f4"),
+                       ("drawRate", "<f4"),
+                       ("firstWinRate", "<f4")])
+    rng = np.random.default_rng(seed)
+    ordered = np.arange(1, DECK_SIZE + 1, dtype=np.uint8)
+    scores = np.empty(numDeals, dtype=np.float32)
+    unsortedPath = path + ".unsorted"
+
+    with open(unsortedPath, "wb") as unsorted:
+        for start in range(0, numDeals, chunk):
+            n = min(chunk, numDeals - start)
+            decks = rng.permuted(np.broadcast_to(ordered,
+                                                 (n, numPlayers, DECK_SIZE)),
+                                 axis=2)
+            sim = BatchSim.from_decks(np.repeat(decks, playouts, axis=0),
+                                      numGamePiles=numGamePiles,
+                                      layoutSize=layoutSize)
+            results = sim.run(random_policy, seed=rng.integers(2 ** 63))
+            winner = results["winner"].reshape(n, playouts)
+
+            recs = np.empty(n, dtype=record)
+            recs["decks"] = decks
+            recs["meanFlips"] = results["flips"].reshape(n, playouts) \
+                                                .mean(axis=1)
+            recs["drawRate"] = (winner == DRAW).mean(axis=1)
+            recs["firstWinRate"] = (winner == 0).mean(axis=1)
+            unsorted.write(recs.tobytes())
+            scores[start:start + n] = recs["meanFlips"]
+
+    # Group the deals by difficulty bucket
+    edges = np.quantile(scores, np.linspace(0, 1, numBuckets + 1)[1:-1])
+    buckets = np.searchsorted(edges, scores, side="right")
+    order = np.argsort(buckets, kind="stable")
+    counts = np.bincount(buckets, minlength=numBuckets)
+    firsts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    highest = [float(scores[buckets == b].max()) if counts[b] else 0.0
+               for b in range(numBuckets)]
+
+    source = np.memmap(unsortedPath, dtype=record, mode="r")
+    with open(path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, VERSION, numPlayers, numGamePiles,
+                              layoutSize, numDeals, numBuckets))
+        for b in range(numBuckets):
+            out.write(BUCKET.pack(int(firsts[b]), int(counts[b]), highest[b]))
+        for start in range(0, numDeals, chunk):
+            out.write(source[order[start:start + chunk]].tobytes())
+    del source
+    os.remove(unsortedPath)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deal database")
+    parser.add_argument("--out", default="deals.bin")
+    parser.add_argument("--deals", type=int, default=1_000_000)
+    parser.add_argument("--playouts", type=int, default=32)
+    parser.add_argument("--buckets", type=int, default=10)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--piles", type=int, default=None,
+                        help="mid piles to score with, --players if not given")
+    parser.add_argument("--layout", type=int, default=4,
+                        help="layout size to score with")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    generate(args.out, args.deals, args.playouts, args.buckets, args.players,
+             args.seed, numGamePiles=args.piles, layoutSize=args.layout)
+    print(f"Wrote {args.deals} deals to {args.out} in "
+          f"{time.perf_counter() - start:.1f}s")
+
+    db = DealDatabase(args.out)
+    for b in range(db.num_buckets()):
+        start, count = db.bucket_range(b)
+        if count:
+            d = db.deal(start)
+            print(f"bucket {b}: {count} deals, e.g. meanFlips "
+                  f"{d['meanFlips']:.2f} drawRate {d['drawRate']:.2f}")
+    db.close()
+
+if __name__ == "__main__":
+    main()
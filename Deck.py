@@ -14,14 +14,24 @@ class EmptyDeckError(Exception):
     pass
 
 class Deck():
-    def __init__(self):
+    def __init__(self, cards=None):
         """
          Constructor for the Deck class. Creates standard 52 Card deck
+
+         Parameters
+         ----------
+         cards: list(Card) | None
+             Cards to build the deck from, top first, instead of a new
+             standard deck in order
  
          Returns
          -------
          : Deck
          """
+        if cards is not None:
+            self.__theDeck = list(cards)
+            return
+
         self.__theDeck = []
 
         # create deck of 52 standard cards:
@@ -31,15 +41,21 @@ class Deck():
                 self.__theDeck.append(Card(r, s))
 
 
-    def shuffle(self):
+    def shuffle(self, rng=None):
         """
          Shuffles the order of the deck
+
+         Parameters
+         ----------
+         rng: random.Random | None
+             Random number generator to shuffle with. Uses the module level
+             generator from random if None.
  
          Returns
          -------
          None
          """
-        random.shuffle(self.__theDeck)
+        (rng or random).shuffle(self.__theDeck)
         
     def __len__(self):
         """
@@ -74,6 +90,17 @@ class Deck():
         self.__theDeck = self.__theDeck[numToDeal:]
         return toRet
     
+    def peek(self):
+        """
+         Returns the cards left in the deck without removing them
+
+         Returns
+         -------
+         : list(Card)
+             A copy of the cards in the deck, top first
+         """
+        return self.__theDeck.copy()
+
     def is_empty(self):
         """
         Returns
@@ -8,18 +8,26 @@ Purpose
     Drives the display and associated logic for said display and client
     interaction with that display
 """
+import time
 import pygame 
 from SharedState import ClientState, PlayCardAction
-import math
 from queue import Queue
 from JobManager import *
 import Animations
-import os
+import TextCache
+from Assets import AssetManager
 from enum import Enum
 from threading import Lock
 
 FPS = 60
-CARD_DIR = './images/card_pngs/'
+# Longest a loop with nothing to animate sleeps before checking in anyway
+IDLE_WAIT_MS = 250
+# Posted to wake the display loop when something changes off the main thread
+WAKE_EVENT = pygame.event.custom_type()
+# Splash images shown mid game as (name, size, scale), prefetched so showing
+# one never stalls a frame
+SPLASHES = [("flip", None, 2), ("not_allowed", (50, 50), None), 
+            ("go", (600, 450), None)]
 HIGHLIGHT_COLOR = (180, 0, 180)
 FONT_SIZE = 30
 VERT_DIVS = 6
@@ -27,6 +35,47 @@ OPP_VERT_POS = 5
 MID_VERT_POS = 3
 MY_VERT_POS = 1
 
+class TrackedSurface():
+    """
+    Stands in for the screen when handed to animation jobs. Draws straight
+    through to the screen and remembers every area that was drawn on so only
+    those areas need to be presented and later restored.
+    """
+    def __init__(self, surface):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        surface: pygame.Surface
+            The surface to draw on
+        """
+        self.__surface = surface
+        self.__rects = []
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        rect = self.__surface.blit(source, dest, area, special_flags)
+        self.__rects.append(rect)
+        return rect
+
+    def blits(self, blit_sequence, doreturn=True):
+        rects = self.__surface.blits(blit_sequence)
+        self.__rects.extend(rects)
+        return rects if doreturn else None
+
+    def take_rects(self):
+        """
+        Returns
+        -------
+        : list(pygame.Rect)
+            The areas drawn on since the last call
+        """
+        rects, self.__rects = self.__rects, []
+        return rects
+
+    def __getattr__(self, name):
+        return getattr(self.__surface, name)
+
 class Display():
 
     class DisplayStatusValue(Enum):
@@ -80,7 +129,8 @@ class Display():
 
     def __init__(self, clientGame: ClientState, 
                  msgQueue: Queue, screenWidth = 1000, 
-                 screenHeight = 800, backgroundColor=(30, 92, 58)):
+                 screenHeight = 800, backgroundColor=(30, 92, 58),
+                 dirtyRects=True, sendPlay=None):
         """
         A constructor for the display object
 
@@ -97,6 +147,14 @@ class Display():
             The height in pixels of the pygame screen the game will apear on
         backgroundColor: tuple(int, int, int)
             The RGB tuple for the color of the game's background
+        dirtyRects: bool
+            If True, the play loop keeps the background and the cards at rest
+            on a cached layer and only redraws and presents the areas that
+            changed. If False, every frame is drawn from scratch and flipped.
+        sendPlay: func(PlayCardAction, float) | None
+            If given, plays are handed to this straight from the display loop
+            along with the time.perf_counter() time the click was taken off
+            the event queue, instead of going through msgQueue
         """
  
          # Initialize pygame if it wasn't already
@@ -106,6 +164,7 @@ class Display():
         # Inialize internal variables from parameters
         self.__gameState = clientGame
         self.__msgQueue = msgQueue
+        self.__sendPlay = sendPlay
         self.__width = screenWidth
         self.__height = screenHeight
         self.__backgroundColor = backgroundColor
@@ -121,9 +180,17 @@ class Display():
         self.__animationManager.create_topic("dynamic", 1)
         self.__animationManager.create_topic("splashes", 2)
 
-        # Create the dict for looking up the images of the cards
-        self.__cardLookup = self.__create_card_img_dict()
+        # The display mode has to be set before images can be converted to
+        # its pixel format
+        self.__screen = pygame.display.set_mode((self.__width, self.__height))
+        pygame.display.set_caption(f"Spit!") # Default caption
+        self.__clock = pygame.time.Clock()
 
+        # Every image is loaded, scaled and converted once by the assets.
+        # Loading runs in the background while we connect and wait for the
+        # opponent, whatever is needed first is waited for then.
+        self.__assets = AssetManager(self.__targetCardWidth)
+        self.__assets.prefetch(SPLASHES)
 
         self.__vpos = {
                       "them" : self.__height - (OPP_VERT_POS * (self.__height)) 
@@ -136,10 +203,12 @@ class Display():
         
         # Get the initial state of the game to display card x positions 
         # correctly
-        self.__nMidPiles, self.__nTheirPiles, self.__nMyPiles \
-            = self.__gameState.shape()
+        self.__shape = None
         self.__xpos = None
-        self.__pile_xpos()
+        self.__pile_xpos(self.__gameState.shape())
+
+        # Highlight border and where it goes by card size and position
+        self.__highlights = {}
 
         # Gets populated by card objects each pass of the run loop
         self.__cardObjs = {
@@ -148,10 +217,26 @@ class Display():
                           "mid"  : [],
                         }
 
-        # Finalize pygame initialization
-        self.__screen = pygame.display.set_mode((self.__width, self.__height))
-        pygame.display.set_caption(f"Spit!") # Default caption
-        self.__clock = pygame.time.Clock()
+        # Animations draw on the canvas. In dirty rect mode it records where
+        # they drew so only those areas are presented and then restored from
+        # the layer holding the background and cards at rest.
+        self.__dirtyRects = dirtyRects
+        self.__canvas = self.__screen
+        if dirtyRects:
+            self.__canvas = TrackedSurface(self.__screen)
+            self.__layer = pygame.Surface((self.__width, self.__height))
+            self.__layer = self.__layer.convert()
+        self.__drawnVersion = None  # State version the cards were placed for
+        self.__layerVersion = None  # State version the layer was drawn for
+        self.__drawList = []        # Cards and counters with where they go
+        self.__selectable = []      # Which of our piles hold a card
+        self.__lastRects = []     # Areas animations drew on last frame
+
+        # When the next frame is due and when the last input was taken off
+        # the event queue, both time.perf_counter()
+        self.__nextFrame = 0
+        self.__inputTime = 0
+        self.__fullRedraw = True
 
     def __del__(self):
         """
@@ -159,50 +244,6 @@ class Display():
         """
         pygame.quit()
 
-    #*********************************************************************#
-    #         Internal initializers of the cards that can be drawn        #
-    #*********************************************************************#
-
-    def __create_card_img_dict(self):
-        """
-        Create the initial lookup dictionary for cards
-
-        Returns
-        -------
-        cardDict: dict{str -> pygame.Surface}
-        """
-        fileList = os.listdir(CARD_DIR)
-        fileList = [f.strip(".png") for f in fileList]
-        cardDict = {}
-        for cardStr in fileList:
-            cardDict[cardStr] = self.__card_to_pygame_img(cardStr)
-        return cardDict
-
-    def __card_to_pygame_img(self, card):
-        """
-        Converts a card into a pygame image of the card
-
-        Parameters
-        ----------
-        card: str | Card
-            The card to load as an image
-
-        Returns
-        -------
-        img: pygame.Surface
-            the pygame image of the card scaled so the width is as close to the 
-            target width as possible
-        """
-        img = pygame.image.load(CARD_DIR + str(card) + '.png')
-        img = pygame.transform.scale(img, 
-                            (img.get_width() //
-                             math.ceil(img.get_width() /
-                                    self.__targetCardWidth), 
-                             img.get_height() //
-                             math.ceil(img.get_width() / 
-                                    self.__targetCardWidth)))
-        return img
-
     #*********************************************************************#
     #               Functions which display specific states               #
     #*********************************************************************#
@@ -244,13 +285,14 @@ class Display():
     
         # Run a loop that displays the screen and lets the user quit
         while self.__status.get_status() == Display.DisplayStatusValue.SETUP:
-            self.__clock.tick(FPS)
+            # Nothing moves on this screen, sleep until something happens
+            events = self.__next_events(busy=False)
             self.__screen.fill(self.__backgroundColor)
 
             waitingManager.step_jobs()
 
             # Allow player to quit but no other interaction
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     self.__status.update_status(
@@ -276,8 +318,7 @@ class Display():
         countDownManager.create_topic("splashes")
 
         # Image to show when countdown is over
-        goImg = pygame.image.load("./images/go.png")
-        goImg = pygame.transform.scale(goImg, (600,450))
+        goImg = self.__assets.image("go", (600, 450))
 
         # Each "showX" job displays a digit and queues the next digit to 
         # display after a third of the countdown has passed
@@ -301,7 +342,8 @@ class Display():
                                                  self.__height // 2), 
                                                  goImg, 
                                                  1, 
-                                                 startImmediately=False)
+                                                 startImmediately=False,
+                                                 keepFrames=False)
 
         # Link all jobs so that we count 3 -> 2 -> 1 -> GO! then remove them 
         # all when we are done
@@ -325,6 +367,7 @@ class Display():
         countDownManager.register_job(showGo, "splashes")
 
         # Loop that shows initial state and a countdown
+        warmed = False
         while not countDownManager.all_animations_stopped() and \
               self.__status.get_status() != Display.DisplayStatusValue.STOPPING:
             
@@ -346,59 +389,206 @@ class Display():
                     return
             pygame.display.flip()
 
+            # Precompute the flip splash's frames once "3" is on screen 
+            # rather than on the first flip. The digits change on a timer, 
+            # so this only holds the first one a little longer.
+            if not warmed:
+                Animations.GrowAndFadeAnimation.frames_for(
+                    self.__assets.image("flip", scale=2))
+                warmed = True
+
     def __run(self):
         """
-        Runs the display loop that accepts player interaction
+        Runs the display loop that accepts player interaction. Input is 
+        handled the moment it is taken off the event queue, so a play is on 
+        the wire without waiting for the frame, while frames are still only 
+        drawn at FPS (or when something changed while idle).
         """
         # Tells us which cards are selected
-        selected = False
-        selectedIdx = None
+        self.__selected = False
+        self.__selectedIdx = None
+
+        # Whether to run at the full frame rate or sleep until woken
+        busy = True
 
         while self.__status.get_status() != Display.DisplayStatusValue.STOPPING:
-            # Handle intializing the frame
-            self.__clock.tick(FPS)
-            self.__screen.fill(self.__backgroundColor) # Draw background
+            # Handle input until the frame is due
+            self.__next_events(busy, self.__handle_input)
 
-            # Handle visualization of player selecting a card
-            selectable = self.__update_layouts()
-            self.__do_highlight(selected, selectedIdx)
+            if self.__dirtyRects:
+                self.__draw_dirty_frame(self.__selected, self.__selectedIdx)
+            else:
+                self.__screen.fill(self.__backgroundColor) # Draw background
 
-            self.__animationManager.step_jobs()
+                # Handle visualization of player selecting a card
+                self.__update_layouts()
+                self.__do_highlight(self.__selected, self.__selectedIdx)
+
+                self.__animationManager.step_jobs()
             if self.__animationManager.all_animations_stopped():
                 self.__msgQueue.put(("done-moving",))
 
-            # Event Loop
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    # Stops sender and sends out quitting msg to server
-                    self.__msgQueue.put(("quitting",))
-                    self.stop_display()
-
-                # Select card when mouse button is pressed
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    # Check if selecting one of our cards
-                    for i, (_, card_rect) in enumerate(self.__cardObjs["me"]):
-                        # Check if mouse is on one of our cards
-                        if card_rect.collidepoint(event.pos) and \
-                            selectable[i]:  
-                            selected = True
-                            selectedIdx = i
-                            break
-
-                    if selected:
-                        # Check if we are trying to place a card
-                        for i, (card, card_rect) in \
-                            enumerate(self.__cardObjs["mid"]):
-                            # Check if mouse is on one of our cards
-                            if card_rect.collidepoint(event.pos): 
-                                selected = False
-                                self.__msgQueue.put(('play', 
-                                                     PlayCardAction(
-                                                         selectedIdx, i)))
-
-                                break
+            # Stay at full rate while animating
+            busy = self.__animationManager.is_busy()
                             
+            if not self.__dirtyRects:
+                pygame.display.flip()
+
+    def __handle_input(self, event):
+        """
+        Acts on one event of the play loop as soon as it is taken off the 
+        queue. What can be selected is what was last drawn.
+
+        Parameters
+        ----------
+        event: pygame.event.Event
+            The event
+
+        Returns
+        -------
+        : bool
+            Whether the event changes what should be on screen
+        """
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.__fullRedraw = True
+            return True
+
+        if event.type == pygame.QUIT:
+            # Stops sender and sends out quitting msg to server
+            self.__msgQueue.put(("quitting",))
+            self.stop_display()
+            return True
+
+        # Select card when mouse button is pressed
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            # Check if selecting one of our cards
+            for i, (_, card_rect) in enumerate(self.__cardObjs["me"]):
+                # Check if mouse is on one of our cards
+                if card_rect.collidepoint(event.pos) and self.__selectable[i]:
+                    self.__selected = True
+                    self.__selectedIdx = i
+                    break
+
+            if self.__selected:
+                # Check if we are trying to place a card
+                for i, (card, card_rect) in enumerate(self.__cardObjs["mid"]):
+                    # Check if mouse is on one of our cards
+                    if card_rect.collidepoint(event.pos): 
+                        self.__selected = False
+                        self.__send_play(PlayCardAction(self.__selectedIdx, i))
+                        break
+            return True
+
+        return event.type == WAKE_EVENT
+
+    def __send_play(self, action):
+        """
+        Sends a play to the server, straight to the socket if the owner gave
+        us a way to, otherwise through the message queue
+
+        Parameters
+        ----------
+        action: PlayCardAction
+            The play
+        """
+        if self.__sendPlay is not None:
+            self.__sendPlay(action, self.__inputTime)
+        else:
+            self.__msgQueue.put(('play', action))
+
+    def __next_events(self, busy, handle=None):
+        """
+        Paces a display loop. While busy, frames come at FPS. Otherwise we
+        sleep until an event changes the screen (input, or a wake() from 
+        another thread) or IDLE_WAIT_MS passes, so an idle display uses next 
+        to no CPU. Events are waited for rather than slept through, so each
+        one is handed to handle the moment it is taken off the queue, with 
+        that time recorded, but events that change nothing (mouse motion)
+        never bring a frame forward.
+
+        Parameters
+        ----------
+        busy: bool
+            Whether there is something on screen that needs every frame
+        handle: func(pygame.event.Event) -> bool | None
+            Called on each event as it arrives, returns whether the event
+            changes the screen. If None, only quitting, wake() and the window
+            being exposed change it.
+
+        Returns
+        -------
+        : list(pygame.event.Event)
+            The events that arrived since the last frame
+        """
+        if handle is None:
+            handle = lambda event: event.type in (pygame.QUIT, WAKE_EVENT,
+                                                  pygame.VIDEOEXPOSE,
+                                                  pygame.WINDOWEXPOSED)
+        deadline = self.__nextFrame if busy else \
+                   time.perf_counter() + IDLE_WAIT_MS / 1000
+        events = []
+        while True:
+            timeout = round((deadline - time.perf_counter()) * 1000)
+            if timeout > 0:
+                event = pygame.event.wait(timeout)
+                arrived = [] if event.type == pygame.NOEVENT else \
+                          [event] + pygame.event.get()
+            else:
+                arrived = pygame.event.get()
+            self.__inputTime = time.perf_counter()
+
+            changed = False
+            for event in arrived:
+                changed = handle(event) or changed
+            events += arrived
+
+            if timeout <= 0 or (changed and not busy):
+                break
+        self.__nextFrame = time.perf_counter() + 1 / FPS
+        return events
+
+    def __draw_dirty_frame(self, selected, selectedIdx):
+        """
+        Draws and presents one frame of the play loop touching only the areas
+        that changed since the last frame
+
+        Parameters
+        ----------
+        selected: bool
+            Whether a card should be selected or not
+        selectedIdx: int
+            The index of the selected card in out layout
+
+        Returns
+        -------
+        : list(bool)
+            Which of our layout piles can be selected
+        """
+        # Cards at rest only change with the state, redraw the layer then
+        if self.__gameState.version() != self.__layerVersion:
+            self.__layer.fill(self.__backgroundColor)
+            self.__update_layouts(self.__layer)
+            self.__layerVersion = self.__drawnVersion
+            self.__fullRedraw = True
+
+        # Wipe what animations drew last frame
+        if self.__fullRedraw:
+            self.__screen.blit(self.__layer, (0, 0))
+        else:
+            for rect in self.__lastRects:
+                self.__screen.blit(self.__layer, rect, rect)
+
+        self.__do_highlight(selected, selectedIdx, self.__canvas)
+        self.__animationManager.step_jobs()
+        rects = self.__canvas.take_rects()
+
+        if self.__fullRedraw:
             pygame.display.flip()
+        elif self.__lastRects or rects:
+            pygame.display.update(self.__lastRects + rects)
+        self.__lastRects = rects
+        self.__fullRedraw = False
+        return self.__selectable
 
     def final_state(self, result):
         """
@@ -413,14 +603,11 @@ class Display():
         -------
         None
         """
-        image = pygame.image.load(f"./images/{result}.png").convert_alpha()
-
-        # Make the image half translucent
-        image.set_alpha(128)
-
-        # Scale and center the image
-        image = pygame.transform.scale(image, 
-                                       (self.__width // 2, self.__height // 2))
+        # Half translucent, scaled to half the screen
+        image = self.__assets.image(result, 
+                                    (self.__width // 2, self.__height // 2), 
+                                    alpha=128)
+        # Center the image
         rect  = image.get_rect(center = (self.__width // 2, self.__height // 2))
 
         # Put the image on the screen
@@ -428,11 +615,8 @@ class Display():
         pygame.display.flip()
 
         # Wait for the user to quit
-        quit=False
-        while not quit:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    quit = True
+        while pygame.event.wait().type != pygame.QUIT:
+            pass
         pygame.quit()
 
     #*********************************************************************#
@@ -445,6 +629,16 @@ class Display():
         """
         self.__update_layouts()
 
+    def wake(self):
+        """
+        Wakes the display loop if it is idle, so whatever changed (e.g. the 
+        ClientState) is drawn now. Safe to call from any thread.
+        """
+        try:
+            pygame.event.post(pygame.event.Event(WAKE_EVENT))
+        except pygame.error:
+            pass # pygame has already shut down
+
     def set_names(self, names):
         """
         Updates the names of who is playing
@@ -468,41 +662,68 @@ class Display():
 
         Return
         ------
-        None
-        
+        : list(tuple(pygame.Surface, pygame.Rect))
+            The layout's cards and where they go
+        """
+        xpos = self.__xpos[who]
+        ypos = self.__vpos[who]
+        imgs = [self.__assets.card(str(c)) for c in layout]
+        self.__cardObjs[who] = [(card, card.get_rect(center=(xpos[i], ypos)))
+                                for i, card in enumerate(imgs)]
+        return self.__cardObjs[who]
+    
+    def __update_layouts(self, surface=None):
         """
-        imgs = [self.__cardLookup[str(c)] for c in layout]
-        self.__cardObjs[who] = [(card, card.get_rect()) for card in imgs]
+        Lays out and draws every card and the cards left counters
 
-        for i in range(len(self.__cardObjs[who])):
-            (card, cardRect) = self.__cardObjs[who][i]
-            cardRect.center = (self.__xpos[who][i], self.__vpos[who])
-            self.__screen.blit(card, cardRect)
-    
-    def __update_layouts(self):
-        # Make and place the cards on the screen
-        myLayout, theirLayout, midPiles, selectable, myCardsLeft, \
-            theirCardsLeft = self.__gameState.get_state()
+        Parameters
+        ----------
+        surface: pygame.Surface | None
+            Where to draw, the screen if None
 
-        self.__pile_xpos() # update sizes of each set of piles
+        Returns
+        -------
+        : list(bool)
+            Which of our layout piles can be selected
+        """
+        surface = self.__screen if surface is None else surface
+
+        # Only place the cards again when the state has changed
+        version, state = self.__gameState.snapshot()
+        if version != self.__drawnVersion:
+            myLayout, theirLayout, midPiles, selectable, myCardsLeft, \
+                theirCardsLeft = state
 
-        self.__update_layout(myLayout, "me")
-        self.__update_layout(theirLayout, "them")
-        self.__update_layout(midPiles, "mid")
+            # update sizes of each set of piles
+            self.__pile_xpos((len(myLayout), len(theirLayout), len(midPiles)))
 
-        # Show cards left
-        self.__show_cards(myCardsLeft, self.__height - FONT_SIZE)
-        self.__show_cards(theirCardsLeft, FONT_SIZE)
+            self.__drawList = self.__update_layout(myLayout, "me") + \
+                              self.__update_layout(theirLayout, "them") + \
+                              self.__update_layout(midPiles, "mid") + \
+                              [self.__show_cards(myCardsLeft, 
+                                                 self.__height - FONT_SIZE),
+                               self.__show_cards(theirCardsLeft, FONT_SIZE)]
+            self.__selectable = selectable
+            self.__drawnVersion = version
 
-        return selectable
+        # Every card and the cards left go on in one batched blit
+        surface.blits(self.__drawList, doreturn=False)
+        return self.__selectable
 
-    def __pile_xpos(self):
+    def __pile_xpos(self, shape):
         """
-        Updates the horizontal positions of the cards based on the current
-        shape of the game
+        Updates the horizontal positions of the cards if the shape of the 
+        game has changed
+
+        Parameters
+        ----------
+        shape: tuple(int, int, int)
+            The number of our piles, their piles and middle piles
         """
-        self.__nMyPiles, self.__nTheirPiles, self.__nMidPiles = \
-            self.__gameState.shape()
+        if shape == self.__shape:
+            return
+        self.__shape = shape
+        self.__nMyPiles, self.__nTheirPiles, self.__nMidPiles = shape
         self.__xpos = {
                    "them" : [i * (self.__width // (self.__nTheirPiles + 1)) 
                              for i in range(1, self.__nTheirPiles + 1)],
@@ -514,7 +735,7 @@ class Display():
 
     def __show_cards(self, num, height):
         """
-        Displays the count of cards left in a deck
+        Gets the count of cards left in a deck ready to display
 
         Parameters
         ----------
@@ -523,19 +744,20 @@ class Display():
         height: int
             The distance in pixels the center of the text will appear from the 
             top of the screen
-        """
-        # Set up font
-
-        font = pygame.font.SysFont(None, FONT_SIZE)  
-        # None = default font, 72 = size
 
+        Returns
+        -------
+        : tuple(pygame.Surface, pygame.Rect)
+            The text and where it goes
+        """
+        # Rendered once per count, then served from the cache
+        text_surface = TextCache.render_text(f"Cards Remaining: {num}", 
+                                             FONT_SIZE, (0, 0, 0))
         # Get rect to center it
-        # True = anti-aliasing
-        text_surface = font.render(f"Cards Remaining: {num}", True, (0, 0, 0))  
         text_rect = text_surface.get_rect(center=(self.__width // 2, height))
-        self.__screen.blit(text_surface, text_rect)
+        return text_surface, text_rect
 
-    def __do_highlight(self, selected, selectedIdx):
+    def __do_highlight(self, selected, selectedIdx, surface=None):
         """
         Show the highlighting of the selected card
 
@@ -545,13 +767,22 @@ class Display():
             Whether a card should be selected or not
         selectedIdx: int
             The index of the selected card in out layout
-        """
-        highlights = []
-        for (_, rect) in self.__cardObjs["me"]:
-            highlights.append(self.__make_border(10, .5, rect, HIGHLIGHT_COLOR))
-        if selected:
-            (surf, rect) = highlights[selectedIdx]
-            self.__screen.blit(surf, rect)
+        surface: pygame.Surface | None
+            Where to draw the highlight, the screen if None
+        """
+        if not selected:
+            return
+        surface = self.__screen if surface is None else surface
+        (_, cardRect) = self.__cardObjs["me"][selectedIdx]
+
+        # Borders only depend on where the card is and how big it is
+        key = (cardRect.size, cardRect.center)
+        highlight = self.__highlights.get(key)
+        if highlight is None:
+            highlight = self.__make_border(10, .5, cardRect, HIGHLIGHT_COLOR)
+            self.__highlights[key] = highlight
+        (surf, rect) = highlight
+        surface.blit(surf, rect)
 
     def __make_border(self, rect_add, cntr_offset, rect, color, width = 5):
         """
@@ -606,12 +837,10 @@ class Display():
         """
         # Get the flip image, scale it to the max size we want it to show as
         middle = (self.__width // 2, self.__height // 2)
-        img = pygame.image.load("./images/flip.png")
-        szW, szH = img.get_size()
-        img = pygame.transform.scale(img, (szW * 2, szH * 2))
+        img = self.__assets.image("flip", scale=2)
 
         # Create the flip animation and register it
-        flipAnimation = Animations.GrowAndFadeAnimation(self.__screen, middle, 
+        flipAnimation = Animations.GrowAndFadeAnimation(self.__canvas, middle, 
                                                         img, 1)
         self.__animationManager.register_job(flipAnimation, "splashes")
 
@@ -624,7 +853,7 @@ class Display():
             # This lets us see the card that was in the middle pile get covered
             # correctly.
             oldImg, _ = self.__cardObjs["mid"][pileIdx]
-            newImg = self.__cardLookup[str(card)]
+            newImg = self.__assets.card(str(card))
         
             destYpos = self.__vpos["mid"]
             destXpos = self.__xpos["mid"][pileIdx]
@@ -642,14 +871,15 @@ class Display():
             job = Animations.LinearMove((srcXpos, srcYpos), 
                                         (destXpos, destYpos), 
                                         duration, 
-                                        self.__screen, 
+                                        self.__canvas, 
                                         newImg)
-            holdJob = Animations.ShowImage(self.__screen, 
+            holdJob = Animations.ShowImage(self.__canvas, 
                                            oldImg, 
                                            (destXpos, destYpos))
             job.add_dependent(holdJob)
             self.__animationManager.register_job(job, "dynamic")
             self.__animationManager.register_job(holdJob, "static")
+        self.wake()
 
     def move_card(self, src, srcPile, dest, destPile, duration):
         """
@@ -682,15 +912,16 @@ class Display():
 
         cardToMove, _ = self.__cardObjs[src][srcPile]
         cardToCover, _ = self.__cardObjs[dest][destPile]
-        holdJob = Animations.ShowImage(self.__screen, cardToCover, (destXpos, 
+        holdJob = Animations.ShowImage(self.__canvas, cardToCover, (destXpos, 
                                                                     destYpos))
         moveJob = Animations.LinearMove((srcXpos, srcYpos), 
                                         (destXpos, destYpos), duration, 
-                                        self.__screen, cardToMove)
+                                        self.__canvas, cardToMove)
         moveJob.add_dependent(holdJob)
         self.__animationManager.register_job(moveJob, "dynamic")
         self.__animationManager.register_job(holdJob, "static", 
                                              TopicOrder.BEFORE)
+        self.wake()
 
     def bad_move(self, pileIdx):
         """
@@ -702,15 +933,15 @@ class Display():
             The index of the midPile below which the not_allowed image will be
             drawn
         """
-        img = pygame.image.load("./images/not_allowed.png")
-        img = pygame.transform.scale(img, (50,50))
+        img = self.__assets.image("not_allowed", (50, 50))
 
         # Show image below the mid-pile we tried to play on
         xpos = self.__xpos["mid"][pileIdx]
         ypos = self.__vpos["mid"] + 100
-        showX = Animations.ShowImage(self.__screen, img, (xpos,ypos), 
+        showX = Animations.ShowImage(self.__canvas, img, (xpos,ypos), 
                                      duration=0.5)
         self.__animationManager.register_job(showX, "static")
+        self.wake()
     
     #*********************************************************************#
     #              Functions to transition the Display status             #
@@ -721,6 +952,7 @@ class Display():
         """
         self.__status.update_status(Display.DisplayStatusValue.RUNNING)
         self.__msgQueue.put(('done-moving',))
+        self.wake()
     
     def stop_display(self):
         """
@@ -728,4 +960,5 @@ class Display():
         shutdown process for the running display
         """
         self.__status.update_status(Display.DisplayStatusValue.STOPPING)
+        self.wake()
     
\ No newline at end of file
@@ -0,0 +1,440 @@
+"""
+File: EventLog.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    An append-only binary log of everything that happens in a room: the
+    deal, who joined, every accepted play and flip with the server's
+    timestamp, and the result. The server only packs events into a memory
+    buffer; a background thread writes the buffer to disk.
+
+    EventLogReader memory-maps a log and walks it one record at a time, so
+    logs with millions of events are never loaded whole. The replay
+    functions turn a log back into a live ServerGameState, into the messages
+    a seat received from the server, or into a Display showing the game.
+
+    File layout (little endian):
+        header:  magic (8s) version (H) numPlayers (B) numGamePiles (B)
+                 layoutSize (B) padding (x) start wall time (d)
+        records: kind (B) player (B) payload length (H) seconds since the
+                 log started (d) payload
+
+    Payloads:
+        DEAL    seed (q, -1 if none) then numPlayers * 52 card codes
+        JOIN    player name (utf-8)
+        START   empty
+        PLAY    layoutIdx (B) midPileIdx (B)
+        FLIP    index of each player that flipped (B each)
+        RESULT  winner (b, -1 for none) then the reason (utf-8)
+"""
+import mmap
+import time
+import struct
+import argparse
+import threading
+import CompactState
+from CompactState import DECK_SIZE
+from ServerGameState import ServerGameState
+
+MAGIC = b"SPITEVNT"
+VERSION = 1
+
+HEADER = struct.Struct("<8sHBBBxd")
+RECORD = struct.Struct("<BBHd")
+SEED = struct.Struct("<q")
+
+DEAL   = 1
+JOIN   = 2
+START  = 3
+PLAY   = 4
+FLIP   = 5
+RESULT = 6
+
+KIND_NAMES = {DEAL: "deal", JOIN: "join", START: "start", PLAY: "play",
+              FLIP: "flip", RESULT: "result"}
+
+class EventLogWriter():
+    """
+    Buffered writer for one room's log
+    """
+    def __init__(self, path, numPlayers, numGamePiles, layoutSize,
+                 flushInterval=0.2, flushBytes=64 * 1024):
+        """
+        Constructor. Creates or overwrites the log.
+
+        Parameters
+        ----------
+        path: str
+            The log file
+        numPlayers: int
+        numGamePiles: int
+        layoutSize: int
+            Shape of the game
+        flushInterval: float
+            Longest time in seconds an event waits in memory
+        flushBytes: int
+            Buffered bytes that trigger an early flush
+        """
+        self.__file = open(path, "wb")
+        self.__file.write(HEADER.pack(MAGIC, VERSION, numPlayers, numGamePiles,
+                                      layoutSize, time.time()))
+        self.__start = time.monotonic()
+        self.__flushInterval = flushInterval
+        self.__flushBytes = flushBytes
+
+        self.__lock = threading.Lock()
+        self.__buffer = bytearray()
+        self.__wake = threading.Event()
+        self.__closed = False
+        self.__thread = threading.Thread(target=self.__flush_worker,
+                                         daemon=True)
+        self.__thread.start()
+
+    def close(self):
+        """
+        Writes whatever is buffered and closes the file
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__wake.set()
+        self.__thread.join()
+        self.__flush()
+        self.__file.close()
+
+    def append(self, kind, player=0, payload=b""):
+        """
+        Adds one event to the buffer. Never touches the disk.
+
+        Parameters
+        ----------
+        kind: int
+            One of DEAL, JOIN, START, PLAY, FLIP or RESULT
+        player: int
+            The player the event is about, 0 if it is about no one
+        payload: bytes
+            See the module docstring
+        """
+        record = RECORD.pack(kind, player, len(payload),
+                             time.monotonic() - self.__start) + payload
+        with self.__lock:
+            self.__buffer += record
+            full = len(self.__buffer) >= self.__flushBytes
+        if full:
+            self.__wake.set()
+
+    def log_deal(self, decks, seed=None):
+        codes = bytes(CompactState.encode_card(c) for d in decks for c in d)
+        self.append(DEAL, 0, SEED.pack(-1 if seed is None else seed) + codes)
+
+    def log_join(self, playerIdx, name):
+        self.append(JOIN, playerIdx, str(name).encode("utf-8"))
+
+    def log_start(self):
+        self.append(START)
+
+    def log_play(self, playerIdx, layoutIdx, midPileIdx):
+        self.append(PLAY, playerIdx, bytes((layoutIdx, midPileIdx)))
+
+    def log_flip(self, playersFlipped):
+        self.append(FLIP, 0, bytes(playersFlipped))
+
+    def log_result(self, winner, reason):
+        self.append(RESULT, 0, struct.pack("<b", -1 if winner is None
+                                                    else winner) +
+                               str(reason).encode("utf-8"))
+
+    def __flush_worker(self):
+        while not self.__closed:
+            self.__wake.wait(self.__flushInterval)
+            self.__wake.clear()
+            self.__flush()
+
+    def __flush(self):
+        with self.__lock:
+            data, self.__buffer = self.__buffer, bytearray()
+        if data:
+            self.__file.write(data)
+            self.__file.flush()
+
+class EventLogReader():
+    """
+    Memory-mapped, read only view of a log. A log that is still being
+    written can be read up to its last complete record.
+    """
+    def __init__(self, path):
+        """
+        Constructor
+
+        Raises
+        ------
+        ValueError
+            If the file is not an event log
+        """
+        self.__file = open(path, "rb")
+        self.__map = mmap.mmap(self.__file.fileno(), 0,
+                               access=mmap.ACCESS_READ)
+        magic, version, *shape, self.__startTime = \
+            HEADER.unpack_from(self.__map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} event log")
+        self.__shape = tuple(shape)
+
+    def close(self):
+        self.__map.close()
+        self.__file.close()
+
+    def shape(self):
+        """
+        Returns
+        -------
+        : tuple(int, int, int)
+            numPlayers, numGamePiles and layoutSize
+        """
+        return self.__shape
+
+    def start_time(self):
+        """
+        Returns
+        -------
+        : float
+            Wall clock time (time.time()) the log was started
+        """
+        return self.__startTime
+
+    def raw_events(self):
+        """
+        Iterates over the records without decoding their payloads
+
+        Yields
+        ------
+        : tuple(int, int, float, bytes)
+            kind, player, time and payload. Payloads are copies, so they can
+            be kept after the reader is closed.
+        """
+        offset = HEADER.size
+        end = len(self.__map)
+        while offset + RECORD.size <= end:
+            kind, player, size, stamp = RECORD.unpack_from(self.__map, offset)
+            offset += RECORD.size
+            if offset + size > end:
+                break # The last record is still being written
+            yield kind, player, stamp, self.__map[offset:offset + size]
+            offset += size
+
+    def events(self, kinds=None):
+        """
+        Iterates over the decoded events
+
+        Parameters
+        ----------
+        kinds: set(int) | None
+            Only yield these kinds of event, every kind if None
+
+        Yields
+        ------
+        : tuple(int, int, float, any)
+            kind, player, time and data, where data is
+            DEAL:   (seed | None, list of decks of Cards)
+            JOIN:   player name
+            START:  None
+            PLAY:   (layoutIdx, midPileIdx)
+            FLIP:   list of the players that flipped
+            RESULT: (winner | None, reason)
+        """
+        numPlayers = self.__shape[0]
+        for kind, player, stamp, payload in self.raw_events():
+            if kinds is not None and kind not in kinds:
+                continue
+            if kind == DEAL:
+                seed = SEED.unpack_from(payload, 0)[0]
+                codes = payload[SEED.size:]
+                decks = [[CompactState.decode_card(c) for c in
+                          codes[p * DECK_SIZE:(p + 1) * DECK_SIZE]]
+                         for p in range(numPlayers)]
+                data = (None if seed < 0 else seed, decks)
+            elif kind == JOIN:
+                data = payload.decode("utf-8")
+            elif kind == PLAY:
+                data = (payload[0], payload[1])
+            elif kind == FLIP:
+                data = list(payload)
+            elif kind == RESULT:
+                winner = struct.unpack_from("<b", payload, 0)[0]
+                data = (None if winner < 0 else winner,
+                        payload[1:].decode("utf-8"))
+            else:
+                data = None
+            yield kind, player, stamp, data
+
+#==============================================================================#
+#                                    Replay                                    #
+#==============================================================================#
+def replay_state(path):
+    """
+    Rebuilds the game in a log one event at a time
+
+    Parameters
+    ----------
+    path: str
+        The log
+
+    Yields
+    ------
+    : tuple(tuple, ServerGameState)
+        Each event (see EventLogReader.events) and the game just after it.
+        The same ServerGameState is updated in place, copy it to keep it.
+
+    Raises
+    ------
+    ValueError
+        If the log does not start with a deal or a logged play or flip is
+        not legal in the rebuilt game
+    """
+    reader = EventLogReader(path)
+    numPlayers, numGamePiles, layoutSize = reader.shape()
+    state = None
+    try:
+        for event in reader.events():
+            kind, player, stamp, data = event
+            if kind == DEAL:
+                state = ServerGameState(numPlayers, numGamePiles, layoutSize,
+                                        decks=data[1])
+            elif state is None:
+                raise ValueError(f"{path} does not start with a deal")
+            elif kind == PLAY:
+                if not state.play_card(player, *data):
+                    raise ValueError(f"Logged play {data} by player {player} "
+                                     f"at {stamp:.3f}s is not legal")
+            elif kind == FLIP:
+                if state.flip() != data:
+                    raise ValueError(f"Logged flip at {stamp:.3f}s differs")
+            yield event, state
+    finally:
+        reader.close()
+
+def replay_messages(path, seat):
+    """
+    Recreates the messages the server sent to one seat
+
+    Parameters
+    ----------
+    path: str
+        The log
+    seat: int
+        The player to replay the messages of
+
+    Yields
+    ------
+    : tuple(float, any)
+        Server time and message, in the order the server sent them
+    """
+    names = {}
+    for (kind, player, stamp, data), state in replay_state(path):
+        if kind == JOIN:
+            names[player] = data
+        elif kind == START:
+            yield stamp, ("all-names", [names.get(i) for i in
+                                        range(len(names))])
+            yield stamp, ("state", "initial", state.client_packages()[seat])
+        elif kind == PLAY:
+            if player == seat:
+                yield stamp, ("move", "me", data[0], "mid", data[1])
+            elif state.opponent_of(seat) == player:
+                yield stamp, ("move", "them", data[0], "mid", data[1])
+            yield stamp, ("state", "new", state.client_packages()[seat])
+        elif kind == FLIP:
+            piles = state.get_game_piles()
+            yield stamp, ("flip", [piles[i] for i in data], data)
+            yield stamp, ("state", "new", state.client_packages()[seat])
+        elif kind == RESULT:
+            winner, reason = data
+            if reason == "winner":
+                result = "won" if winner == seat else "lost"
+                yield stamp, ("game-stopped", result, names.get(winner))
+            else:
+                yield stamp, ("game-stopped", reason, None)
+
+def replay_display(path, seat=0, speed=1.0):
+    """
+    Plays a log back in a Display window from one seat's point of view,
+    feeding it the same way Client does when messages come off the network
+
+    Parameters
+    ----------
+    path: str
+        The log
+    seat: int
+        The player whose view to show
+    speed: float
+        Playback speed, 2 is twice as fast as the game was played
+    """
+    from queue import Queue
+    from Display import Display
+    from SharedState import ClientState
+
+    state = ClientState(None)
+    display = Display(state, Queue()) # What the display sends is ignored
+    result = [None]
+
+    def feed():
+        startWall = time.monotonic()
+        startLog = None
+        for stamp, msg in replay_messages(path, seat):
+            startLog = stamp if startLog is None else startLog
+            wait = (stamp - startLog) / speed - (time.monotonic() - startWall)
+            if wait > 0:
+                time.sleep(wait)
+            match msg:
+                case ("all-names", names):
+                    display.set_names(names)
+                case ("state", "initial", csp):
+                    state.update_state(csp)
+                    display.set_initial()
+                    display.done_setup()
+                case ("state", "new", csp):
+                    state.update_state(csp)
+                    display.wake()
+                case ("move", srcLayout, srcIdx, destLayout, destIdx):
+                    display.move_card(srcLayout, srcIdx, destLayout, destIdx,
+                                      0.5 / speed)
+                case ("flip", cards, pileIdxs):
+                    display.flip_cards(cards, pileIdxs, 1 / speed)
+                case ("game-stopped", gameResult, _):
+                    result[0] = gameResult
+                    display.stop_display()
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    display.run()
+    if result[0] is not None:
+        display.final_state(result[0])
+
+def main():
+    parser = argparse.ArgumentParser(description="Read a room's event log")
+    parser.add_argument("path")
+    parser.add_argument("--display", action="store_true",
+                        help="play the game back in a window")
+    parser.add_argument("--seat", type=int, default=0)
+    parser.add_argument("--speed", type=float, default=1.0)
+    args = parser.parse_args()
+
+    if args.display:
+        replay_display(args.path, args.seat, args.speed)
+        return
+
+    counts = {}
+    start = time.perf_counter()
+    for (kind, player, stamp, data), state in replay_state(args.path):
+        counts[KIND_NAMES.get(kind, kind)] = \
+            counts.get(KIND_NAMES.get(kind, kind), 0) + 1
+        if kind in (JOIN, RESULT):
+            print(f"{stamp:9.3f}s {KIND_NAMES[kind]:>6} {player} {data}")
+    print(f"{sum(counts.values())} events {counts} replayed in "
+          f"{time.perf_counter() - start:.3f}s")
+
+if __name__ == "__main__":
+    main()
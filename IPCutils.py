@@ -11,10 +11,12 @@ Purpose
 """
 
 
+import time
 import socket
 import select
 import MessageBrokers
 from abc import ABC, abstractmethod
+from collections import deque
 
 #=============== Any Exceptions related to socket comms go here ===============#
 class UnableToConnectError(Exception):
@@ -35,6 +37,95 @@ def get_ip():
     except Exception as e:
         return f"Error: {e}"
 
+# Purpose:
+#     An in-memory stand-in for a client socket. A BaseServer treats it like any
+#     other client, but no socket I/O happens: the server hands over the same
+#     bytes it would send a socket and they are unpickled here, so the owner
+#     never shares objects with the server. Used to seat players that live in
+#     the same process as the server (bots).
+class LocalConnection():
+    def __init__(self, onMessage=None, onTick=None, 
+                 msgBroker = MessageBrokers.LenAndPayload()):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        onMessage: func(any) -> any | None
+            Called with every message the server sends to this connection
+        onTick: func(float) -> float | None
+            Called by the server loop with the current time (time.monotonic).
+            Returns when it next needs to be called, or None.
+        msgBroker: LenAndPayload
+            Unpacks what the server delivers, should be the same as the
+            server's
+        """
+        self.__onMessage = onMessage
+        self.__onTick = onTick
+        self.__msgBroker = msgBroker
+        self.__outbox = deque()
+
+    def attach(self, onMessage, onTick=None):
+        """
+        Sets the callbacks after construction, for when the owner needs the
+        connection before it can be built
+        """
+        self.__onMessage = onMessage
+        self.__onTick = onTick
+
+    def deliver(self, data):
+        """
+        Server -> owner. Called by the server in place of a socket send.
+
+        Parameters
+        ----------
+        data: bytes
+            The message as the server's msgBroker packed it
+        """
+        if self.__onMessage is not None:
+            self.__onMessage(self.__msgBroker.unpack(data))
+
+    def send(self, msg):
+        """
+        Owner -> server. The server handles the message on its next pass.
+        """
+        self.__outbox.append(msg)
+
+    def pending(self):
+        """
+        Returns
+        -------
+        : bool
+            True if there are messages waiting for the server
+        """
+        return len(self.__outbox) > 0
+
+    def take(self):
+        """
+        Returns
+        -------
+        : any
+            The oldest message waiting for the server
+        """
+        return self.__outbox.popleft()
+
+    def tick(self, now):
+        """
+        Returns
+        -------
+        : float | None
+            When the owner next needs to be ticked, None if never
+        """
+        if self.__onTick is None:
+            return None
+        return self.__onTick(now)
+
+    def close(self):
+        """
+        Nothing to close, here so LocalConnection can be closed like a socket
+        """
+        pass
+
 # Purpose:
 #     Class that wraps socket functionality into a basic transmit and receive
 #     functions a client could use to connect to and communitcate with a server.
@@ -75,6 +166,13 @@ class BaseServer(ABC):
         # List of all open connections
         self._clients = []
 
+        # The subset of _clients that are LocalConnections
+        self._localClients = []
+
+        # Extra sockets watched by rx_message, mapped to what to call when
+        # they can be read
+        self._readers = {}
+
         self._keepGoing = True # Flag that stops server operations
 
         # Set up a server socket that we can use to accept connections
@@ -138,12 +236,42 @@ class BaseServer(ABC):
         msg: any
             The message to send to the client
         """
+        if isinstance(client, LocalConnection):
+            client.deliver(self._msgBroker.pack(msg))
+            return True
         try:
             self._msgBroker.tx(client, msg)
             return True
         except:
             return False
 
+    def add_local_client(self, conn):
+        """
+        Adds an in-process client. It receives broadcasts like any other
+        client and its messages are handled by handle_message.
+
+        Parameters
+        ----------
+        conn: LocalConnection
+            The connection to add
+        """
+        self._clients.append(conn)
+        self._localClients.append(conn)
+
+    def add_reader(self, sock, onReadable):
+        """
+        Watches another socket in rx_message, e.g. one that another thread 
+        writes to so the server loop wakes up
+
+        Parameters
+        ----------
+        sock: socket.socket
+            The socket to watch
+        onReadable: func()
+            Called from rx_message whenever sock can be read
+        """
+        self._readers[sock] = onReadable
+
     def broadcast_message(self, msg):
         """
         Send message msg to all clients
@@ -173,13 +301,27 @@ class BaseServer(ABC):
     
     def rx_message(self):
         """
-        Blocks until we get a message from any client. Then calls handle_message
-        on that client.
-        """
-        readable, _, _ = select.select([self._sock] + self._clients, 
+        Handles the messages waiting from local clients, then blocks until we
+        get a message from any socket client and calls handle_message on that
+        client. If a local client had messages the sockets are only polled,
+        so the caller gets a chance to look at what changed, but busy local
+        clients can not starve the sockets.
+        """
+        timeout = self.__timeout
+        handled, wake = self.__service_local_clients()
+        if handled:
+            timeout = 0
+        elif wake is not None:
+            untilWake = max(0.0, wake - time.monotonic())
+            timeout = untilWake if timeout is None else min(timeout, untilWake)
+
+        sockets = [c for c in self._clients 
+                   if not isinstance(c, LocalConnection)]
+        readable, _, _ = select.select([self._sock] + sockets + 
+                                       list(self._readers), 
                                        [], 
-                                       self._clients,
-                                       self.__timeout)
+                                       sockets,
+                                       timeout)
 
         for client in readable:
             if not self._keepGoing:
@@ -187,6 +329,8 @@ class BaseServer(ABC):
 
             if client is self._sock:
                 self.handle_connection()
+            elif client in self._readers:
+                self._readers[client]()
             else:
                 try:
                     msg = self._msgBroker.rx(client)
@@ -198,6 +342,36 @@ class BaseServer(ABC):
                     print(f"Got {err} from {client}. Removing connection...")
                     self.remove_client(client)
     
+    def __service_local_clients(self):
+        """
+        Ticks every local client and handles the messages they have sent
+        until none are waiting
+
+        Returns
+        -------
+        : tuple(bool, float | None)
+            Whether any message was handled and the earliest time a local
+            client asked to be ticked again
+        """
+        handled = False
+        while True:
+            wake = None
+            for conn in list(self._localClients):
+                nextTick = conn.tick(time.monotonic())
+                if nextTick is not None:
+                    wake = nextTick if wake is None else min(wake, nextTick)
+
+            # Handling a message can make local clients send more, or
+            # schedule more work, so go round until everything is quiet
+            busy = False
+            for conn in list(self._localClients):
+                while conn.pending() and conn in self._localClients and \
+                      self._keepGoing:
+                    busy = handled = True
+                    self.handle_message(conn, conn.take())
+            if not busy:
+                return handled, wake
+
     def handle_connection(self):
         """
         Called whenver theres a new client trying to connect. Default behavior 
@@ -241,6 +415,8 @@ class BaseServer(ABC):
             The socket of the client to remove
         """
         self._clients.remove(client)
+        if client in self._localClients:
+            self._localClients.remove(client)
         client.close()
 
 # BaseClient.py
@@ -250,6 +250,15 @@ class Topic():
                 jobsStepped += 1
         return jobsStepped
     
+    def has_jobs(self):
+        """
+        Returns
+        -------
+        : bool
+            True if this topic holds any unfinished jobs
+        """
+        return len(self.__jobs) > 0
+
     def remove_finished(self):
         """
         Clears out all finished jobs from this topic.
@@ -335,4 +344,14 @@ class JobManager():
         """
         Becomes true only on frame when all finish
         """
-        return self.__lastFrameJobCt > 0 and self.__thisFrameJobCt == 0
\ No newline at end of file
+        return self.__lastFrameJobCt > 0 and self.__thisFrameJobCt == 0
+
+    def is_busy(self):
+        """
+        Whether the next step has anything to do: there are jobs left to 
+        step, or jobs were stepped last time so the next step is the one 
+        where all_animations_stopped becomes true
+        """
+        with self.__jobLock:
+            return self.__thisFrameJobCt > 0 or \
+                   any(topic.has_jobs() for topic in self.__allTopics.values())
\ No newline at end of file
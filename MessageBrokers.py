@@ -46,7 +46,39 @@ class LenAndPayload():
         -------
         None
         """
-        sock.sendall(self.__serialize(msg))
+        sock.sendall(self.pack(msg))
+
+    def pack(self, msg):
+        """
+        Serializes a message into the bytes tx would send. Lets a message
+        that goes to many sockets be serialized once.
+
+        Parameters
+        ----------
+        msg: any
+            The message to serialize
+
+        Returns
+        -------
+        : bytes
+        """
+        return self.__serialize(msg)
+
+    def unpack(self, data):
+        """
+        Reverses pack
+
+        Parameters
+        ----------
+        data: bytes
+            Bytes made by pack
+
+        Returns
+        -------
+        : any
+            The message
+        """
+        return pickle.loads(data[self.__headerLen:])
     
     def rx(self, sock):
         """
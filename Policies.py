@@ -0,0 +1,175 @@
+"""
+File: Policies.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    Player policies that decide which card to play given what a client can
+    see (a ClientStatePackage). They are used to drive games without a human
+    at the keyboard: the headless self-play harness, bots and tournaments.
+    Policies are looked up by name with make_policy so that they can be
+    requested across process boundaries.
+"""
+from abc import ABC, abstractmethod
+from Card import Card
+from SharedState import PlayCardAction
+
+def playable_moves(layout, midPiles):
+    """
+    Lists every play a player can make
+
+    Parameters
+    ----------
+    layout: list(Card | None)
+        The player's layout
+    midPiles: list(Card)
+        The cards on top of the center piles
+
+    Returns
+    -------
+    : list(tuple(int, int))
+        (layoutIdx, midPileIdx) of each legal play
+    """
+    return [(l, m) for l, card in enumerate(layout) if card is not None
+                   for m, top in enumerate(midPiles)
+                   if Card.are_adjacent(card, top)]
+
+#==============================================================================#
+#                                   Policies                                   #
+#==============================================================================#
+class BasePolicy(ABC):
+    """
+    A policy picks a play for a player. Policies must not keep per game state
+    in choose() so one instance can be reused between games.
+    """
+    name = "base"
+
+    def reaction_time(self, rng):
+        """
+        Time the player takes to react to the board before playing
+
+        Parameters
+        ----------
+        rng: random.Random
+            Generator to draw any randomness from
+
+        Returns
+        -------
+        : float
+            Seconds between this player's decisions. 0 by default.
+        """
+        return 0.0
+
+    @abstractmethod
+    def choose(self, pkg, rng):
+        """
+        Picks a play
+
+        Parameters
+        ----------
+        pkg: ClientStatePackage
+            The game as seen by the player
+        rng: random.Random
+            Generator to draw any randomness from
+
+        Returns
+        -------
+        : PlayCardAction | None
+            The play to make or None to not play
+        """
+
+class RandomPolicy(BasePolicy):
+    """
+    Plays a uniformly random legal card
+    """
+    name = "random"
+
+    def choose(self, pkg, rng):
+        moves = playable_moves(pkg.myLayout, pkg.midPiles)
+        if not moves:
+            return None
+        return PlayCardAction(*rng.choice(moves))
+
+class GreedyPolicy(BasePolicy):
+    """
+    Plays the card that leaves the opponent the fewest plays on the card it
+    covers. Ties go to the leftmost card.
+    """
+    name = "greedy"
+
+    def choose(self, pkg, rng):
+        moves = playable_moves(pkg.myLayout, pkg.midPiles)
+        if not moves:
+            return None
+
+        def opponent_plays(move):
+            layoutIdx, midPileIdx = move
+            piles = pkg.midPiles.copy()
+            piles[midPileIdx] = pkg.myLayout[layoutIdx]
+            return len(playable_moves(pkg.theirLayout, piles))
+
+        return PlayCardAction(*min(moves, key=opponent_plays))
+
+class ReactionLimitedPolicy(BasePolicy):
+    """
+    Wraps another policy and makes it wait a human-like amount of time
+    between decisions
+    """
+    def __init__(self, inner, meanDelay=0.6, spread=0.2):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        inner: BasePolicy
+            The policy that picks the plays
+        meanDelay: float
+            Mean reaction time in seconds
+        spread: float
+            Reaction times are uniform in meanDelay +/- spread
+        """
+        self.__inner = inner
+        self.__meanDelay = meanDelay
+        self.__spread = spread
+        self.name = f"{inner.name}@{meanDelay:g}s"
+
+    def reaction_time(self, rng):
+        return max(0.0, rng.uniform(self.__meanDelay - self.__spread,
+                                    self.__meanDelay + self.__spread))
+
+    def choose(self, pkg, rng):
+        return self.__inner.choose(pkg, rng)
+
+#==============================================================================#
+#                              Lookup by name                                  #
+#==============================================================================#
+BASE_POLICIES = {"random": RandomPolicy, "greedy": GreedyPolicy}
+
+def make_policy(name):
+    """
+    Builds a policy from its name. A base policy name may be followed by
+    @<seconds> to make it reaction-time-limited, e.g. "greedy@0.5".
+
+    Parameters
+    ----------
+    name: str
+        Name of the policy
+
+    Returns
+    -------
+    : BasePolicy
+
+    Raises
+    ------
+    ValueError
+        If there is no policy with that name
+    """
+    baseName, _, delay = name.partition("@")
+    if baseName not in BASE_POLICIES:
+        raise ValueError(f"Unknown policy {name!r}. "
+                         f"Choose from {sorted(BASE_POLICIES)}")
+    policy = BASE_POLICIES[baseName]()
+    if delay:
+        policy = ReactionLimitedPolicy(policy, float(delay.rstrip("s")))
+    return policy
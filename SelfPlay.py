@@ -0,0 +1,252 @@
+"""
+File: SelfPlay.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    A headless harness that plays games on ServerGameState directly, with
+    every seat driven by a policy from Policies.py instead of a Client. Games
+    are spread across a multiprocessing pool and the statistics of each game
+    are streamed to a JSON lines results file as soon as it finishes.
+
+    Because every game is seeded, a results file doubles as a rules
+    regression corpus: `python SelfPlay.py --verify results.jsonl` replays
+    each game and checks that it still ends the same way.
+"""
+import json
+import time
+import heapq
+import random
+import argparse
+import multiprocessing
+from ServerGameState import ServerGameState
+from SharedState import ClientStatePackage
+from Policies import make_policy
+
+# Simulated time a flip takes, matches the flip animation in Display
+FLIP_TIME = 1.0 #s
+
+# Stop games that have not ended after this many decisions
+MAX_EVENTS = 100_000
+
+def package_for(state, playerIdx):
+    """
+    Builds the ClientStatePackage the server would send a player
+
+    Parameters
+    ----------
+    state: ServerGameState
+        The game
+    playerIdx: int
+        The player to build the package for
+
+    Returns
+    -------
+    : ClientStatePackage
+    """
+    layout, cardsLeft, midPiles, others = state.get_player_info(playerIdx)
+    opponent = others[min(others)]
+    return ClientStatePackage(layout, opponent['layout'], midPiles,
+                              cardsLeft, opponent['cardsLeft'])
+
+def play_game(gameId, policyNames, seed, numPlayers=2, numGamePiles=2,
+              layoutSize=4):
+    """
+    Plays one game to completion. Players act in order of simulated time:
+    each one decides, then waits its policy's reaction time before deciding
+    again. A player that had nothing to play waits for the board to change.
+    When nobody can play the game flips.
+
+    Parameters
+    ----------
+    gameId: int
+        Identifier copied into the statistics
+    policyNames: list(str)
+        Name of the policy for each seat, see Policies.make_policy
+    seed: int
+        Seed for the deal and for the policies
+    numPlayers: int
+        The number of players
+    numGamePiles: int
+        The number of center piles
+    layoutSize: int
+        The number of cards in each layout
+
+    Returns
+    -------
+    : dict{str -> any}
+        Statistics for the game
+    """
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    state = ServerGameState(numPlayers, numGamePiles, layoutSize, seed=seed)
+    policies = [make_policy(n) for n in policyNames]
+
+    plays = [0] * numPlayers
+    flips = 0
+    events = 0
+    clock = 0.0
+    seq = 0 # Breaks ties between players that act at the same time
+    queue = []
+    waiting = [] # Players that had nothing to play on the current board
+    for i, policy in enumerate(policies):
+        heapq.heappush(queue, (policy.reaction_time(rng), seq, i))
+        seq += 1
+
+    gameOver, winner = state.game_over()
+    while not gameOver and events < MAX_EVENTS:
+        events += 1
+        if not state.moves_available():
+            state.flip()
+            flips += 1
+            # Everyone sees the new piles at the same time and reacts to them
+            clock += FLIP_TIME
+            queue = []
+            for i, policy in enumerate(policies):
+                heapq.heappush(queue, (clock + policy.reaction_time(rng),
+                                       seq, i))
+                seq += 1
+            waiting = []
+        elif not queue:
+            break # Every policy declined to play
+        else:
+            actTime, _, i = heapq.heappop(queue)
+            clock = max(clock, actTime)
+            action = policies[i].choose(package_for(state, i), rng)
+            if action and state.play_card(i, action.layoutIdx,
+                                          action.midPileIdx):
+                plays[i] += 1
+                # The board changed so players that were waiting react to it
+                waiting.append(i)
+                for j in waiting:
+                    heapq.heappush(queue,
+                                   (clock + policies[j].reaction_time(rng),
+                                    seq, j))
+                    seq += 1
+                waiting = []
+            else:
+                # Nothing to do until someone else changes the board
+                waiting.append(i)
+        gameOver, winner = state.game_over()
+
+    elapsed = time.perf_counter() - start
+    return {"game":        gameId,
+            "seed":        seed,
+            "policies":    list(policyNames),
+            "shape":       [numPlayers, numGamePiles, layoutSize],
+            "finished":    gameOver,
+            "winner":      winner,
+            "plays":       plays,
+            "flips":       flips,
+            "length":      sum(plays) + flips,
+            "gameTime":    round(clock, 3),
+            "elapsed":     elapsed,
+            "movesPerSec": (sum(plays) + flips) / elapsed if elapsed else 0.0}
+
+def play_job(job):
+    """
+    Unpacks a tuple of play_game arguments, for process pools
+    """
+    return play_game(*job)
+
+def run_games(numGames, policyNames, resultsPath, workers=None, seed=0,
+              numPlayers=2, numGamePiles=2, layoutSize=4):
+    """
+    Plays numGames games across a process pool and appends one JSON line of
+    statistics per game to resultsPath as games finish
+
+    Parameters
+    ----------
+    numGames: int
+        The number of games to play
+    policyNames: list(str)
+        Name of the policy for each seat
+    resultsPath: str
+        JSON lines file to append statistics to
+    workers: int | None
+        Number of worker processes, defaults to the number of CPUs
+    seed: int
+        Game i is dealt with seed + i
+
+    Returns
+    -------
+    : dict{str -> float}
+        Totals for the whole run. Games stopped at MAX_EVENTS or because
+        every policy declined to play count as unfinished, not as draws.
+    """
+    jobs = [(i, policyNames, seed + i, numPlayers, numGamePiles, layoutSize)
+            for i in range(numGames)]
+    wins = [0] * numPlayers
+    draws = unfinished = 0
+    moves = 0
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool, \
+         open(resultsPath, "a") as results:
+        for stats in pool.imap_unordered(play_job, jobs, chunksize=16):
+            results.write(json.dumps(stats) + "\n")
+            if not stats["finished"]:
+                unfinished += 1
+            elif stats["winner"] is None:
+                draws += 1
+            else:
+                wins[stats["winner"]] += 1
+            moves += stats["length"]
+    elapsed = time.perf_counter() - start
+    return {"games":       numGames,
+            "wins":        wins,
+            "draws":       draws,
+            "unfinished":  unfinished,
+            "elapsed":     elapsed,
+            "gamesPerSec": numGames / elapsed,
+            "movesPerSec": moves / elapsed}
+
+def verify_corpus(resultsPath):
+    """
+    Replays every game in a results file and compares the outcome
+
+    Parameters
+    ----------
+    resultsPath: str
+        JSON lines file written by run_games
+
+    Returns
+    -------
+    : list(int)
+        The ids of the games that no longer end the same way
+    """
+    mismatched = []
+    with open(resultsPath) as results:
+        for line in results:
+            old = json.loads(line)
+            new = play_game(old["game"], old["policies"], old["seed"],
+                            *old["shape"])
+            if any(new[k] != old[k] for k in ("finished", "winner", "plays",
+                                               "flips")):
+                mismatched.append(old["game"])
+    return mismatched
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Spit self-play")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--policies", nargs="+", default=["random", "greedy"],
+                        help="one policy per seat, e.g. random greedy@0.5")
+    parser.add_argument("--out", default="selfplay.jsonl")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verify", metavar="FILE",
+                        help="replay a results file and report differences")
+    args = parser.parse_args()
+
+    if args.verify:
+        bad = verify_corpus(args.verify)
+        print("All games match" if not bad else f"Games differ: {bad}")
+        return
+
+    totals = run_games(args.games, args.policies, args.out, args.workers,
+                       args.seed, numPlayers=len(args.policies),
+                       numGamePiles=len(args.policies))
+    print(totals)
+
+if __name__ == "__main__":
+    main()
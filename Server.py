@@ -14,6 +14,16 @@ from ServerGameState import *
 from enum import Enum
 from functools import *
 from SharedState import ClientStatePackage
+from DealDatabase import DealDatabase
+from Bot import BotPlayer
+from Spectators import SpectatorHub
+from StateBoard import StateBoardWriter
+from EventLog import EventLogWriter
+import WriteAheadLog
+import argparse
+import random
+import socket
+from collections import deque
 
 # Rate at which we break to check for incoming signals while running the server 
 SOCKET_TIMEOUT = 1 #s
@@ -40,7 +50,11 @@ class Server(BaseServer):
     #*********************************************************************#
     #           Constructor and Driver functions for the Server           #
     #*********************************************************************#
-    def __init__(self, host, port, numPlayers=2, numGamePiles=2, layoutSize=4):
+    def __init__(self, host, port, numPlayers=2, numGamePiles=2, layoutSize=4,
+                 dealDatabase=None, difficulty=None, spectatorPort=None,
+                 spectatorDelay=2.0, winProbability=None, stateBoardPath=None,
+                 eventLogPath=None, walPath=None, walWindow=0.005,
+                 recover=False):
         """
         Constructor for the Server class
 
@@ -56,11 +70,41 @@ class Server(BaseServer):
             The number of center piles in the game
         layoutSize: int
             The number of layout piles per player
+        dealDatabase: DealDatabase | None
+            If given, the room is dealt from this database instead of
+            shuffling new decks. It must have been scored for this room's
+            numPlayers, numGamePiles and layoutSize.
+        difficulty: int | None
+            Difficulty bucket to pull the deal from. Any deal if None.
+        spectatorPort: int | None
+            If given, spectators can watch the room on this port
+        spectatorDelay: float
+            Seconds spectators are kept behind the game
+        winProbability: WinProbabilityService | None
+            If given along with spectatorPort, spectators are also sent win
+            probabilities for each state
+        stateBoardPath: str | None
+            If given, the public state is published to a memory-mapped
+            StateBoard at this path after every play and flip
+        eventLogPath: str | None
+            If given, the room's events are logged to this file, see EventLog
+        walPath: str | None
+            If given, the room is written to this write-ahead log so it can
+            be recovered if the server dies
+        walWindow: float
+            Seconds write-ahead log records are gathered for before they are
+            fsynced together. A play or flip is only broadcast once its 
+            record is on disk, so this bounds the latency the log adds.
+        recover: bool
+            If True, the room is rebuilt from the write-ahead log at walPath
+            instead of being dealt, and waits for its players to reconnect.
+            Returning players get their old seat back by name.
 
         Notes
         -----
-        Changes to the default parameters are not handled throughout the
-        codebase. Change at your own risk
+        numGamePiles must be at least numPlayers. In rooms of more than two
+        players each client is shown the next seat round the table as its
+        opponent.
         """
         # Super takes host addr, port, and max length of incoming connection
         # request queue
@@ -71,14 +115,80 @@ class Server(BaseServer):
         self.__maxPlayers = numPlayers
         self.__serverStatus = Server.ServerStatus.SETUP
 
-        self.__state = ServerGameState(numPlayers=numPlayers, 
-                                       numGamePiles=numGamePiles, 
-                                       layoutSize=layoutSize)
+        self.__wal = None
+        self.__recoveredNames = None
+        self.__recoveredMoves = []
+        # Sends waiting for a write-ahead log record to be durable, as
+        # (sequence number, func) in log order
+        self.__held = deque()
+        if walPath is not None:
+            # The log's committer thread wakes the server loop through this
+            self.__walWake, self.__walWakeTx = socket.socketpair()
+            self.__walWake.setblocking(False)
+            self.__walWakeTx.setblocking(False)
+            self.add_reader(self.__walWake, self.__release_durable)
+        if recover:
+            room, self.__wal = WriteAheadLog.recover(walPath, walWindow,
+                                                     self.__wake_for_wal)
+            if room['shape'] != (numPlayers, numGamePiles, layoutSize):
+                self.__wal.close()
+                raise ValueError(f"Write-ahead log is for a game shaped "
+                                 f"{room['shape']}")
+            self.__state = room['state']
+            self.__recoveredNames = room['names']
+            self.__recoveredMoves = room['moves']
+        else:
+            decks = None
+            if dealDatabase is not None:
+                # Its difficulty buckets only hold for the rules it was 
+                # scored with
+                if dealDatabase.shape() != (numPlayers, numGamePiles, 
+                                            layoutSize):
+                    raise ValueError(f"Deal database was scored for games "
+                                     f"shaped {dealDatabase.shape()}")
+                decks = dealDatabase.draw(difficulty)['decks']
+
+            # Shuffle from a seed of our own so the event log can record it
+            seed = random.randrange(2 ** 63) if decks is None else None
+            self.__state = ServerGameState(numPlayers=numPlayers, 
+                                           numGamePiles=numGamePiles, 
+                                           layoutSize=layoutSize,
+                                           seed=seed,
+                                           decks=decks)
+            if walPath is not None:
+                self.__wal = WriteAheadLog.WriteAheadLog(walPath, numPlayers,
+                                                         numGamePiles,
+                                                         layoutSize,
+                                                         walWindow,
+                                                         onDurable=
+                                                         self.__wake_for_wal)
+                self.__wal.log_deal(self.__state.initial_decks())
+
+        self.__spectators = None
+        if spectatorPort is not None:
+            self.__spectators = SpectatorHub(host, spectatorPort, 
+                                             spectatorDelay,
+                                             winProbability=winProbability)
+
+        self.__stateBoard = None
+        if stateBoardPath is not None:
+            self.__stateBoard = StateBoardWriter(stateBoardPath, numPlayers,
+                                                 numGamePiles, layoutSize)
+
+        self.__eventLog = None
+        if eventLogPath is not None:
+            self.__eventLog = EventLogWriter(eventLogPath, numPlayers,
+                                             numGamePiles, layoutSize)
+            self.__eventLog.log_deal(self.__state.initial_decks(),
+                                     self.__state.seed())
 
     def start(self):
         """
         Starts up the server and run the game
         """
+        if self.__spectators is not None:
+            self.__spectators.start()
+
         while self.__serverStatus == Server.ServerStatus.SETUP:
             try:
                 self.rx_message()
@@ -93,11 +203,32 @@ class Server(BaseServer):
                     Server.ClientStatus.PLAYING
             
             # Give everyone the initial gamestate
+            if self.__eventLog is not None:
+                self.__eventLog.log_start()
+                # Catch the event log up with the moves made before the 
+                # crash. They go after the joins and start so a replay sees
+                # the game begin before anything is played.
+                for kind, player, data in self.__recoveredMoves:
+                    if kind == WriteAheadLog.PLAY:
+                        self.__eventLog.log_play(player, *data)
+                    else:
+                        self.__eventLog.log_flip(data)
             self.__broadcast_gamestate('initial')   
 
             # Begin the game
             self.__loop()
 
+        if self.__spectators is not None:
+            self.__spectators.stop(drain=True)
+        if self.__stateBoard is not None:
+            self.__stateBoard.close()
+        if self.__eventLog is not None:
+            self.__eventLog.close()
+        if self.__wal is not None:
+            self.__wal.close()
+            self.__walWake.close()
+            self.__walWakeTx.close()
+
     def __loop(self):
         """
         Runs the game
@@ -129,9 +260,17 @@ class Server(BaseServer):
             cardsToFlip = [c for (i, c) in 
                            enumerate(self.__state.get_game_piles()) 
                            if i in playersFlipped]
-
-            self.broadcast_message(("flip", cardsToFlip, playersFlipped))
-            self.__broadcast_gamestate("new")
+            if self.__eventLog is not None:
+                self.__eventLog.log_flip(playersFlipped)
+            lsn = None
+            if self.__wal is not None:
+                lsn = self.__wal.log_flip(playersFlipped)
+
+            sendState = self.__gamestate_sender("new")
+            def send():
+                self.broadcast_message(("flip", cardsToFlip, playersFlipped))
+                sendState()
+            self.__send_when_durable(lsn, send)
             self.__make_all_animating()
             return True
         return False
@@ -192,8 +331,19 @@ class Server(BaseServer):
         match msg:
             case ("player-name", name):
                 self.__currentPlayers[client]["uname"] = name
+                if self.__recoveredNames is not None:
+                    self.__currentPlayers[client]["id"] = \
+                        self.__claim_seat(client, name)
                 if self.__all_named():
                     self.broadcast_message(("all-names", self.__player_names()))
+                    if self.__eventLog is not None:
+                        for i, uname in enumerate(self.__player_names()):
+                            self.__eventLog.log_join(i, uname)
+                    if self.__wal is not None:
+                        for d in self.__currentPlayers.values():
+                            self.__wal.log_seat(d['id'], d['uname'])
+                    if self.__spectators is not None:
+                        self.__spectators.set_names(self.__player_names())
             case ("ready",):
                 self.__currentPlayers[client]['status'] = \
                     Server.ClientStatus.READY
@@ -252,15 +402,33 @@ class Server(BaseServer):
             
             # If the move is allowed we send the new gamestate back to everyone
             if validMove:
-                self.exclusive_broadcast([client], ("move", "them", 
-                                                    playAction.layoutIdx, 
-                                                    "mid", 
-                                                    playAction.midPileIdx))
-                self.tx_message(client, ("move", "me", playAction.layoutIdx, 
-                                         "mid", playAction.midPileIdx))
-                self.__broadcast_gamestate("new")
-                # self.__currentPlayers[client]['animating'] = True
-                self.__make_all_animating()
+                if self.__eventLog is not None:
+                    self.__eventLog.log_play(clientIdx, playAction.layoutIdx,
+                                             playAction.midPileIdx)
+                lsn = None
+                if self.__wal is not None:
+                    lsn = self.__wal.log_play(clientIdx, playAction.layoutIdx,
+                                              playAction.midPileIdx)
+                # Only players who are shown the mover as their opponent see
+                # the card move, the rest just get the new state
+                watchers = [c for c, d in self.__currentPlayers.items()
+                            if c != client and 
+                            self.__state.opponent_of(d['id']) == clientIdx]
+                sendState = self.__gamestate_sender("new")
+                def send():
+                    for watcher in watchers:
+                        self.tx_message(watcher, ("move", "them", 
+                                                  playAction.layoutIdx, 
+                                                  "mid", 
+                                                  playAction.midPileIdx))
+                    self.tx_message(client, ("move", "me", 
+                                             playAction.layoutIdx, 
+                                             "mid", playAction.midPileIdx))
+                    sendState()
+                self.__send_when_durable(lsn, send)
+                self.__currentPlayers[client]['animating'] = True
+                for watcher in watchers:
+                    self.__currentPlayers[watcher]['animating'] = True
             else:
                 # Otherwise we tell the client they made a bad move
                 self.tx_message(client, 
@@ -279,13 +447,62 @@ class Server(BaseServer):
             else:
                 # Otherwise accept the new connections and initialize them
                 [newClient] = self.accept_connections()
-                self.__currentPlayers[newClient] \
-                    = {'id': len(self.__currentPlayers),
-                       'status': Server.ClientStatus.CONNECTED,
-                       'uname' : None,
-                       'animating': True}
-                self.tx_message(newClient, ("ip-info", get_ip()))
-                self.tx_message(newClient, ('name-request',))
+                self.__seat_player(newClient)
+
+    def add_local_seat(self, conn):
+        """
+        Seats a player that lives in this process. It goes through the same
+        handshake and gets the same messages as a player on a socket.
+
+        Parameters
+        ----------
+        conn: LocalConnection
+            The seat's connection
+
+        Returns
+        -------
+        : bool
+            False if the game is already full
+        """
+        if len(self.__currentPlayers) >= self.__maxPlayers or \
+           self.__serverStatus != Server.ServerStatus.SETUP:
+            return False
+        self.add_local_client(conn)
+        self.__seat_player(conn)
+        return True
+
+    def add_bot(self, name, **botArgs):
+        """
+        Fills a seat with a BotPlayer that runs inside the server loop
+
+        Parameters
+        ----------
+        name: str
+            The bot's player name
+        botArgs: dict
+            Passed on to BotPlayer
+
+        Returns
+        -------
+        : BotPlayer | None
+            The bot, None if the game is already full
+        """
+        conn = LocalConnection()
+        bot = BotPlayer(name, conn.send, **botArgs)
+        conn.attach(bot.handle_message, bot.tick)
+        return bot if self.add_local_seat(conn) else None
+
+    def __seat_player(self, client):
+        """
+        Gives a new client the next player id and starts its handshake
+        """
+        self.__currentPlayers[client] \
+            = {'id': len(self.__currentPlayers),
+               'status': Server.ClientStatus.CONNECTED,
+               'uname' : None,
+               'animating': True}
+        self.tx_message(client, ("ip-info", get_ip()))
+        self.tx_message(client, ('name-request',))
         
     def remove_client(self, client):
         """
@@ -308,38 +525,98 @@ class Server(BaseServer):
         stateTag: str
             The type of state being sent
         """
-        for client in self.__currentPlayers.keys():
-            # Get the gamestate package for that specific client and send it
-            pkg = self.__package_gamestate(client)
-            self.tx_message(client, ('state', stateTag, pkg))
+        self.__gamestate_sender(stateTag)()
 
-    def __package_gamestate(self, client):
+    def __gamestate_sender(self, stateTag: str):
         """
-        Pulls out the elements from our gamestate that a specific client needs 
-        to know and packages them into a ClientStatePackage object
+        Captures the gamestate as it is now so it can be sent later, once the
+        moves that led to it are durable
 
         Parameters
         ----------
-        client: socket.socket
-            The specific player's socket for whom the package is created
+        stateTag: str
+            The type of state being sent
 
         Returns
         -------
-        ClientStatePackage for the given client
+        : func()
+            Sends the captured state to all players, the state board and the
+            spectators
+        """
+        # Built once per broadcast, the public parts are shared between
+        # every player's package
+        publicInfo = self.__state.public_info()
+        packages = self.__state.client_packages(publicInfo)
+        status = self.__serverStatus
+        winner = None
+        if status == Server.ServerStatus.STOPPING:
+            winner = self.__state.game_over()[1]
+        compact = None
+        if self.__spectators is not None and self.__spectators.wants_odds():
+            compact = self.__state.to_compact()
+
+        def send():
+            for client, clientDict in self.__currentPlayers.items():
+                self.tx_message(client, ('state', stateTag, 
+                                         packages[clientDict['id']]))
+
+            if self.__stateBoard is not None:
+                self.__stateBoard.write(*publicInfo, status.value, winner)
+
+            # Spectators are served from another thread, this only queues
+            if self.__spectators is not None:
+                self.__spectators.publish_state(*publicInfo, compact)
+        return send
+
+    def __send_when_durable(self, lsn, send):
+        """
+        Sends now if the write-ahead log record lsn is on disk (or there is
+        no log), otherwise holds the send until the record's batch is 
+        committed. Sends stay in log order.
+
+        Parameters
+        ----------
+        lsn: int | None
+            Sequence number of the record the send depends on
+        send: func()
+            Does the sending
         """
-        clientIdx = self.__currentPlayers[client]['id']
-        playerLayout, myDeckSize, midPiles, opponentInfo = \
-            self.__state.get_player_info(clientIdx)
+        if lsn is None or (not self.__held and self.__wal.durable() >= lsn):
+            send()
+        else:
+            self.__held.append((lsn, send))
 
-        otherPlayerIdx = \
-            [subdict['id'] for subdict in self.__currentPlayers.values() 
-             if subdict.get('id') != clientIdx][0] 
-        # Note: There will only be one other player in a two player game
+    def __wake_for_wal(self, durableLsn):
+        """
+        Called on the write-ahead log's committer thread after every commit,
+        wakes the server loop to release what is now durable
+        """
+        try:
+            self.__walWakeTx.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass # Already woken, or shutting down
 
-        oppLayout = opponentInfo[otherPlayerIdx]['layout']
-        theirDeckSize = opponentInfo[otherPlayerIdx]['cardsLeft']
-        return ClientStatePackage(playerLayout, oppLayout, midPiles, 
-                                  myDeckSize, theirDeckSize)
+    def __release_durable(self):
+        """
+        Sends everything held for write-ahead log records that are now on 
+        disk. Runs on the server loop.
+        """
+        try:
+            while self.__walWake.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+        durable = self.__wal.durable()
+        while self.__held and self.__held[0][0] <= durable:
+            self.__held.popleft()[1]()
+
+    def __flush_held(self):
+        """
+        Waits for every held send's record to be durable and sends them
+        """
+        if self.__held:
+            self.__wal.wait_durable(self.__held[-1][0])
+            self.__release_durable()
     
     #*********************************************************************#
     #        Internal functions for gracefully ending the game            #
@@ -377,6 +654,23 @@ class Server(BaseServer):
             the data to include in the message
         """
         if self.__serverStatus != Server.ServerStatus.STOPPED:
+            if self.__spectators is not None and \
+               self.__serverStatus != Server.ServerStatus.STOPPING:
+                self.__spectators.publish_end(
+                    reason, self.__currentPlayers[data]['uname'] 
+                            if reason == "winner" else data)
+            if self.__eventLog is not None and \
+               self.__serverStatus != Server.ServerStatus.STOPPING:
+                winnerId = self.__currentPlayers[data]['id'] \
+                           if reason == "winner" else None
+                self.__eventLog.log_result(winnerId, reason)
+            # A killed server can be recovered, any other ending is final
+            if self.__wal is not None and reason != "server-killed" and \
+               self.__serverStatus != Server.ServerStatus.STOPPING:
+                self.__wal.log_end()
+            # Moves clients have not seen yet go out before the ending
+            if self.__wal is not None:
+                self.__flush_held()
             if reason == "winner":
                 self.__serverStatus = Server.ServerStatus.STOPPING
                 # in this case, data == client socket that won
@@ -453,9 +747,35 @@ class Server(BaseServer):
         Returns
         -------
         : list(str)
-            A list of all connected players user names
+            A list of all connected players user names, in seat order
         """
-        return list(map(lambda x: x['uname'], self.__currentPlayers.values()))
+        return [d['uname'] for d in sorted(self.__currentPlayers.values(),
+                                           key=lambda d: d['id'])]
+
+    def __claim_seat(self, client, name):
+        """
+        Picks the seat of a player reconnecting to a recovered room
+
+        Parameters
+        ----------
+        client: socket.socket
+            The socket of the player
+        name: str
+            The name they gave
+
+        Returns
+        -------
+        : int
+            The seat that player had under that name if it is free, otherwise
+            the first seat no one has claimed
+        """
+        taken = {d['id'] for c, d in self.__currentPlayers.items()
+                 if c != client and d['uname'] is not None}
+        if name in self.__recoveredNames:
+            seat = self.__recoveredNames.index(name)
+            if seat not in taken:
+                return seat
+        return min(set(range(self.__maxPlayers)) - taken)
 
     def __client_from_id(self, id):
         """
@@ -480,9 +800,60 @@ SERVER_ADDR = "0.0.0.0"
 SERVER_PORT = 9000
 
 def main():
-    server = Server(SERVER_ADDR, SERVER_PORT, 2)
+    parser = argparse.ArgumentParser(description="Host a game of Spit")
+    parser.add_argument("--deals", default=None,
+                        help="deal database to deal from instead of shuffling")
+    parser.add_argument("--difficulty", type=int, default=None,
+                        help="difficulty bucket to pull deals from")
+    parser.add_argument("--players", type=int, default=2,
+                        help="players in the room")
+    parser.add_argument("--bots", type=int, default=0,
+                        help="seats to fill with in-process bots")
+    parser.add_argument("--bot-strategy", choices=BotPlayer.STRATEGIES,
+                        default="greedy")
+    parser.add_argument("--spectator-port", type=int, default=None,
+                        help="let spectators watch on this port")
+    parser.add_argument("--spectator-delay", type=float, default=2.0)
+    parser.add_argument("--odds", action="store_true",
+                        help="send spectators win probabilities")
+    parser.add_argument("--state-board", default=None, metavar="PATH",
+                        help="publish the state to a memory-mapped file, "
+                             "e.g. /dev/shm/spit.board")
+    parser.add_argument("--event-log", default=None, metavar="PATH",
+                        help="log the room's events to this file, read it "
+                             "back with EventLog.py")
+    parser.add_argument("--wal", default=None, metavar="PATH",
+                        help="write-ahead log the room so it survives a crash")
+    parser.add_argument("--wal-window", type=float, default=5.0, metavar="MS",
+                        help="milliseconds write-ahead log records are "
+                             "gathered for before one fsync")
+    parser.add_argument("--recover", action="store_true",
+                        help="rebuild the room from --wal and wait for its "
+                             "players to reconnect")
+    args = parser.parse_args()
+
+    winProbability = None
+    if args.odds and args.spectator_port is not None:
+        from WinProbability import WinProbabilityService
+        winProbability = WinProbabilityService()
+
+    dealDatabase = DealDatabase(args.deals) if args.deals else None
+    server = Server(SERVER_ADDR, SERVER_PORT, args.players, 
+                    numGamePiles=max(2, args.players),
+                    dealDatabase=dealDatabase, difficulty=args.difficulty,
+                    spectatorPort=args.spectator_port,
+                    spectatorDelay=args.spectator_delay,
+                    winProbability=winProbability,
+                    stateBoardPath=args.state_board,
+                    eventLogPath=args.event_log,
+                    walPath=args.wal, walWindow=args.wal_window / 1000,
+                    recover=args.recover)
+    for i in range(args.bots):
+        server.add_bot(f"bot-{i}", strategy=args.bot_strategy)
     print(f"Created a server at {get_ip()}:{9000}")
     server.start()
+    if winProbability is not None:
+        winProbability.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
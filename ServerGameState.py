@@ -14,6 +14,9 @@ Purpose
 
 from Card import Card
 from Deck import Deck
+from SharedState import ClientStatePackage
+import CompactState
+import random
 
 class Player:
     def __init__(self, deck, id, name=None, layoutSize=4):
@@ -113,9 +116,21 @@ class Player:
          """
         return len(self.__deck)
 
+    def get_deck(self):
+        """
+         Returns the cards left in the Player's Deck
+
+         Returns
+         -------
+         : list(Card)
+             A copy of the cards in the Deck, top first
+         """
+        return self.__deck.peek()
+
     
 class ServerGameState:
-    def __init__(self, numPlayers=2, numGamePiles=2, layoutSize=4):
+    def __init__(self, numPlayers=2, numGamePiles=2, layoutSize=4, seed=None,
+                 decks=None):
         """
         Constructor for the ServerGameState
         Deals out player's layouts and then deals a card from each to a 
@@ -129,18 +144,40 @@ class ServerGameState:
             The number of center piles in the game. Defualt is 2
         layoutSize: int
             The number of cards in each player's layout. Default is 4
+        seed: int | None
+            Seed for shuffling the players' decks so a deal can be reproduced.
+            Decks are shuffled with the global random generator if None.
+        decks: list(list(Card)) | None
+            A pre-made deal, one deck per player with the top card first. The
+            decks are used as given instead of being shuffled.
 
         Returns
         -------
         : ServerGameState
+
+        Raises
+        ------
+        ValueError
+            If there are fewer center piles than players, since every player
+            flips onto the pile with their own index
         """
+        if numGamePiles < numPlayers:
+            raise ValueError("numGamePiles must be at least numPlayers")
+
         # Create players
         self.__players = []
+        self.__initialDecks = []
         self.__layoutSize = layoutSize
+        self.__seed = None if decks is not None else seed
+        rng = None if seed is None else random.Random(seed)
         for i in range(numPlayers):
-            new_deck = Deck()
-            new_deck.shuffle()
-            self.__players.append(Player(new_deck, i, layoutSize))
+            if decks is not None:
+                new_deck = Deck(decks[i])
+            else:
+                new_deck = Deck()
+                new_deck.shuffle(rng)
+            self.__initialDecks.append(new_deck.peek())
+            self.__players.append(Player(new_deck, i, layoutSize=layoutSize))
 
         # Create game piles from players' decks
         # For fairness, num_game_piles should be divisible by num_players
@@ -307,4 +344,100 @@ class ServerGameState:
                 otherPlayerInfo[i] = {'layout'   : player.get_layout(),
                                     'cardsLeft': player.cards_left()}
         return thisPlayer.get_layout(), thisPlayer.cards_left(), \
-               self.__game_piles.copy(), otherPlayerInfo
\ No newline at end of file
+               self.__game_piles.copy(), otherPlayerInfo
+
+    def initial_decks(self):
+        """
+        Returns
+        -------
+        : list(list(Card))
+            Every player's deck as it was dealt, top first. Passing these as
+            decks to a new ServerGameState recreates this game's deal.
+        """
+        return [deck.copy() for deck in self.__initialDecks]
+
+    def seed(self):
+        """
+        Returns
+        -------
+        : int | None
+            The seed the decks were shuffled with, None if they were given
+            or shuffled with the global random generator
+        """
+        return self.__seed
+
+    def opponent_of(self, playerIdx):
+        """
+        The opponent a player's display draws. In rooms of more than two
+        players this is the next seat round the table. Clients only get this
+        opponent's layout and only see its plays animated, plays by anyone
+        else just change the mid piles.
+
+        Parameters
+        ----------
+        playerIdx: int
+            The index of the player
+
+        Returns
+        -------
+        : int
+            The index of the opponent shown to playerIdx
+        """
+        return (playerIdx + 1) % len(self.__players)
+
+    def public_info(self):
+        """
+        Gathers what every player can see. The lists are new copies.
+
+        Returns
+        -------
+        : tuple(list(list(Card)), list(int), list(Card))
+            Every layout and deck size by player index, and the mid piles
+        """
+        return [player.get_layout() for player in self.__players], \
+               [player.cards_left() for player in self.__players], \
+               self.__game_piles.copy()
+
+    def client_packages(self, publicInfo=None):
+        """
+        Builds the ClientStatePackage of every player for one broadcast. The
+        public information (each layout, each deck size and the mid piles) is
+        gathered once and shared by every package, so building them is linear
+        in the number of players. Each package only holds the layout of the
+        opponent_of its player, the one the client draws, along with the mid
+        piles and every player's deck size. Packages must be treated as read
+        only.
+
+        Parameters
+        ----------
+        publicInfo: tuple | None
+            The result of public_info() if the caller already has it
+
+        Returns
+        -------
+        : list(ClientStatePackage)
+            The package for each player, by player index
+        """
+        layouts, cardsLeft, midPiles = publicInfo or self.public_info()
+        packages = []
+        for i in range(len(self.__players)):
+            opp = self.opponent_of(i)
+            packages.append(ClientStatePackage(layouts[i], layouts[opp],
+                                               midPiles, cardsLeft[i],
+                                               cardsLeft[opp], cardsLeft))
+        return packages
+
+    def to_compact(self):
+        """
+        Packs the gamestate into the flat representation from CompactState.
+        The result is independent of this object and can be cloned, hashed and
+        advanced with the functions in CompactState.
+
+        Returns
+        -------
+        : bytearray
+        """
+        return CompactState.from_parts(
+            [player.get_layout() for player in self.__players],
+            [player.get_deck() for player in self.__players],
+            self.__game_piles)
\ No newline at end of file
@@ -9,6 +9,11 @@ Purpose
     are shared between other different classes throughout the program.
 """
 import threading
+import CompactState
+
+# Cards never change, so unpacking a package shares one Card per code
+_CARDS = [CompactState.decode_card(c)
+          for c in range(CompactState.DECK_SIZE + 1)]
 
 class PlayCardAction():
     def __init__(self, layoutIdx, midPileIdx):
@@ -32,9 +37,11 @@ class ClientStatePackage():
     """     
     
     def __init__(self, myLayout, theirLayout, midPiles, myDeckSize, 
-                 theirDeckSize): 
+                 theirDeckSize, deckSizes=None): 
         """
-        Constructor for the ClientStatePackage object
+        Constructor for the ClientStatePackage object. In rooms of more than
+        two players theirLayout and theirDeckSize are the opponent the client
+        draws, the other seats are only sent as deck sizes.
 
         Parameters
         ----------
@@ -48,6 +55,9 @@ class ClientStatePackage():
             The number of cards left in this player's deck
         theirDeckSize: int
             The number of cards left in the opponent's deck
+        deckSizes: list(int) | None
+            Every player's deck size by index, shared by every package of one
+            broadcast
         
         Returns
         -------
@@ -58,12 +68,37 @@ class ClientStatePackage():
         self.midPiles    = midPiles
         self.myDeckSize = myDeckSize
         self.theirDeckSize = theirDeckSize
+        self.deckSizes = deckSizes
+
+    def __getstate__(self):
+        # Sent on every broadcast, so cards go over the wire as the one byte
+        # codes from CompactState rather than as pickled Card objects
+        encode = CompactState.encode_card
+        return (bytes(encode(c) for c in self.myLayout),
+                bytes(encode(c) for c in self.theirLayout),
+                bytes(encode(c) for c in self.midPiles),
+                self.myDeckSize, self.theirDeckSize,
+                None if self.deckSizes is None else bytes(self.deckSizes))
+
+    def __setstate__(self, state):
+        myLayout, theirLayout, midPiles, self.myDeckSize, \
+            self.theirDeckSize, deckSizes = state
+        self.myLayout = [_CARDS[c] for c in myLayout]
+        self.theirLayout = [_CARDS[c] for c in theirLayout]
+        self.midPiles = [_CARDS[c] for c in midPiles]
+        self.deckSizes = None if deckSizes is None else list(deckSizes)
     
 
 # This class wraps a client state package object and can be shared across 
-# threads to give multiple threads a way to access/change client state
+# threads to give multiple threads a way to access/change client state.
+# Every update publishes a new immutable snapshot with a higher version 
+# number. Publishing swaps a single reference, so readers never need the lock
+# and can skip work when the version has not changed.
 class ClientState():
 
+    # What get_state returns before there is any data
+    EMPTY = ((None,), (None,), (None,), (False,), 0, 0)
+
     def __init__(self, gameState: ClientStatePackage):
         """
         A contructor for a ClientState object which is intended to be shared
@@ -79,8 +114,8 @@ class ClientState():
         : ClientState
         """
         self.__monitor = threading.Lock()
-        self.__gameState = gameState
-        self.__hasData = False if gameState is None else True
+        self.__snapshot = (0, ClientState.EMPTY, False, ())
+        self.update_state(gameState)
 
     def update_state(self, newState):
         """
@@ -92,11 +127,56 @@ class ClientState():
 
         Effects:
         -------
-        Overwrites the current state entirely
+        Overwrites the current state entirely and bumps the version
         """
+        if newState is None:
+            state = ClientState.EMPTY
+            deckSizes = ()
+        else:
+            deckSizes = tuple(newState.deckSizes or ())
+            myLayout = tuple(newState.myLayout)
+            state = (myLayout, tuple(newState.theirLayout), 
+                     tuple(newState.midPiles), 
+                     tuple(c != None for c in myLayout),
+                     newState.myDeckSize, newState.theirDeckSize)
+        # Writers take turns so versions only go up
         with self.__monitor:
-            self.__gameState = newState
-            self.__hasData = False if newState is None else True
+            self.__snapshot = (self.__snapshot[0] + 1, state, 
+                               newState is not None, deckSizes)
+
+    def snapshot(self):
+        """
+        The current state without taking the lock
+
+        Returns
+        -------
+        version: int
+            Goes up by one with every update
+        state: tuple
+            The same fields as get_state, as tuples. Never changes, a new 
+            update makes a new snapshot.
+        """
+        version, state, _, _ = self.__snapshot
+        return version, state
+
+    def deck_sizes(self):
+        """
+        Returns
+        -------
+        : tuple(int)
+            Every player's deck size by index, empty if the server did not
+            send them
+        """
+        return self.__snapshot[3]
+
+    def version(self):
+        """
+        Returns
+        -------
+        : int
+            The version of the current snapshot
+        """
+        return self.__snapshot[0]
 
     def has_data(self):
         """
@@ -105,8 +185,7 @@ class ClientState():
         : bool
             True if the ClientState has data otherwise False
         """
-        with self.__monitor:
-            return self.__hasData
+        return self.__snapshot[2]
 
     def get_state(self):
         """
@@ -127,18 +206,10 @@ class ClientState():
         theirDeckSize: int
             The number of cards left in their deck
         """
-        with self.__monitor:
-            if not self.__hasData:
-                return [None], [None], [None], [False], 0, 0
-            myLayout    = self.__gameState.myLayout.copy()
-            theirLayout = self.__gameState.theirLayout.copy()
-            midPiles = self.__gameState.midPiles.copy()
-            myDeckSize = self.__gameState.myDeckSize
-            theirDeckSize = self.__gameState.theirDeckSize
-
-        return myLayout, theirLayout, midPiles, \
-               [c != None for c in myLayout], myDeckSize, theirDeckSize
-        
+        myLayout, theirLayout, midPiles, realCards, myDeckSize, \
+            theirDeckSize = self.snapshot()[1]
+        return list(myLayout), list(theirLayout), list(midPiles), \
+               list(realCards), myDeckSize, theirDeckSize
 
     def shape(self):
         """
@@ -151,6 +222,5 @@ class ClientState():
             The second element is the number of their piles
             The final element is the number of middle piles
         """
-        myLayout, theirLayout, midPiles, _, _, _ = self.get_state()
-        return (len(myLayout), len(theirLayout), len(midPiles))    
-        
\ No newline at end of file
+        myLayout, theirLayout, midPiles, _, _, _ = self.snapshot()[1]
+        return (len(myLayout), len(theirLayout), len(midPiles))
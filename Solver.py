@@ -0,0 +1,451 @@
+"""
+File: Solver.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    An exhaustive game-tree solver for two player Spit. Since flips only
+    happen when no one can play, a dealt game is finite and can be searched
+    to the end.
+
+    Spit has no turns, so the solver models the race as alternating turns:
+    the player to move plays any legal card, a player with nothing to play
+    passes, and when neither can play the decks flip. Player 0 maximizes and
+    player 1 minimizes the result (+1 player 0 wins, 0 draw, -1 player 1
+    wins), so a value of +1 means player 0 wins no matter how player 1 plays.
+
+    Positions are memoized in a bounded LRU transposition table keyed by a
+    canonical form of the state in which interchangeable mid piles and layout
+    slots are sorted, so positions that only differ by those permutations are
+    searched once. The key holds everything else about the position, so one
+    Solver can be reused across deals and positions.
+
+    `python Solver.py --cross-check N` checks the solver against a plain
+    minimax search with no table on N small positions.
+"""
+import sys
+import time
+import random
+import resource
+import argparse
+from collections import OrderedDict
+import CompactState
+from CompactState import DECK_SIZE
+
+P0_WINS = 1
+DRAW    = 0
+P1_WINS = -1
+
+class SearchAborted(Exception):
+    """
+    Raised inside the search when the node budget runs out
+    """
+    pass
+
+def canonical_key(state, toMove):
+    """
+    Builds a key that is equal for positions with the same game value.
+
+    The key holds the game's shape and the cards left in each deck. Layout
+    slots are interchangeable so each layout is sorted. A mid pile that no
+    deck will ever flip onto again (pile i where player i has no cards left,
+    or that belongs to no player) stays that way for the rest of the game, so
+    those piles are interchangeable and sorted. Piles that can still be
+    flipped onto keep their places.
+
+    Parameters
+    ----------
+    state: bytearray
+        A CompactState buffer
+    toMove: int
+        The player whose turn it is
+
+    Returns
+    -------
+    : bytes
+    """
+    numPlayers, numPiles, layoutSize = state[0], state[1], state[2]
+    stride = 1 + layoutSize + DECK_SIZE
+    cursors = state[3 + numPiles::stride][:numPlayers]
+    tops = state[3:3 + numPiles]
+
+    # Covered piles are kept in place (0 where a pile is not covered)
+    covered = [i < numPlayers and cursors[i] < DECK_SIZE
+               for i in range(numPiles)]
+    kept = [tops[i] for i in range(numPiles) if not covered[i]]
+
+    key = bytearray([toMove, numPlayers, numPiles, layoutSize])
+    key += bytes(tops[i] if covered[i] else 0 for i in range(numPiles))
+    key += bytes(sorted(kept))
+    for p in range(numPlayers):
+        key += bytes(sorted(CompactState.layout(state, p)))
+        # Cards left in the deck, the length marks where each deck ends
+        key.append(cursors[p])
+        key += CompactState.deck(state, p)
+    return bytes(key)
+
+def brute_force(state, toMove=0):
+    """
+    Plain minimax over the same game tree as Solver with no table and no
+    symmetries. Only usable on small positions, used to check the solver.
+
+    Parameters
+    ----------
+    state: bytearray
+        A two player CompactState buffer
+    toMove: int
+        The player whose turn it is
+
+    Returns
+    -------
+    : int
+        P0_WINS, DRAW or P1_WINS
+    """
+    over, winner = CompactState.game_over(state)
+    if over:
+        return DRAW if winner is None else \
+               (P0_WINS if winner == 0 else P1_WINS)
+
+    other = 1 - toMove
+    moves = CompactState.legal_moves(state, toMove)
+    if not moves:
+        if CompactState.legal_moves(state, other):
+            return brute_force(state, other)
+        return brute_force(CompactState.flip(state)[0], toMove)
+
+    values = [brute_force(CompactState.play_card(state, toMove, l, c), other)
+              for _, l, c in moves]
+    return max(values) if toMove == 0 else min(values)
+
+def small_position(seed, cardsLeft):
+    """
+    Plays a seeded deal out at random until only a few cards are left
+
+    Parameters
+    ----------
+    seed: int
+        Seed for the deal and the random plays
+    cardsLeft: int
+        Stop once the players hold at most this many cards between them
+
+    Returns
+    -------
+    : tuple(bytearray, int, random.Random)
+        The position, who is to move and the generator the plays were drawn
+        from. The position may already be over.
+    """
+    from ServerGameState import ServerGameState
+    state = ServerGameState(seed=seed).to_compact()
+    rng = random.Random(seed)
+    def held():
+        return sum(CompactState.cards_left(state, p) +
+                   len(CompactState.layout(state, p).replace(b"\0", b""))
+                   for p in range(2))
+    while held() > cardsLeft and not CompactState.game_over(state)[0]:
+        moves = CompactState.legal_moves(state)
+        if moves:
+            CompactState.play_card_inplace(state, *rng.choice(moves))
+        else:
+            CompactState.flip_inplace(state)
+    return state, rng.randrange(2), rng
+
+def shuffle_decks(state, rng):
+    """
+    Returns
+    -------
+    : bytearray
+        A copy of state with the cards left in each deck shuffled, which looks
+        the same as state to anything that ignores what is in the decks
+    """
+    state = CompactState.clone(state)
+    layoutSize = CompactState.shape(state)[2]
+    for p in range(2):
+        base = CompactState.player_offset(state, p)
+        start = base + 1 + layoutSize + state[base]
+        cards = list(state[start:base + 1 + layoutSize + DECK_SIZE])
+        rng.shuffle(cards)
+        state[start:start + len(cards)] = bytes(cards)
+    return state
+
+def cross_check(seeds, cardsLeft=10, solver=None, variants=3):
+    """
+    Solves small positions with a single Solver, reusing its table across
+    positions, and compares every value with brute_force. Each seed gives a
+    position and copies of it with the decks reshuffled, so positions that
+    only differ in what is left in the decks meet in the table.
+
+    Parameters
+    ----------
+    seeds: list(int)
+        Seeds passed to small_position
+    cardsLeft: int
+        Size of the positions, see small_position
+    solver: Solver | None
+        The solver to check, a new one if None
+    variants: int
+        Reshuffled copies of each position to check too
+
+    Returns
+    -------
+    : int
+        The number of positions checked
+
+    Raises
+    ------
+    AssertionError
+        If the solver and brute_force ever disagree
+    """
+    solver = Solver() if solver is None else solver
+    checked = 0
+    for seed in seeds:
+        state, toMove, rng = small_position(seed, cardsLeft)
+        for variant in range(variants + 1):
+            if variant:
+                state = shuffle_decks(state, rng)
+            expected = brute_force(state, toMove)
+            value = solver.solve(state, toMove)["value"]
+            assert value == expected, \
+                f"seed {seed} variant {variant}: solver says {value}, " \
+                f"brute force {expected}"
+            checked += 1
+    return checked
+
+class Solver():
+    """
+    Minimax search with a bounded LRU transposition table
+    """
+    def __init__(self, tableSize=1_000_000, maxNodes=None):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        tableSize: int
+            Maximum number of positions kept in the transposition table
+        maxNodes: int | None
+            Give up after visiting this many positions. No limit if None.
+        """
+        self.__tableSize = tableSize
+        self.__maxNodes = maxNodes
+        self.__table = OrderedDict()
+        self.__nodes = 0
+        self.__hits = 0
+        self.__evictions = 0
+
+    def solve_game(self, gameState, toMove=0):
+        """
+        Solves a position taken from a live game
+
+        Parameters
+        ----------
+        gameState: ServerGameState
+            The position to solve
+        toMove: int
+            The player whose turn it is
+
+        Returns
+        -------
+        : dict{str -> any}
+            See solve
+        """
+        return self.solve(gameState.to_compact(), toMove)
+
+    def solve(self, state, toMove=0):
+        """
+        Finds the value of a position under optimal play by both players
+
+        Parameters
+        ----------
+        state: bytearray
+            A two player CompactState buffer
+        toMove: int
+            The player whose turn it is
+
+        Returns
+        -------
+        : dict{str -> any}
+            'value' (P0_WINS, DRAW, P1_WINS or None if the node budget ran
+            out) plus search statistics: 'nodes', 'seconds', 'nodesPerSec',
+            'tableHits', 'tableEntries', 'tableEvictions', 'tableBytes' and
+            'peakRssBytes'
+        """
+        if CompactState.shape(state)[0] != 2:
+            raise ValueError("The solver only handles two player games")
+
+        self.__nodes = 0
+        self.__hits = 0
+        self.__evictions = 0
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, 10_000))
+        start = time.perf_counter()
+        try:
+            value = self.__search(CompactState.clone(state), toMove)
+        except SearchAborted:
+            value = None
+        finally:
+            sys.setrecursionlimit(limit)
+        elapsed = time.perf_counter() - start
+
+        return {"value":          value,
+                "nodes":          self.__nodes,
+                "seconds":        elapsed,
+                "nodesPerSec":    self.__nodes / elapsed if elapsed else 0.0,
+                "tableHits":      self.__hits,
+                "tableEntries":   len(self.__table),
+                "tableEvictions": self.__evictions,
+                "tableBytes":     self.table_bytes(),
+                "peakRssBytes":   resource.getrusage(
+                                    resource.RUSAGE_SELF).ru_maxrss * 1024}
+
+    def table_bytes(self):
+        """
+        Estimates the memory held by the transposition table
+
+        Returns
+        -------
+        : int
+            Bytes used by the table, its keys and its values
+        """
+        if not self.__table:
+            return sys.getsizeof(self.__table)
+        sampleKey = next(iter(self.__table))
+        perEntry = sys.getsizeof(sampleKey) + sys.getsizeof(P0_WINS)
+        return sys.getsizeof(self.__table) + len(self.__table) * perEntry
+
+    def clear(self):
+        """
+        Empties the transposition table
+        """
+        self.__table.clear()
+
+    #*********************************************************************#
+    #                            The search itself                        #
+    #*********************************************************************#
+
+    def __lookup(self, key):
+        """
+        Returns
+        -------
+        : int | None
+            The stored value of a position or None if it is not stored
+        """
+        value = self.__table.get(key)
+        if value is not None:
+            self.__table.move_to_end(key)
+            self.__hits += 1
+        return value
+
+    def __store(self, key, value):
+        """
+        Stores the value of a position, evicting the least recently used
+        position if the table is full
+        """
+        self.__table[key] = value
+        if len(self.__table) > self.__tableSize:
+            self.__table.popitem(last=False)
+            self.__evictions += 1
+
+    def __search(self, state, toMove):
+        """
+        Returns
+        -------
+        : int
+            The minimax value of state with toMove to play
+        """
+        key = canonical_key(state, toMove)
+        value = self.__lookup(key)
+        if value is not None:
+            return value
+
+        self.__nodes += 1
+        if self.__maxNodes is not None and self.__nodes > self.__maxNodes:
+            raise SearchAborted()
+
+        over, winner = CompactState.game_over(state)
+        if over:
+            value = DRAW if winner is None else \
+                    (P0_WINS if winner == 0 else P1_WINS)
+        else:
+            value = self.__search_moves(state, toMove)
+
+        self.__store(key, value)
+        return value
+
+    def __search_moves(self, state, toMove):
+        """
+        Returns
+        -------
+        : int
+            The best value toMove can reach from a position that is not over
+        """
+        other = 1 - toMove
+        moves = CompactState.legal_moves(state, toMove)
+        if not moves:
+            if CompactState.legal_moves(state, other):
+                return self.__search(state, other) # Pass
+            child = CompactState.clone(state)
+            CompactState.flip_inplace(child)
+            return self.__search(child, toMove)
+
+        best = P1_WINS if toMove == 0 else P0_WINS
+        goal = P0_WINS if toMove == 0 else P1_WINS
+        seen = set()
+        for _, layoutIdx, pileIdx in moves:
+            child = CompactState.clone(state)
+            CompactState.play_card_inplace(child, toMove, layoutIdx, pileIdx)
+
+            # Plays that lead to equivalent positions only need one search
+            childKey = canonical_key(child, other)
+            if childKey in seen:
+                continue
+            seen.add(childKey)
+
+            value = self.__search(child, other)
+            if (toMove == 0 and value > best) or (toMove == 1 and value < best):
+                best = value
+            if best == goal:
+                break
+        return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a seeded Spit deal")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--advance", type=int, default=0,
+                        help="make this many random plays/flips first")
+    parser.add_argument("--table-size", type=int, default=1_000_000)
+    parser.add_argument("--max-nodes", type=int, default=None)
+    parser.add_argument("--cross-check", type=int, default=0, metavar="N",
+                        help="check N small positions against a plain "
+                             "minimax search")
+    parser.add_argument("--cards-left", type=int, default=10,
+                        help="size of the --cross-check positions")
+    args = parser.parse_args()
+
+    if args.cross_check:
+        start = time.perf_counter()
+        checked = cross_check(range(args.seed, args.seed + args.cross_check),
+                              args.cards_left,
+                              Solver(args.table_size, args.max_nodes))
+        print(f"{checked} positions match brute force "
+              f"({time.perf_counter() - start:.1f}s)")
+        return
+
+    from ServerGameState import ServerGameState
+    state = ServerGameState(seed=args.seed).to_compact()
+    rng = random.Random(args.seed)
+    for _ in range(args.advance):
+        if CompactState.game_over(state)[0]:
+            break
+        moves = CompactState.legal_moves(state)
+        if moves:
+            CompactState.play_card_inplace(state, *rng.choice(moves))
+        else:
+            CompactState.flip_inplace(state)
+
+    result = Solver(args.table_size, args.max_nodes).solve(state)
+    for k, v in result.items():
+        print(f"{k:>15}: {v}")
+
+if __name__ == "__main__":
+    main()
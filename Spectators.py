@@ -0,0 +1,493 @@
+"""
+File: Spectators.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    Lets people watch a room without taking a seat. Spectators connect to
+    their own port, served by a SpectatorHub on its own thread, so watchers
+    never touch the player sockets or the server's game loop.
+
+    The server only appends snapshots to the room's ring buffer (publish),
+    which is cheap and never blocks on a spectator. The hub thread releases
+    each snapshot once it is `delay` seconds old, serializes it once per
+    distinct set of interests and writes it to every spectator without
+    blocking. A spectator whose socket backs up, or that asked for updates
+    less often, skips straight to the newest snapshot instead of queueing
+    old ones.
+
+    Spectator -> hub messages:
+        ("watch", interval, fields)   interval: min seconds between updates
+                                      fields: subset of FIELDS
+    Hub -> spectator messages:
+        ("room-info", names, delay)
+        ("spectate", seq, {field: value})
+        ("odds", seq, estimate)        if "odds" is in the spectator's fields
+        ("game-stopped", reason, data)
+
+    Spectators are anonymous, so the hub frames what they send itself and
+    decodes it without letting it name any class or function. A message
+    longer than MAX_WATCH_MSG or that does not decode drops the spectator.
+
+    Run `python Spectators.py --watch HOST:PORT` to print a room's feed.
+"""
+import io
+import time
+import pickle
+import socket
+import argparse
+import selectors
+import threading
+from collections import deque
+import MessageBrokers
+
+FIELDS = ("midPiles", "layouts", "cardsLeft", "odds")
+
+# Longest the hub thread sleeps, bounds the lateness of a released frame
+MAX_SLEEP = 0.05 #s
+
+# Spectator messages are length prefixed like MessageBrokers.LenAndPayload
+WATCH_HEADER = 4
+MAX_WATCH_MSG = 1024 # bytes
+
+class _PlainUnpickler(pickle.Unpickler):
+    """
+    Unpickler that only builds plain data (str, numbers, tuples, lists...)
+    """
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"{module}.{name} is not allowed")
+
+def decode_watch(payload):
+    """
+    Decodes a message from a spectator
+
+    Parameters
+    ----------
+    payload: bytes
+        The message without its length header
+
+    Returns
+    -------
+    : any
+
+    Raises
+    ------
+    pickle.UnpicklingError
+        If the message is not plain data
+    """
+    try:
+        return _PlainUnpickler(io.BytesIO(payload)).load()
+    except pickle.UnpicklingError:
+        raise
+    except Exception as e:
+        raise pickle.UnpicklingError(str(e))
+
+class _Spectator():
+    """
+    Per connection bookkeeping for the hub
+    """
+    def __init__(self, sock):
+        self.sock = sock
+        self.out = bytearray()      # Bytes accepted but not yet sent
+        self.inbox = bytearray()    # Bytes received but not yet a message
+        self.interval = 0.0         # Min seconds between state updates
+        self.fields = frozenset(FIELDS)
+        self.lastSent = 0.0
+        self.pending = None         # Newest held back state frame
+        self.dropped = 0
+
+class SpectatorHub():
+    """
+    Delay buffered fan out of one room's public state to its spectators
+    """
+    def __init__(self, host, port, delay=2.0, ringSize=1024,
+                 maxSpectators=1000, maxBacklog=64 * 1024,
+                 winProbability=None,
+                 msgBroker=MessageBrokers.LenAndPayload()):
+        """
+        Constructor. The hub listens right away but serves nothing until
+        start() is called.
+
+        Parameters
+        ----------
+        host: str
+            Address to listen on
+        port: int
+            Port spectators connect to
+        delay: float
+            Seconds every frame is held before spectators see it
+        ringSize: int
+            Frames kept waiting for their delay, the oldest are dropped first
+        maxSpectators: int
+            Connections beyond this are turned away
+        maxBacklog: int
+            Bytes a spectator may have unsent before its state updates are
+            dropped
+        winProbability: WinProbabilityService | None
+            If given, spectators also get win probabilities. Estimates are
+            requested from the hub thread, one at a time, for the newest
+            state that has a snapshot.
+        msgBroker: MessageBrokers.LenAndPayload
+            Wire format of what is sent to spectators, must provide pack
+        """
+        self.__delay = delay
+        self.__maxSpectators = maxSpectators
+        self.__maxBacklog = maxBacklog
+        self.__msgBroker = msgBroker
+
+        # Shared with the publishing thread
+        self.__lock = threading.Lock()
+        # (time, message head, body, droppable) where body is the state
+        # dict to filter by interest, the one field the message belongs to,
+        # or None for messages every spectator gets
+        self.__ring = deque(maxlen=ringSize)
+        self.__roomInfo = ("room-info", [], delay)
+        self.__seq = 0
+
+        self.__winProbability = winProbability
+        self.__oddsWanted = None  # (seq, time, CompactState snapshot)
+        self.__oddsInFlight = False
+
+        self.__spectators = {}
+        self.__selector = selectors.DefaultSelector()
+        self.__sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.__sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.__sock.bind((host, port))
+        self.__sock.listen(64)
+        self.__sock.setblocking(False)
+        self.__selector.register(self.__sock, selectors.EVENT_READ)
+
+        self.__keepGoing = True
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+
+    def start(self):
+        self.__thread.start()
+
+    def stop(self, drain=True):
+        """
+        Stops the hub and disconnects every spectator
+
+        Parameters
+        ----------
+        drain: bool
+            Wait until the frames already published have been released
+        """
+        if drain and self.__thread.is_alive():
+            deadline = time.monotonic() + self.__delay + 1.0
+            while time.monotonic() < deadline:
+                with self.__lock:
+                    if not self.__ring:
+                        break
+                time.sleep(MAX_SLEEP)
+        self.__keepGoing = False
+        if self.__thread.is_alive():
+            self.__thread.join()
+        for spectator in list(self.__spectators.values()):
+            self.__remove(spectator)
+        self.__selector.close()
+        self.__sock.close()
+
+    def num_spectators(self):
+        return len(self.__spectators)
+
+    #*********************************************************************#
+    #                 Publishing, called from the server                  #
+    #*********************************************************************#
+
+    def set_names(self, names):
+        """
+        Sets the player names sent to spectators when they join
+        """
+        with self.__lock:
+            self.__roomInfo = ("room-info", list(names), self.__delay)
+
+    def wants_odds(self):
+        """
+        Returns
+        -------
+        : bool
+            True if publish_state should be given a compact snapshot
+        """
+        return self.__winProbability is not None
+
+    def publish_state(self, layouts, cardsLeft, midPiles, compact=None):
+        """
+        Queues a snapshot of the room. The arguments are kept by reference
+        and must not be changed afterwards.
+
+        Parameters
+        ----------
+        layouts: list(list(Card))
+            Every player's layout
+        cardsLeft: list(int)
+            Every player's deck size
+        midPiles: list(Card)
+            The top of each mid pile
+        compact: bytearray | None
+            CompactState snapshot of the game, needed for win probabilities
+
+        Returns
+        -------
+        : tuple(int, float)
+            Sequence number and time of the snapshot, for publish_odds
+        """
+        now = time.monotonic()
+        with self.__lock:
+            self.__seq += 1
+            frame = {"midPiles": midPiles, "layouts": layouts,
+                     "cardsLeft": cardsLeft}
+            self.__ring.append((now, ("spectate", self.__seq), frame, True))
+            if compact is not None and self.__winProbability is not None:
+                self.__oddsWanted = (self.__seq, now, compact)
+            return self.__seq, now
+
+    def publish_odds(self, seq, stamp, estimate):
+        """
+        Queues win probabilities for the snapshot seq. Safe to call from any
+        thread.
+
+        Parameters
+        ----------
+        seq: int
+            Sequence number returned by publish_state
+        stamp: float
+            Time returned by publish_state, so the odds are not shown before
+            the state they describe
+        estimate: dict
+            From WinProbabilityService
+        """
+        with self.__lock:
+            self.__ring.append((stamp, ("odds", seq, estimate), "odds", True))
+
+    def publish_end(self, reason, data=None):
+        """
+        Queues the end of the game. Never dropped.
+        """
+        with self.__lock:
+            self.__ring.append((time.monotonic(),
+                                ("game-stopped", reason, data), None, False))
+
+    #*********************************************************************#
+    #                    The hub thread and its helpers                   #
+    #*********************************************************************#
+
+    def __run(self):
+        while self.__keepGoing:
+            for key, mask in self.__selector.select(self.__sleep_time()):
+                if key.fileobj is self.__sock:
+                    self.__accept()
+                    continue
+                spectator = key.data
+                if mask & selectors.EVENT_READ:
+                    self.__receive(spectator)
+                if mask & selectors.EVENT_WRITE and \
+                   spectator.sock.fileno() != -1:
+                    self.__flush(spectator)
+            self.__request_odds()
+            self.__release()
+            self.__send_held()
+
+    def __sleep_time(self):
+        """
+        Returns
+        -------
+        : float
+            Seconds until the next frame or held update is due, capped
+        """
+        now = time.monotonic()
+        wake = now + MAX_SLEEP
+        with self.__lock:
+            if self.__ring:
+                wake = min(wake, self.__ring[0][0] + self.__delay)
+        for s in self.__spectators.values():
+            if s.pending is not None:
+                wake = min(wake, s.lastSent + s.interval)
+        return max(0.0, wake - now)
+
+    def __request_odds(self):
+        """
+        Asks for win probabilities of the newest snapshot, unless an
+        estimate is still running. Snapshots published meanwhile are skipped.
+        """
+        with self.__lock:
+            if self.__oddsInFlight or self.__oddsWanted is None:
+                return
+            seq, stamp, compact = self.__oddsWanted
+            self.__oddsWanted = None
+            self.__oddsInFlight = True
+
+        def done(future):
+            with self.__lock:
+                self.__oddsInFlight = False
+            if future.exception() is None:
+                self.publish_odds(seq, stamp, future.result())
+
+        self.__winProbability.estimate_compact_async(compact) \
+                             .add_done_callback(done)
+
+    def __accept(self):
+        try:
+            sock, _ = self.__sock.accept()
+        except BlockingIOError:
+            return
+        if len(self.__spectators) >= self.__maxSpectators:
+            sock.close()
+            return
+        sock.setblocking(False)
+        spectator = _Spectator(sock)
+        self.__spectators[sock] = spectator
+        self.__selector.register(sock, selectors.EVENT_READ, spectator)
+        with self.__lock:
+            info = self.__roomInfo
+        self.__queue(spectator, self.__msgBroker.pack(info))
+
+    def __receive(self, spectator):
+        """
+        Reads what a spectator sent and acts on every whole message in it.
+        A message may arrive over several reads, the rest waits in inbox.
+        """
+        try:
+            data = spectator.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self.__remove(spectator)
+            return
+        spectator.inbox += data
+
+        while len(spectator.inbox) >= WATCH_HEADER:
+            size = int.from_bytes(spectator.inbox[:WATCH_HEADER], 'big')
+            if size > MAX_WATCH_MSG:
+                self.__remove(spectator)
+                return
+            end = WATCH_HEADER + size
+            if len(spectator.inbox) < end:
+                return
+            payload = bytes(spectator.inbox[WATCH_HEADER:end])
+            del spectator.inbox[:end]
+            try:
+                msg = decode_watch(payload)
+            except pickle.UnpicklingError:
+                self.__remove(spectator)
+                return
+            match msg:
+                case ("watch", int() | float() as interval, 
+                      list() | tuple() as fields):
+                    spectator.interval = max(0.0, float(interval))
+                    spectator.fields = frozenset(f for f in fields 
+                                                 if f in FIELDS)
+                case _:
+                    pass
+
+    def __release(self):
+        """
+        Sends every frame whose delay has passed. Each frame is serialized
+        once per distinct set of fields the spectators asked for.
+        """
+        due = []
+        now = time.monotonic()
+        with self.__lock:
+            while self.__ring and self.__ring[0][0] + self.__delay <= now:
+                due.append(self.__ring.popleft())
+
+        for _, head, body, droppable in due:
+            packed = {}
+            for spectator in list(self.__spectators.values()):
+                if isinstance(body, dict):
+                    wanted = spectator.fields & body.keys()
+                    if not wanted:
+                        continue
+                    key = frozenset(wanted)
+                    if key not in packed:
+                        packed[key] = self.__msgBroker.pack(
+                            head + ({f: body[f] for f in key},))
+                elif body is None or body in spectator.fields:
+                    key = body
+                    if key not in packed:
+                        packed[key] = self.__msgBroker.pack(head)
+                else:
+                    continue
+                self.__offer(spectator, packed[key], droppable, now)
+
+    def __offer(self, spectator, data, droppable, now):
+        """
+        Sends data to a spectator, or holds it back if the spectator is
+        behind or rate limited. Only the newest held frame is kept.
+        """
+        if droppable and (len(spectator.out) > self.__maxBacklog or
+                          now < spectator.lastSent + spectator.interval):
+            if spectator.pending is not None:
+                spectator.dropped += 1
+            spectator.pending = data
+            return
+        spectator.lastSent = now
+        self.__queue(spectator, data)
+
+    def __send_held(self):
+        now = time.monotonic()
+        for spectator in list(self.__spectators.values()):
+            if spectator.pending is not None and \
+               len(spectator.out) <= self.__maxBacklog and \
+               now >= spectator.lastSent + spectator.interval:
+                data, spectator.pending = spectator.pending, None
+                spectator.lastSent = now
+                self.__queue(spectator, data)
+
+    def __queue(self, spectator, data):
+        spectator.out += data
+        self.__flush(spectator)
+
+    def __flush(self, spectator):
+        """
+        Writes as much of a spectator's backlog as the socket takes without
+        blocking, and asks to be told when it can take more
+        """
+        try:
+            sent = spectator.sock.send(spectator.out)
+            del spectator.out[:sent]
+        except BlockingIOError:
+            pass
+        except OSError:
+            self.__remove(spectator)
+            return
+        events = selectors.EVENT_READ
+        if spectator.out:
+            events |= selectors.EVENT_WRITE
+        self.__selector.modify(spectator.sock, events, spectator)
+
+    def __remove(self, spectator):
+        if spectator.sock in self.__spectators:
+            del self.__spectators[spectator.sock]
+            self.__selector.unregister(spectator.sock)
+        spectator.sock.close()
+
+def watch(host, port, interval=0.0, fields=FIELDS):
+    """
+    Connects to a hub and prints the feed until the game ends
+    """
+    broker = MessageBrokers.LenAndPayload()
+    sock = socket.create_connection((host, port))
+    broker.tx(sock, ("watch", interval, list(fields)))
+    while True:
+        msg = broker.rx(sock)
+        if msg is None:
+            break
+        print(msg)
+        if msg[0] == "game-stopped":
+            break
+    sock.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a Spit room")
+    parser.add_argument("--watch", required=True, metavar="HOST:PORT")
+    parser.add_argument("--interval", type=float, default=0.0)
+    parser.add_argument("--fields", nargs="+", choices=FIELDS, default=FIELDS)
+    args = parser.parse_args()
+    host, port = args.watch.rsplit(":", 1)
+    watch(host, int(port), args.interval, args.fields)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+File: StateBoard.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    Publishes a room's public game state into a memory-mapped file so tools
+    on the same host (analytics, overlays, admin) can watch a game without
+    connecting as a client. The server is the only writer and never waits on
+    readers; any number of reader processes can poll the board.
+
+    The board is protected by a seqlock: the writer bumps the sequence number
+    to an odd value, writes the body, then bumps it to the next even value. A
+    reader copies the body and keeps the copy only if the sequence number was
+    the same even value before and after, otherwise it tries again.
+
+    File layout (little endian):
+        header: magic (8s) version (H) numPlayers (B) numGamePiles (B)
+                layoutSize (B) padding (3x)
+        seq:    sequence number (Q)
+        body:   updates (Q) wall time (d) server status (B) winner (b, -1
+                for none) pile tops (numGamePiles * B) then per player deck
+                size (B) and layout (layoutSize * B)
+
+    Cards are stored as CompactState card codes, 0 for an empty slot.
+"""
+import os
+import mmap
+import time
+import struct
+import argparse
+import CompactState
+
+MAGIC = b"SPITBORD"
+VERSION = 1
+
+HEADER = struct.Struct("<8sHBBB3x")
+SEQ = struct.Struct("<Q")
+BODY = struct.Struct("<QdBb")
+
+SEQ_OFFSET = HEADER.size
+BODY_OFFSET = SEQ_OFFSET + SEQ.size
+
+class BoardBusy(Exception):
+    """
+    Raised by StateBoardReader.read when the writer kept the board busy for
+    every attempt
+    """
+    pass
+
+def board_size(numPlayers, numGamePiles, layoutSize):
+    """
+    Returns
+    -------
+    : int
+        Bytes needed by a board for this shape of game
+    """
+    return BODY_OFFSET + BODY.size + numGamePiles + \
+           numPlayers * (1 + layoutSize)
+
+class StateBoardWriter():
+    """
+    The server's side of a board. Only one writer may use a board at a time.
+    """
+    def __init__(self, path, numPlayers, numGamePiles, layoutSize):
+        """
+        Constructor. Creates or overwrites the board file.
+
+        Parameters
+        ----------
+        path: str
+            File to map, /dev/shm keeps it in memory on Linux
+        numPlayers: int
+        numGamePiles: int
+        layoutSize: int
+            Shape of the game
+        """
+        self.__shape = (numPlayers, numGamePiles, layoutSize)
+        size = board_size(*self.__shape)
+        self.__file = open(path, "w+b")
+        self.__file.truncate(size)
+        self.__map = mmap.mmap(self.__file.fileno(), size)
+        HEADER.pack_into(self.__map, 0, MAGIC, VERSION, *self.__shape)
+        self.__seq = 0
+        self.__updates = 0
+        self.__body = bytearray(size - BODY_OFFSET)
+        SEQ.pack_into(self.__map, SEQ_OFFSET, self.__seq)
+        BODY.pack_into(self.__map, BODY_OFFSET, 0, 0.0, 0, -1)
+
+    def close(self):
+        self.__map.close()
+        self.__file.close()
+
+    def write(self, layouts, cardsLeft, midPiles, status=0, winner=None):
+        """
+        Publishes the state. Readers never see a half written state.
+
+        Parameters
+        ----------
+        layouts: list(list(Card))
+            Every player's layout
+        cardsLeft: list(int)
+            Every player's deck size
+        midPiles: list(Card)
+            The top of each mid pile
+        status: int
+            The server's status, e.g. Server.ServerStatus.RUNNING.value
+        winner: int | None
+            Index of the winning player once there is one
+        """
+        numPlayers, numGamePiles, layoutSize = self.__shape
+        self.__updates += 1
+        body = self.__body
+        BODY.pack_into(body, 0, self.__updates, time.time(), status,
+                       -1 if winner is None else winner)
+        i = BODY.size
+        for card in midPiles:
+            body[i] = CompactState.encode_card(card)
+            i += 1
+        for p in range(numPlayers):
+            body[i] = cardsLeft[p]
+            for j, card in enumerate(layouts[p]):
+                body[i + 1 + j] = CompactState.encode_card(card)
+            i += 1 + layoutSize
+
+        # Odd while writing so readers know to retry
+        self.__seq += 1
+        SEQ.pack_into(self.__map, SEQ_OFFSET, self.__seq)
+        self.__map[BODY_OFFSET:] = body
+        self.__seq += 1
+        SEQ.pack_into(self.__map, SEQ_OFFSET, self.__seq)
+
+class StateBoardReader():
+    """
+    A read only view of a board. Reading never blocks the writer.
+    """
+    def __init__(self, path):
+        """
+        Constructor
+
+        Raises
+        ------
+        ValueError
+            If the file is not a state board
+        """
+        self.__file = open(path, "rb")
+        self.__map = mmap.mmap(self.__file.fileno(), 0,
+                               access=mmap.ACCESS_READ)
+        magic, version, *shape = HEADER.unpack_from(self.__map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} state board")
+        self.__shape = tuple(shape)
+
+    def close(self):
+        self.__map.close()
+        self.__file.close()
+
+    def shape(self):
+        """
+        Returns
+        -------
+        : tuple(int, int, int)
+            numPlayers, numGamePiles and layoutSize
+        """
+        return self.__shape
+
+    def sequence(self):
+        """
+        Returns
+        -------
+        : int
+            The current sequence number, cheap way to poll for changes
+        """
+        return SEQ.unpack_from(self.__map, SEQ_OFFSET)[0]
+
+    def read(self, attempts=1000):
+        """
+        Takes a consistent copy of the board
+
+        Parameters
+        ----------
+        attempts: int
+            Copies to try before giving up
+
+        Returns
+        -------
+        : dict{str -> any}
+            'seq', 'updates', 'time', 'status', 'winner' (None if none),
+            'midPiles' and per player 'layouts' (card codes, 0 for empty)
+            and 'cardsLeft'
+
+        Raises
+        ------
+        BoardBusy
+            If every attempt overlapped a write
+        """
+        for _ in range(attempts):
+            before = self.sequence()
+            if before % 2:
+                continue
+            body = self.__map[BODY_OFFSET:]
+            if self.sequence() == before:
+                return self.__parse(before, body)
+        raise BoardBusy()
+
+    def __parse(self, seq, body):
+        numPlayers, numGamePiles, layoutSize = self.__shape
+        updates, stamp, status, winner = BODY.unpack_from(body, 0)
+        i = BODY.size
+        piles = list(body[i:i + numGamePiles])
+        i += numGamePiles
+        layouts = []
+        cardsLeft = []
+        for _ in range(numPlayers):
+            cardsLeft.append(body[i])
+            layouts.append(list(body[i + 1:i + 1 + layoutSize]))
+            i += 1 + layoutSize
+        return {"seq":       seq,
+                "updates":   updates,
+                "time":      stamp,
+                "status":    status,
+                "winner":    None if winner < 0 else winner,
+                "midPiles":  piles,
+                "layouts":   layouts,
+                "cardsLeft": cardsLeft}
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a room's state board")
+    parser.add_argument("path")
+    parser.add_argument("--interval", type=float, default=0.1,
+                        help="seconds between polls")
+    args = parser.parse_args()
+
+    board = StateBoardReader(args.path)
+    lastSeq = None
+    try:
+        while os.path.exists(args.path):
+            if board.sequence() != lastSeq:
+                state = board.read()
+                lastSeq = state["seq"]
+                print(state)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    board.close()
+
+if __name__ == "__main__":
+    main()
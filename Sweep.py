@@ -0,0 +1,279 @@
+"""
+File: Sweep.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    Measures how the rule parameters (numPlayers, numGamePiles, layoutSize)
+    change game length and fairness. Every configuration on a grid is
+    first validated by replaying seeded games against ServerGameState
+    (BatchSim.cross_check), then simulated with BatchSim in batches until
+    its statistics converge or a game budget runs out. Configurations run in
+    parallel across a process pool and each one becomes a row of a CSV file.
+
+    Rates get Wilson score intervals and mean lengths get normal intervals.
+    A configuration has converged once every interval is narrower than the
+    requested tolerance.
+"""
+import csv
+import math
+import time
+import argparse
+import itertools
+import multiprocessing
+import numpy as np
+from CompactState import DECK_SIZE
+from BatchSim import BatchSim, POLICIES, DRAW, UNFINISHED, cross_check
+
+Z_95 = 1.959964
+
+COLUMNS = ["players", "piles", "layout", "status", "games",
+           "seat0Win", "seat0WinLo", "seat0WinHi", "seatGap",
+           "drawRate", "drawLo", "drawHi", "unfinished",
+           "meanPlays", "playsHalfWidth", "meanFlips", "flipsHalfWidth",
+           "seconds"]
+
+def wilson_interval(successes, n, z=Z_95):
+    """
+    Wilson score interval for a binomial proportion
+
+    Returns
+    -------
+    : tuple(float, float)
+        Lower and upper bound, (0, 1) if n is 0
+    """
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+def mean_half_width(total, totalSquares, n, z=Z_95):
+    """
+    Returns
+    -------
+    : tuple(float, float)
+        Mean and the half width of its normal confidence interval
+    """
+    if n < 2:
+        return (total / n if n else 0.0), math.inf
+    mean = total / n
+    var = max(0.0, (totalSquares - n * mean * mean) / (n - 1))
+    return mean, z * math.sqrt(var / n)
+
+def check_configuration(numPlayers, numGamePiles, layoutSize):
+    """
+    Checks the parameters against limits of the engine
+
+    Returns
+    -------
+    : str | None
+        Why the configuration can not be played, None if it can
+    """
+    if numPlayers < 1:
+        return "need at least one player"
+    if layoutSize < 1 or layoutSize > DECK_SIZE:
+        return f"layoutSize must be between 1 and {DECK_SIZE}"
+    if numGamePiles < numPlayers:
+        # Every player flips onto the pile with their own index
+        return "numGamePiles must be at least numPlayers"
+    if layoutSize + math.ceil(numGamePiles / numPlayers) > DECK_SIZE:
+        # Seat 0 deals its layout and then a card to every numPlayers-th pile
+        return "layoutSize and the piles seat 0 deals must fit in one deck"
+    return None
+
+def sweep_configuration(job):
+    """
+    Validates and simulates one configuration. Runs in a worker process.
+    A configuration that fails while it runs gets an error status rather than
+    stopping the sweep.
+
+    Parameters
+    ----------
+    job: tuple
+        (numPlayers, numGamePiles, layoutSize, settings) where settings is a
+        dict of the keyword arguments of run_sweep
+
+    Returns
+    -------
+    : dict{str -> any}
+        One row of the results table, see COLUMNS
+    """
+    numPlayers, numGamePiles, layoutSize, settings = job
+    start = time.perf_counter()
+    row = {"players": numPlayers, "piles": numGamePiles, "layout": layoutSize,
+           "status": "ok", "games": 0}
+    try:
+        _simulate(row, numPlayers, numGamePiles, layoutSize, settings)
+    except Exception as err:
+        row["status"] = f"error: {type(err).__name__}: {err}"
+    row["seconds"] = round(time.perf_counter() - start, 3)
+    return row
+
+def _simulate(row, numPlayers, numGamePiles, layoutSize, settings):
+    """
+    Fills in row for sweep_configuration
+
+    Effects
+    -------
+    Sets the status and, if the configuration could be played, the
+    statistics of row
+    """
+    reason = check_configuration(numPlayers, numGamePiles, layoutSize)
+    if reason is None and settings["validateGames"]:
+        seeds = range(settings["seed"],
+                      settings["seed"] + settings["validateGames"])
+        try:
+            cross_check(seeds, POLICIES[settings["policy"]], numPlayers,
+                        numGamePiles, layoutSize)
+        except (AssertionError, IndexError, ValueError) as err:
+            reason = f"engine mismatch: {err}"
+    if reason is not None:
+        row["status"] = f"invalid: {reason}"
+        return
+
+    seedSeq = np.random.SeedSequence([settings["seed"], numPlayers,
+                                      numGamePiles, layoutSize])
+    policy = POLICIES[settings["policy"]]
+    tol = settings["tolerance"]
+    n = 0
+    seatWins = np.zeros(numPlayers, dtype=np.int64)
+    draws = unfinished = 0
+    plays = playsSq = flips = flipsSq = 0.0
+    converged = False
+    while n < settings["maxGames"] and not converged:
+        childSeed = seedSeq.spawn(1)[0]
+        size = min(settings["batch"], settings["maxGames"] - n)
+        results = BatchSim.deal(size, numPlayers, numGamePiles, layoutSize,
+                                seed=childSeed).run(policy, seed=childSeed)
+        winner = results["winner"]
+        seatWins += np.bincount(winner[winner >= 0], minlength=numPlayers)
+        draws += int(np.sum(winner == DRAW))
+        unfinished += int(np.sum(winner == UNFINISHED))
+        gamePlays = results["plays"].astype(np.float64)
+        gameFlips = results["flips"].astype(np.float64)
+        plays += gamePlays.sum()
+        playsSq += (gamePlays ** 2).sum()
+        flips += gameFlips.sum()
+        flipsSq += (gameFlips ** 2).sum()
+        n += size
+
+        seatLo, seatHi = wilson_interval(int(seatWins[0]), n)
+        drawLo, drawHi = wilson_interval(draws, n)
+        meanPlays, playsHalf = mean_half_width(plays, playsSq, n)
+        meanFlips, flipsHalf = mean_half_width(flips, flipsSq, n)
+        converged = n >= settings["minGames"] and \
+                    (seatHi - seatLo) / 2 <= tol and \
+                    (drawHi - drawLo) / 2 <= tol and \
+                    playsHalf <= tol * max(meanPlays, 1.0) and \
+                    flipsHalf <= tol * max(meanFlips, 1.0)
+
+    rates = seatWins / n
+    row.update({"status":         "ok" if converged else "budget",
+                "games":          n,
+                "seat0Win":       round(float(rates[0]), 4),
+                "seat0WinLo":     round(seatLo, 4),
+                "seat0WinHi":     round(seatHi, 4),
+                "seatGap":        round(float(rates.max() - rates.min()), 4),
+                "drawRate":       round(draws / n, 4),
+                "drawLo":         round(drawLo, 4),
+                "drawHi":         round(drawHi, 4),
+                "unfinished":     unfinished,
+                "meanPlays":      round(meanPlays, 3),
+                "playsHalfWidth": round(playsHalf, 3),
+                "meanFlips":      round(meanFlips, 3),
+                "flipsHalfWidth": round(flipsHalf, 3)})
+
+def run_sweep(players, piles, layouts, resultsPath, workers=None, seed=0,
+              policy="random", batch=20_000, minGames=20_000,
+              maxGames=1_000_000, tolerance=0.005, validateGames=50):
+    """
+    Sweeps every combination of the given parameters
+
+    Parameters
+    ----------
+    players, piles, layouts: list(int)
+        Values of numPlayers, numGamePiles and layoutSize to combine
+    resultsPath: str
+        CSV file to write, one row per configuration
+    workers: int | None
+        Number of worker processes, defaults to the number of CPUs
+    seed: int
+        Base seed for validation and simulation
+    policy: str
+        BatchSim policy used by every seat
+    batch: int
+        Games simulated between convergence checks
+    minGames, maxGames: int
+        Bounds on the games simulated per configuration
+    tolerance: float
+        Largest accepted half width, absolute for rates and relative for
+        mean lengths
+    validateGames: int
+        Seeded games cross checked against ServerGameState first, 0 skips
+        validation
+
+    Returns
+    -------
+    : list(dict{str -> any})
+        The rows written, in grid order
+    """
+    settings = {"seed": seed, "policy": policy, "batch": batch,
+                "minGames": minGames, "maxGames": maxGames,
+                "tolerance": tolerance, "validateGames": validateGames}
+    jobs = [(p, g, l, settings)
+            for p, g, l in itertools.product(players, piles, layouts)]
+
+    rows = []
+    with multiprocessing.Pool(workers) as pool, \
+         open(resultsPath, "w", newline="") as results:
+        writer = csv.DictWriter(results, COLUMNS, restval="")
+        writer.writeheader()
+        for row in pool.imap_unordered(sweep_configuration, jobs):
+            writer.writerow(row)
+            results.flush()
+            rows.append(row)
+    rows.sort(key=lambda r: (r["players"], r["piles"], r["layout"]))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep Spit rule parameters")
+    parser.add_argument("--players", type=int, nargs="+", default=[2])
+    parser.add_argument("--piles", type=int, nargs="+", default=[2, 3, 4])
+    parser.add_argument("--layouts", type=int, nargs="+",
+                        default=[3, 4, 5, 6])
+    parser.add_argument("--out", default="sweep.csv")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", choices=POLICIES, default="random")
+    parser.add_argument("--batch", type=int, default=20_000)
+    parser.add_argument("--min-games", type=int, default=20_000)
+    parser.add_argument("--max-games", type=int, default=1_000_000)
+    parser.add_argument("--tolerance", type=float, default=0.005)
+    parser.add_argument("--validate", type=int, default=50,
+                        help="games cross checked per configuration")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = run_sweep(args.players, args.piles, args.layouts, args.out,
+                     args.workers, args.seed, args.policy, args.batch,
+                     args.min_games, args.max_games, args.tolerance,
+                     args.validate)
+    for row in rows:
+        if row["status"].startswith(("invalid", "error")):
+            print(f"{row['players']}p {row['piles']} piles "
+                  f"layout {row['layout']}: {row['status']}")
+        else:
+            print(f"{row['players']}p {row['piles']} piles "
+                  f"layout {row['layout']}: seat 0 wins {row['seat0Win']:.3f} "
+                  f"[{row['seat0WinLo']:.3f}, {row['seat0WinHi']:.3f}] "
+                  f"draws {row['drawRate']:.3f} plays {row['meanPlays']:.1f} "
+                  f"flips {row['meanFlips']:.1f} "
+                  f"({row['games']} games, {row['status']})")
+    print(f"Wrote {args.out} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
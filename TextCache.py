@@ -0,0 +1,72 @@
+"""
+File: TextCache.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    Shared fonts and rendered text for the client. Looking up a system font
+    and rendering text are slow enough to show up in a frame, so each font
+    is created once per size and each piece of text is rendered once per
+    (text, size, colour) and kept in an LRU cache.
+
+    Rendered surfaces are shared between everyone who asks for the same
+    text, so callers must not draw on them or change their alpha.
+"""
+import pygame
+from functools import lru_cache
+
+TEXT_CACHE_SIZE = 256
+
+def get_font(size):
+    """
+    Returns
+    -------
+    : pygame.font.Font
+        The default system font at this size
+    """
+    _ensure_init()
+    return _font(size)
+
+def render_text(text, size, color=(0, 0, 0)):
+    """
+    Renders anti-aliased text in the default font
+
+    Parameters
+    ----------
+    text: str
+        The text to render
+    size: int
+        Font size
+    color: tuple(int, int, int) | tuple(int, int, int, int)
+        RGB(A) colour of the text
+
+    Returns
+    -------
+    : pygame.Surface
+        The rendered text, shared with other callers
+    """
+    _ensure_init()
+    return _render(text, size, tuple(color))
+
+def clear():
+    """
+    Drops every cached font and surface
+    """
+    _font.cache_clear()
+    _render.cache_clear()
+
+def _ensure_init():
+    # Fonts die with pygame.quit, start over if pygame was restarted
+    if not pygame.font.get_init():
+        pygame.font.init()
+        clear()
+
+@lru_cache(maxsize=None)
+def _font(size):
+    return pygame.font.SysFont(None, size)
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _render(text, size, color):
+    # True = anti-aliasing
+    return _font(size).render(text, True, color)
@@ -0,0 +1,344 @@
+"""
+File: Tournament.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    Runs round robin or Swiss tournaments between policies from Policies.py.
+    Games are played headless with SelfPlay.play_game across a process pool.
+
+    Only running totals are kept: standings (points and Elo ratings) and a
+    head-to-head table are updated as each game finishes, so memory does not
+    grow with the number of games. Progress is checkpointed to a JSON file,
+    and a tournament that was killed picks up where it left off when run
+    again with the same checkpoint.
+
+    Elo ratings depend on the order games finish in, which varies between
+    runs. Points and head-to-head records do not.
+"""
+import os
+import json
+import time
+import argparse
+import itertools
+import multiprocessing
+from SelfPlay import play_job
+
+ROUND_ROBIN = "round-robin"
+SWISS       = "swiss"
+FORMATS     = (ROUND_ROBIN, SWISS)
+
+START_ELO = 1500.0
+ELO_K     = 16.0
+
+class Tournament():
+    """
+    A tournament between policies, resumable from a checkpoint file
+    """
+    def __init__(self, entrants, fmt=ROUND_ROBIN, gamesPerMatch=10, rounds=None,
+                 seed=0, checkpointPath=None, checkpointEvery=200):
+        """
+        Constructor. If checkpointPath exists the tournament is loaded from it
+        and the other settings must match the ones it was started with.
+
+        Parameters
+        ----------
+        entrants: list(str)
+            Policy names, see Policies.make_policy. Each must be unique.
+        fmt: str
+            ROUND_ROBIN: every pair of entrants plays one match.
+            SWISS: each round pairs entrants with similar scores. With an odd
+            number of entrants one sits out each round and is given the
+            points of a match won.
+        gamesPerMatch: int
+            Games in each match, the entrants swap seats every game
+        rounds: int | None
+            Number of Swiss rounds, defaults to ceil(log2(len(entrants)))
+        seed: int
+            Game i is dealt with seed + i
+        checkpointPath: str | None
+            File progress is saved to. Nothing is saved if None.
+        checkpointEvery: int
+            Games between checkpoints, one is also written after every round
+        """
+        if len(set(entrants)) != len(entrants) or len(entrants) < 2:
+            raise ValueError("Need at least two distinct entrants")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt}")
+
+        if fmt == ROUND_ROBIN:
+            rounds = 1
+        elif rounds is None:
+            rounds = max(1, (len(entrants) - 1).bit_length())
+
+        self.__checkpointPath = checkpointPath
+        self.__checkpointEvery = checkpointEvery
+        self.__config = {"entrants":      list(entrants),
+                         "format":        fmt,
+                         "gamesPerMatch": gamesPerMatch,
+                         "rounds":        rounds,
+                         "seed":          seed}
+
+        if checkpointPath is not None and os.path.exists(checkpointPath):
+            self.__load()
+        else:
+            self.__round = 0        # Round being played
+            self.__nextGameId = 0   # Id of the first game of the round
+            self.__pairings = None  # Matches of the current round
+            self.__done = []        # Game ids finished in the current round
+            self.__standings = {e: {"games":  0, "wins": 0, "losses": 0,
+                                    "draws":  0, "points": 0.0,
+                                    "elo":    START_ELO, "byes": 0}
+                                for e in entrants}
+            self.__headToHead = {}  # "a|b" -> [a wins, b wins, draws]
+            self.__gamesPlayed = 0
+            self.__playSeconds = 0.0
+
+    #*********************************************************************#
+    #                              Running                                #
+    #*********************************************************************#
+
+    def run(self, workers=None):
+        """
+        Plays every remaining game of the tournament
+
+        Parameters
+        ----------
+        workers: int | None
+            Number of worker processes, defaults to the number of CPUs
+
+        Returns
+        -------
+        : dict{str -> any}
+            See report()
+        """
+        workers = workers or os.cpu_count()
+        start = time.perf_counter()
+        playedNow = 0
+        with multiprocessing.Pool(workers) as pool:
+            while self.__round < self.__config["rounds"]:
+                if self.__pairings is None:
+                    self.__pairings = self.__pair_round()
+                    self.__done = []
+
+                done = set(self.__done)
+                jobs = [job for job in self.__round_jobs()
+                        if job[0] not in done]
+                for stats in pool.imap_unordered(play_job, jobs,
+                                                 chunksize=8):
+                    self.__record(stats)
+                    self.__done.append(stats["game"])
+                    playedNow += 1
+                    if playedNow % self.__checkpointEvery == 0:
+                        self.__save()
+
+                self.__nextGameId += len(self.__round_jobs())
+                self.__round += 1
+                self.__pairings = None
+                self.__done = []
+                self.__save()
+
+        elapsed = time.perf_counter() - start
+        return self.report(playedNow, elapsed, workers)
+
+    def __pair_round(self):
+        """
+        Picks the matches of the next round
+
+        Returns
+        -------
+        : list(list(str))
+            One [entrant, entrant] pair per match
+        """
+        entrants = self.__config["entrants"]
+        if self.__config["format"] == ROUND_ROBIN:
+            return [list(p) for p in itertools.combinations(entrants, 2)]
+
+        # Swiss: leaders play each other, avoiding rematches when possible
+        ranked = sorted(entrants, key=lambda e: (-self.__standings[e]["points"],
+                                                 -self.__standings[e]["elo"],
+                                                 entrants.index(e)))
+        if len(ranked) % 2:
+            # The lowest ranked entrant that has not had a bye sits out. A
+            # bye scores as a match won, a point for each of its games.
+            bye = next((e for e in reversed(ranked)
+                        if self.__standings[e]["byes"] == 0), ranked[-1])
+            self.__standings[bye]["byes"] += 1
+            self.__standings[bye]["points"] += self.__config["gamesPerMatch"]
+            ranked.remove(bye)
+
+        pairings = []
+        while ranked:
+            first = ranked.pop(0)
+            opponent = next((e for e in ranked
+                             if self.__pair_key(first, e)
+                             not in self.__headToHead), ranked[0])
+            ranked.remove(opponent)
+            pairings.append([first, opponent])
+        return pairings
+
+    def __round_jobs(self):
+        """
+        Returns
+        -------
+        : list(tuple)
+            The play_game arguments of every game in the current round
+        """
+        jobs = []
+        gameId = self.__nextGameId
+        for a, b in self.__pairings:
+            for g in range(self.__config["gamesPerMatch"]):
+                seats = [a, b] if g % 2 == 0 else [b, a]
+                jobs.append((gameId, seats, self.__config["seed"] + gameId))
+                gameId += 1
+        return jobs
+
+    #*********************************************************************#
+    #                         Running statistics                          #
+    #*********************************************************************#
+
+    @staticmethod
+    def __pair_key(a, b):
+        return f"{a}|{b}" if a < b else f"{b}|{a}"
+
+    def __record(self, stats):
+        """
+        Folds one finished game into the standings and head-to-head table
+        """
+        a, b = sorted(stats["policies"])
+        winner = stats["winner"]
+        winnerName = None if winner is None else stats["policies"][winner]
+
+        record = self.__headToHead.setdefault(self.__pair_key(a, b), [0, 0, 0])
+        if winnerName is None:
+            record[2] += 1
+            scoreA = 0.5
+        elif winnerName == a:
+            record[0] += 1
+            scoreA = 1.0
+        else:
+            record[1] += 1
+            scoreA = 0.0
+
+        sa, sb = self.__standings[a], self.__standings[b]
+        expectedA = 1 / (1 + 10 ** ((sb["elo"] - sa["elo"]) / 400))
+        sa["elo"] += ELO_K * (scoreA - expectedA)
+        sb["elo"] -= ELO_K * (scoreA - expectedA)
+
+        for s, score in ((sa, scoreA), (sb, 1 - scoreA)):
+            s["games"] += 1
+            s["points"] += score
+            if score == 1.0:
+                s["wins"] += 1
+            elif score == 0.0:
+                s["losses"] += 1
+            else:
+                s["draws"] += 1
+
+        self.__gamesPlayed += 1
+        self.__playSeconds += stats["elapsed"]
+
+    def report(self, playedNow=0, elapsed=0.0, workers=1):
+        """
+        Parameters
+        ----------
+        playedNow: int
+            Games played by this run, used for the throughput figures
+        elapsed: float
+            Wall time of this run
+        workers: int
+            Worker processes used by this run
+
+        Returns
+        -------
+        : dict{str -> any}
+            'standings' (entrants best first), 'headToHead', 'games' (in the
+            whole tournament), 'gamesPerSec' and 'gamesPerSecPerCore' (for
+            this run) and 'cpuGamesPerSec' (one core's rate measured from
+            the time spent inside games)
+        """
+        standings = sorted(({"entrant": e, **s}
+                            for e, s in self.__standings.items()),
+                           key=lambda s: (-s["points"], -s["elo"]))
+        gamesPerSec = playedNow / elapsed if elapsed else 0.0
+        return {"standings":          standings,
+                "headToHead":         dict(self.__headToHead),
+                "games":              self.__gamesPlayed,
+                "gamesPerSec":        gamesPerSec,
+                "gamesPerSecPerCore": gamesPerSec / workers,
+                "cpuGamesPerSec":     self.__gamesPlayed / self.__playSeconds
+                                      if self.__playSeconds else 0.0}
+
+    #*********************************************************************#
+    #                            Checkpoints                              #
+    #*********************************************************************#
+
+    def __save(self):
+        """
+        Writes the checkpoint. The old one is replaced atomically so a kill
+        mid-write never leaves a broken file.
+        """
+        if self.__checkpointPath is None:
+            return
+        data = {"config":      self.__config,
+                "round":       self.__round,
+                "nextGameId":  self.__nextGameId,
+                "pairings":    self.__pairings,
+                "done":        self.__done,
+                "standings":   self.__standings,
+                "headToHead":  self.__headToHead,
+                "gamesPlayed": self.__gamesPlayed,
+                "playSeconds": self.__playSeconds}
+        tmpPath = self.__checkpointPath + ".tmp"
+        with open(tmpPath, "w") as f:
+            json.dump(data, f)
+        os.replace(tmpPath, self.__checkpointPath)
+
+    def __load(self):
+        """
+        Restores the tournament from the checkpoint
+        """
+        with open(self.__checkpointPath) as f:
+            data = json.load(f)
+        if data["config"] != self.__config:
+            raise ValueError(f"{self.__checkpointPath} is a checkpoint for a "
+                             f"different tournament: {data['config']}")
+        self.__round = data["round"]
+        self.__nextGameId = data["nextGameId"]
+        self.__pairings = data["pairings"]
+        self.__done = data["done"]
+        self.__standings = data["standings"]
+        self.__headToHead = data["headToHead"]
+        self.__gamesPlayed = data["gamesPlayed"]
+        self.__playSeconds = data["playSeconds"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Spit policy tournament")
+    parser.add_argument("entrants", nargs="+",
+                        help="policy names, e.g. random greedy greedy@0.5")
+    parser.add_argument("--format", choices=FORMATS, default=ROUND_ROBIN)
+    parser.add_argument("--games", type=int, default=100,
+                        help="games per match")
+    parser.add_argument("--rounds", type=int, default=None,
+                        help="Swiss rounds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--checkpoint", default="tournament.json")
+    args = parser.parse_args()
+
+    tournament = Tournament(args.entrants, args.format, args.games,
+                            args.rounds, args.seed, args.checkpoint)
+    report = tournament.run(args.workers)
+
+    print(f"{'entrant':>16} {'pts':>8} {'elo':>7}   W/L/D")
+    for s in report["standings"]:
+        print(f"{s['entrant']:>16} {s['points']:>8.1f} {s['elo']:>7.1f}   "
+              f"{s['wins']}/{s['losses']}/{s['draws']}")
+    for pair, (aWins, bWins, draws) in sorted(report["headToHead"].items()):
+        print(f"{pair:>33}: {aWins}-{bWins}, {draws} drawn")
+    print(f"{report['games']} games, {report['gamesPerSec']:.1f} games/s, "
+          f"{report['gamesPerSecPerCore']:.1f} games/s/core")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+File: WinProbability.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    Monte Carlo estimates of each player's chance to win a live game. The
+    order of the cards left in each deck is hidden, so every playout shuffles
+    the unseen cards and plays the game out with random plays. Playouts run
+    in a process pool under a fixed time budget, so asking for an estimate
+    never blocks the caller: estimate_async() returns a Future right away.
+
+    Estimates are cached by a hash of the public state (layouts, piles and
+    which cards are left in each deck), so asking again about a state that
+    has not changed is free.
+"""
+import time
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+import CompactState
+from CompactState import DECK_SIZE
+
+def public_state(state):
+    """
+    Copies a state with every deck sorted, which hides the deck order that
+    the estimate must not depend on
+
+    Parameters
+    ----------
+    state: bytearray
+        A CompactState buffer
+
+    Returns
+    -------
+    : bytearray
+    """
+    public = CompactState.clone(state)
+    layoutSize = public[2]
+    for p in range(public[0]):
+        base = CompactState.player_offset(public, p)
+        start = base + 1 + layoutSize + public[base]
+        end = base + 1 + layoutSize + DECK_SIZE
+        public[start:end] = bytes(sorted(public[start:end]))
+    return public
+
+def _resample_decks(state, rng):
+    """
+    Shuffles the cards left in every deck of state in place
+    """
+    layoutSize = state[2]
+    for p in range(state[0]):
+        base = CompactState.player_offset(state, p)
+        start = base + 1 + layoutSize + state[base]
+        end = base + 1 + layoutSize + DECK_SIZE
+        cards = list(state[start:end])
+        rng.shuffle(cards)
+        state[start:end] = bytes(cards)
+
+def _random_playout(state, rng):
+    """
+    Plays state to the end with uniformly random legal plays
+
+    Returns
+    -------
+    : int | None
+        The winner, or None for a draw
+    """
+    while True:
+        over, winner = CompactState.game_over(state)
+        if over:
+            return winner
+        moves = CompactState.legal_moves(state)
+        if moves:
+            CompactState.play_card_inplace(state, *rng.choice(moves))
+        else:
+            CompactState.flip_inplace(state)
+
+def run_playouts(state, budget, seed):
+    """
+    Runs playouts from state until budget seconds have passed. Runs in a
+    worker process.
+
+    Parameters
+    ----------
+    state: bytes
+        A CompactState buffer
+    budget: float
+        Seconds to spend. At least one playout is always run.
+    seed: int
+        Seed for the deck shuffles and the plays
+
+    Returns
+    -------
+    : tuple(list(int), int, int)
+        Wins per player, draws and the number of playouts
+    """
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + budget
+    wins = [0] * state[0]
+    draws = 0
+    playouts = 0
+    while playouts == 0 or time.perf_counter() < deadline:
+        game = bytearray(state)
+        _resample_decks(game, rng)
+        winner = _random_playout(game, rng)
+        if winner is None:
+            draws += 1
+        else:
+            wins[winner] += 1
+        playouts += 1
+    return wins, draws, playouts
+
+class WinProbabilityService():
+    """
+    Answers "who is going to win?" for live games without blocking the caller
+    """
+    def __init__(self, workers=2, budget=0.05, cacheSize=4096):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        workers: int
+            Worker processes. Each estimate runs one batch of playouts on
+            every worker.
+        budget: float
+            Seconds of playouts per estimate
+        cacheSize: int
+            The number of estimates kept, least recently used are dropped
+        """
+        self.__pool = ProcessPoolExecutor(workers)
+        self.__workers = workers
+        self.__budget = budget
+        self.__cacheSize = cacheSize
+        # Reentrant since a part that is already done runs its callback
+        # inline from __start, which is called with the lock held
+        self.__lock = threading.RLock()
+        self.__cache = OrderedDict()   # state hash -> estimate
+        self.__pending = {}            # state hash -> Future
+        self.__seed = random.Random()
+
+        # Start the workers now so the first estimate doesn't pay for it
+        for _ in range(workers):
+            self.__pool.submit(int)
+
+    def close(self):
+        """
+        Stops the worker processes. Waits at most one budget for playouts
+        that are already running.
+        """
+        self.__pool.shutdown(wait=True, cancel_futures=True)
+
+    def cached(self, gameState):
+        """
+        Returns
+        -------
+        : dict | None
+            The estimate for gameState if one is already cached, else None
+        """
+        key = CompactState.state_hash(public_state(gameState.to_compact()))
+        with self.__lock:
+            return self.__cache.get(key)
+
+    def estimate_async(self, gameState, callback=None):
+        """
+        Starts estimating the win probabilities of a game. Only a snapshot
+        of the game is taken on the calling thread.
+
+        Parameters
+        ----------
+        gameState: ServerGameState
+            The game to estimate
+        callback: func(dict) -> any | None
+            Called with the estimate when it is ready. Runs on a pool
+            thread, not the calling thread.
+
+        Returns
+        -------
+        : concurrent.futures.Future
+            Resolves to a dict with 'win' (probability per player), 'draw',
+            'playouts' and 'seconds'
+        """
+        return self.estimate_compact_async(gameState.to_compact(), callback)
+
+    def estimate_compact_async(self, state, callback=None):
+        """
+        Same as estimate_async for a game already packed with CompactState,
+        so a snapshot taken on one thread can be estimated from another
+
+        Parameters
+        ----------
+        state: bytearray
+            A CompactState buffer, it is not changed
+        callback: func(dict) -> any | None
+            Called with the estimate when it is ready
+
+        Returns
+        -------
+        : concurrent.futures.Future
+        """
+        public = public_state(state)
+        key = CompactState.state_hash(public)
+
+        with self.__lock:
+            if key in self.__cache:
+                self.__cache.move_to_end(key)
+                future = Future()
+                future.set_result(self.__cache[key])
+            elif key in self.__pending:
+                future = self.__pending[key]
+            else:
+                future = self.__start(key, bytes(public))
+
+        if callback is not None:
+            future.add_done_callback(lambda f: callback(f.result()))
+        return future
+
+    def __start(self, key, public):
+        """
+        Fans the playouts for one estimate out to every worker. Must be
+        called with the lock held.
+
+        Returns
+        -------
+        : concurrent.futures.Future
+            Resolves once every worker has reported back
+        """
+        combined = Future()
+        self.__pending[key] = combined
+        start = time.perf_counter()
+        parts = [self.__pool.submit(run_playouts, public, self.__budget,
+                                    self.__seed.getrandbits(64))
+                 for _ in range(self.__workers)]
+        remaining = [len(parts)]
+
+        def part_done(_):
+            with self.__lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+                self.__pending.pop(key, None)
+            try:
+                estimate = self.__combine([p.result() for p in parts],
+                                          time.perf_counter() - start)
+            except Exception as err:
+                combined.set_exception(err)
+                return
+            with self.__lock:
+                self.__cache[key] = estimate
+                if len(self.__cache) > self.__cacheSize:
+                    self.__cache.popitem(last=False)
+            combined.set_result(estimate)
+
+        for part in parts:
+            part.add_done_callback(part_done)
+        return combined
+
+    @staticmethod
+    def __combine(results, seconds):
+        """
+        Adds up the counts from every worker
+
+        Returns
+        -------
+        : dict{str -> any}
+        """
+        playouts = sum(n for _, _, n in results)
+        wins = [sum(w[p] for w, _, _ in results)
+                for p in range(len(results[0][0]))]
+        draws = sum(d for _, d, _ in results)
+        return {"win":      [w / playouts for w in wins],
+                "draw":     draws / playouts,
+                "playouts": playouts,
+                "seconds":  seconds}
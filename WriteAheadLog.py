@@ -0,0 +1,349 @@
+"""
+File: WriteAheadLog.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    A write-ahead log of a live room so a game survives the server dying.
+    The server logs the deal, the seats, and every accepted play and flip.
+    After a crash, recover() rebuilds the room's ServerGameState from the log
+    and the server waits for the players to reconnect.
+
+    Records are made durable with group commit: the server only appends to a
+    memory buffer and a committer thread writes and fsyncs everything that
+    arrived in the last commitWindow seconds in one go. At most one window of
+    accepted moves can be lost in a crash, so anything that depends on a
+    record must wait until it is durable: block on wait_durable(), or pass
+    onDurable to be told after every commit and compare with the record's
+    sequence number. The server holds each move's broadcast until its record
+    is durable, so clients never see a move a crash could lose. A 
+    commitWindow of 0 fsyncs every record before append returns.
+
+    File layout (little endian):
+        header:  magic (8s) version (H) numPlayers (B) numGamePiles (B)
+                 layoutSize (B) padding (3x)
+        records: crc32 of the rest of the record (I) kind (B) player (B)
+                 payload length (H) payload
+
+    Payloads:
+        DEAL    numPlayers * 52 card codes
+        SEAT    player name (utf-8)
+        PLAY    layoutIdx (B) midPileIdx (B)
+        FLIP    index of each player that flipped (B each)
+        END     empty, the game finished and there is nothing to recover
+
+    A record cut short or damaged by a crash ends the log; recover() drops
+    it before appending again.
+"""
+import os
+import time
+import zlib
+import struct
+import threading
+import CompactState
+from CompactState import DECK_SIZE
+from ServerGameState import ServerGameState
+
+MAGIC = b"SPITWAL\x00"
+VERSION = 1
+
+HEADER = struct.Struct("<8sHBBB3x")
+CRC = struct.Struct("<I")
+RECORD = struct.Struct("<IBBH")
+BODY = struct.Struct("<BBH")
+
+DEAL = 1
+SEAT = 2
+PLAY = 3
+FLIP = 4
+END  = 5
+
+class WriteAheadLog():
+    """
+    Group committing writer for one room's log
+    """
+    def __init__(self, path, numPlayers, numGamePiles, layoutSize,
+                 commitWindow=0.005, resume=False, onDurable=None):
+        """
+        Constructor. Creates or overwrites the log, use recover() to carry on
+        with an existing one.
+
+        Parameters
+        ----------
+        path: str
+            The log file
+        numPlayers: int
+        numGamePiles: int
+        layoutSize: int
+            Shape of the game
+        commitWindow: float
+            Seconds records are gathered for before they are fsynced together
+        resume: bool
+            Append to an existing log instead of creating one
+        onDurable: func(int) | None
+            Called after every commit with the sequence number of the newest
+            durable record, from the thread that committed
+        """
+        self.__shape = (numPlayers, numGamePiles, layoutSize)
+        if resume:
+            self.__file = open(path, "ab")
+        else:
+            self.__file = open(path, "wb")
+            self.__file.write(HEADER.pack(MAGIC, VERSION, *self.__shape))
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+        self.__commitWindow = commitWindow
+        self.__onDurable = onDurable
+
+        self.__cond = threading.Condition()
+        self.__commitLock = threading.Lock() # Keeps batches in order on disk
+        self.__buffer = bytearray()
+        self.__appended = 0     # Records handed to append
+        self.__durable = 0      # Records known to be on disk
+        self.__commits = 0      # fsyncs done for records
+        self.__closed = False
+        self.__thread = None
+        if commitWindow > 0:
+            self.__thread = threading.Thread(target=self.__commit_worker,
+                                             daemon=True)
+            self.__thread.start()
+
+    def close(self):
+        """
+        Commits whatever is buffered and closes the file
+        """
+        with self.__cond:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__cond.notify_all()
+        if self.__thread is not None:
+            self.__thread.join()
+        self.__commit()
+        self.__file.close()
+
+    def stats(self):
+        """
+        Returns
+        -------
+        : dict{str -> int}
+            'appended' records, 'durable' records and 'commits' (fsyncs)
+        """
+        with self.__cond:
+            return {"appended": self.__appended, "durable": self.__durable,
+                    "commits": self.__commits}
+
+    def append(self, kind, player=0, payload=b""):
+        """
+        Adds one record to the log
+
+        Parameters
+        ----------
+        kind: int
+            One of DEAL, SEAT, PLAY, FLIP or END
+        player: int
+            The player the record is about, 0 if it is about no one
+        payload: bytes
+            See the module docstring
+
+        Returns
+        -------
+        : int
+            The record's sequence number, for wait_durable
+        """
+        body = BODY.pack(kind, player, len(payload)) + payload
+        record = CRC.pack(zlib.crc32(body)) + body
+        with self.__cond:
+            self.__buffer += record
+            self.__appended += 1
+            lsn = self.__appended
+            if self.__thread is not None:
+                self.__cond.notify_all()
+        if self.__thread is None:
+            self.__commit()
+        return lsn
+
+    def durable(self):
+        """
+        Returns
+        -------
+        : int
+            Sequence number of the newest record known to be on disk
+        """
+        with self.__cond:
+            return self.__durable
+
+    def wait_durable(self, lsn, timeout=None):
+        """
+        Blocks until a record is on disk
+
+        Parameters
+        ----------
+        lsn: int
+            Sequence number returned by append
+        timeout: float | None
+            Longest time to wait in seconds
+
+        Returns
+        -------
+        : bool
+            True if the record is durable
+        """
+        with self.__cond:
+            return self.__cond.wait_for(lambda: self.__durable >= lsn or
+                                                self.__closed, timeout) and \
+                   self.__durable >= lsn
+
+    def log_deal(self, decks):
+        self.append(DEAL, 0, bytes(CompactState.encode_card(c)
+                                   for d in decks for c in d))
+
+    def log_seat(self, playerIdx, name):
+        return self.append(SEAT, playerIdx, str(name).encode("utf-8"))
+
+    def log_play(self, playerIdx, layoutIdx, midPileIdx):
+        return self.append(PLAY, playerIdx, bytes((layoutIdx, midPileIdx)))
+
+    def log_flip(self, playersFlipped):
+        return self.append(FLIP, 0, bytes(playersFlipped))
+
+    def log_end(self):
+        self.wait_durable(self.append(END))
+
+    def __commit_worker(self):
+        """
+        Sleeps until something is appended, gives the rest of the group a
+        window to arrive, then commits them all with one fsync
+        """
+        while True:
+            with self.__cond:
+                self.__cond.wait_for(lambda: self.__buffer or self.__closed)
+                if self.__closed:
+                    return
+            time.sleep(self.__commitWindow)
+            self.__commit()
+
+    def __commit(self):
+        with self.__commitLock:
+            with self.__cond:
+                data, self.__buffer = self.__buffer, bytearray()
+                lsn = self.__appended
+            if data:
+                self.__file.write(data)
+                self.__file.flush()
+                os.fsync(self.__file.fileno())
+            with self.__cond:
+                if data:
+                    self.__commits += 1
+                self.__durable = max(self.__durable, lsn)
+                durable = self.__durable
+                self.__cond.notify_all()
+            if data and self.__onDurable is not None:
+                self.__onDurable(durable)
+
+def read_records(path):
+    """
+    Reads every intact record of a log
+
+    Parameters
+    ----------
+    path: str
+        The log
+
+    Returns
+    -------
+    : tuple(tuple(int, int, int), list(tuple(int, int, bytes)), int)
+        The game's shape, the (kind, player, payload) records and the offset
+        just past the last intact record
+
+    Raises
+    ------
+    ValueError
+        If the file is not a write-ahead log
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a version {VERSION} write-ahead log")
+    magic, version, *shape = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} write-ahead log")
+
+    records = []
+    offset = HEADER.size
+    while offset + RECORD.size <= len(data):
+        crc, kind, player, size = RECORD.unpack_from(data, offset)
+        end = offset + RECORD.size + size
+        if end > len(data) or zlib.crc32(data[offset + CRC.size:end]) != crc:
+            break # Torn or damaged by a crash, nothing after it counts
+        records.append((kind, player, data[offset + RECORD.size:end]))
+        offset = end
+    return tuple(shape), records, offset
+
+def recover(path, commitWindow=0.005, onDurable=None):
+    """
+    Rebuilds a room from its log and reopens the log to carry on writing it
+
+    Parameters
+    ----------
+    path: str
+        The log
+    commitWindow: float
+    onDurable: func(int) | None
+        Passed on to the reopened WriteAheadLog
+
+    Returns
+    -------
+    : tuple(dict{str -> any}, WriteAheadLog)
+        The room, with 'state' (ServerGameState), 'shape' (numPlayers,
+        numGamePiles, layoutSize), 'names' (list, None for seats never
+        taken), 'decks' as dealt and 'moves' ((PLAY, player, (layoutIdx,
+        midPileIdx)) and (FLIP, 0, players) in the order they happened),
+        and the log
+
+    Raises
+    ------
+    ValueError
+        If the file is not a write-ahead log, has no deal, holds a move that
+        is not legal in the rebuilt game or the game already finished
+    """
+    shape, records, end = read_records(path)
+    numPlayers, numGamePiles, layoutSize = shape
+    state = None
+    decks = None
+    names = [None] * numPlayers
+    moves = []
+    for kind, player, payload in records:
+        if kind == DEAL:
+            decks = [[CompactState.decode_card(c) for c in
+                      payload[p * DECK_SIZE:(p + 1) * DECK_SIZE]]
+                     for p in range(numPlayers)]
+            state = ServerGameState(numPlayers, numGamePiles, layoutSize,
+                                    decks=decks)
+        elif state is None:
+            raise ValueError(f"{path} does not start with a deal")
+        elif kind == SEAT:
+            names[player] = payload.decode("utf-8")
+        elif kind == PLAY:
+            if not state.play_card(player, payload[0], payload[1]):
+                raise ValueError(f"Logged play {tuple(payload)} by player "
+                                 f"{player} is not legal")
+            moves.append((PLAY, player, (payload[0], payload[1])))
+        elif kind == FLIP:
+            if state.flip() != list(payload):
+                raise ValueError("Logged flip differs from the rebuilt game")
+            moves.append((FLIP, 0, list(payload)))
+        elif kind == END:
+            raise ValueError(f"The game in {path} already finished")
+    if state is None:
+        raise ValueError(f"{path} does not start with a deal")
+
+    # Drop a torn tail so new records follow the last intact one
+    with open(path, "r+b") as f:
+        f.truncate(end)
+    wal = WriteAheadLog(path, *shape, commitWindow=commitWindow, resume=True,
+                        onDurable=onDurable)
+    room = {"state": state, "shape": shape, "names": names, "decks": decks,
+            "moves": moves}
+    return room, wal
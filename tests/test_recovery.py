@@ -0,0 +1,95 @@
+"""
+File: test_recovery.py
+Authors: Aiden Auretto, Peter Scully, Simon Webber, Claire Williams
+Date: 10/19/2026
+
+Purpose
+-------
+    Recovers a room from a write-ahead log cut off mid game, plays it out
+    with bots and checks the event log it wrote replays like a normal game.
+    Run with python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import EventLog
+import WriteAheadLog
+from Server import Server
+from ServerGameState import ServerGameState
+
+NAMES = ["alice", "bob"]
+
+def crashed_wal(path, moves=6):
+    """
+    Writes the log of a game that stopped after some moves without an END
+
+    Returns
+    -------
+    : int
+        The number of plays and flips logged
+    """
+    state = ServerGameState(2, 2, 4, seed=7)
+    wal = WriteAheadLog.WriteAheadLog(path, 2, 2, 4, 0.0)
+    wal.log_deal(state.initial_decks())
+    for i, name in enumerate(NAMES):
+        wal.log_seat(i, name)
+    logged = 0
+    while logged < moves:
+        played = False
+        for player in range(2):
+            for layoutIdx in range(4):
+                for midIdx in range(2):
+                    if not played and state.play_card(player, layoutIdx,
+                                                      midIdx):
+                        wal.log_play(player, layoutIdx, midIdx)
+                        played = True
+        if not played:
+            wal.log_flip(state.flip())
+        logged += 1
+    wal.close()
+    return logged
+
+class RecoveredEventLogTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.walPath = os.path.join(self.dir.name, "room.wal")
+        self.eventPath = os.path.join(self.dir.name, "room.events")
+        self.recovered = crashed_wal(self.walPath)
+
+        server = Server("127.0.0.1", 0, walPath=self.walPath, recover=True,
+                        eventLogPath=self.eventPath)
+        for name in NAMES:
+            server.add_bot(name, reaction=(0.0, 0.001))
+        server.start()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_start_comes_before_recovered_moves(self):
+        reader = EventLog.EventLogReader(self.eventPath)
+        kinds = [kind for kind, _, _, _ in reader.events()]
+        reader.close()
+        start = kinds.index(EventLog.START)
+        self.assertEqual(kinds[0], EventLog.DEAL)
+        self.assertEqual(kinds[1:start].count(EventLog.JOIN), len(NAMES))
+        self.assertNotIn(EventLog.PLAY, kinds[:start])
+        self.assertNotIn(EventLog.FLIP, kinds[:start])
+        self.assertGreaterEqual(kinds.count(EventLog.PLAY) +
+                                kinds.count(EventLog.FLIP), self.recovered)
+        self.assertEqual(kinds[-1], EventLog.RESULT)
+
+    def test_replay_starts_with_names_and_initial_state(self):
+        for seat in range(len(NAMES)):
+            messages = [msg for _, msg in
+                        EventLog.replay_messages(self.eventPath, seat)]
+            self.assertEqual(messages[0], ("all-names", NAMES))
+            self.assertEqual(messages[1][:2], ("state", "initial"))
+            self.assertEqual(messages[-1][0], "game-stopped")
+
+if __name__ == "__main__":
+    unittest.main()